@@ -1,4 +1,5 @@
 from enum import IntEnum
+from typing import FrozenSet
 
 
 class AnalyzerMode(IntEnum):
@@ -7,6 +8,7 @@ class AnalyzerMode(IntEnum):
     Diagnosis = (2, "Events / Diagnosis")
     Page = (3, "Direct Parameter (Page 1)")
     ISDU = (4, "Indexed Service Data Unit (ISDU)")
+    Combined = (5, "Combined (frame types of setting below)")
 
     def __new__(cls, value, description):
         obj = int.__new__(cls, value)
@@ -18,6 +20,27 @@ class AnalyzerMode(IntEnum):
     def descriptions():
         return [mode.description for mode in sorted(AnalyzerMode, key=lambda m: m.value)]
 
+    @staticmethod
+    def frameModes() -> FrozenSet["AnalyzerMode"]:
+        """Modes producing a frame type (all except Combined)"""
+        return frozenset(mode for mode in AnalyzerMode if mode != AnalyzerMode.Combined)
+
+    @staticmethod
+    def parseFrameModes(text: str) -> FrozenSet["AnalyzerMode"]:
+        """Frame types of Combined mode: comma separated names or descriptions (empty: all)"""
+        names = [name.strip() for name in text.strip().strip('"').split(',') if name.strip()]
+        if not names:
+            return AnalyzerMode.frameModes()
+
+        byName = {mode.name.lower(): mode for mode in AnalyzerMode.frameModes()}
+        modes = set()
+        for name in names:
+            mode = byName.get(name.lower()) or AnalyzerMode(name)
+            if mode == AnalyzerMode.Combined:
+                raise ValueError(f"{name!r} is not a frame type")
+            modes.add(mode)
+        return frozenset(modes)
+
     @classmethod
     def _missing_(cls, value):
         if isinstance(value, str):
@@ -0,0 +1,387 @@
+"""
+Benchmarks of all decoding stages.
+
+    python benchmarks/benchmark.py [run] [--filter decoder] [--output results.json] [--compare baseline.json]
+    python benchmarks/benchmark.py compare baseline.json results.json [--threshold 0.1]
+
+Results are written as JSON (rates in items per second, best of --repeat runs). The compare mode
+lists the change of every benchmark and exits with 1 if one got slower than the threshold.
+The saleae package is replaced by benchmarks/saleaeStub if it is not installed (Logic 2 only).
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+_BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+_REPOSITORY_DIR = os.path.dirname(_BENCHMARK_DIR)
+sys.path.insert(0, _REPOSITORY_DIR)
+sys.path.insert(0, _BENCHMARK_DIR)
+
+try:
+    import saleae  # noqa: F401
+except ImportError:
+    sys.path.append(os.path.join(_BENCHMARK_DIR, 'saleaeStub'))
+
+from iolink_utils.__version__ import __version__  # noqa: E402
+from iolink_utils.definitions.bitRate import BitRate  # noqa: E402
+from iolink_utils.iodd.iodd import Iodd  # noqa: E402
+from iolink_utils.iodd.iodd_cache import ioddCache  # noqa: E402
+from iolink_utils.utils.timestamp import Timebase, nsToDatetime  # noqa: E402
+from iolink_utils.octetStreamDecoder.octetStreamDecoder import OctetStreamDecoder, DecoderEngine  # noqa: E402
+from iolink_utils.octetStreamDecoder.octetStreamDecoderSettings import DecoderSettings  # noqa: E402
+from iolink_utils.messageInterpreter.messageInterpreter import MessageInterpreter  # noqa: E402
+from iolink_utils.messageInterpreter.isdu.ISDU import ISDU  # noqa: E402
+from iolink_utils.processDataDecoder.processDataDecoder import createDecoderClass_PDIn, \
+    createDecoderClass_PDOut  # noqa: E402
+from iolink_utils.octetStreamEncoder.trafficGenerator import TrafficGenerator  # noqa: E402
+from iolink_utils.capture.octetCaptureFile import OctetCaptureFile, writeOctetCapture  # noqa: E402
+from iolink_utils.capture.capturePipeline import decodeCapture  # noqa: E402
+from iolink_utils.capture.parallelDecoder import decodeCaptureParallel, findSplitPoints, \
+    getMaxOctetGap  # noqa: E402
+
+from syntheticIodd import writeSyntheticIodd  # noqa: E402
+from workloads import BIT_RATES, M_SEQ_TYPES, CYCLE_TIME, START_TIME, OctetStream, createSettings, \
+    fillMixedTraffic, mixedOctetStream, isduOctetStream, processDataSamples  # noqa: E402
+
+FORMAT_VERSION = 1
+
+
+class Benchmark(NamedTuple):
+    name: str
+    unit: str  # items processed by one call of run, e.g. 'octets'
+    items: int
+    run: Callable[[], object]
+
+
+#
+# benchmark definitions (setup is done when the Benchmark is created, run is timed)
+#
+
+def _decoderBenchmarks(transactions: int) -> Iterator[Benchmark]:
+    for bitRate in BIT_RATES:
+        settings = createSettings(bitRate)
+        for mSeqType in M_SEQ_TYPES:
+            stream = mixedOctetStream(settings, mSeqType, transactions)
+            for engine in DecoderEngine:
+                decoder = OctetStreamDecoder(settings, Timebase.Nanoseconds, None, engine)
+                name = f"decoder.{engine.name}.{bitRate.name}.{mSeqType.name}"
+
+                def processOctets(decoder=decoder, stream=stream):
+                    decoder.reset()
+                    return decoder.processOctets(stream.octets, stream.startTimes, stream.endTimes)
+
+                def processOctet(decoder=decoder, stream=stream):
+                    decoder.reset()
+                    process = decoder.processOctet
+                    for octet, startTime, endTime in zip(stream.octets, stream.startTimes, stream.endTimes):
+                        process(octet, startTime, endTime)
+
+                yield Benchmark(f"{name}.processOctets", 'octets', len(stream), processOctets)
+                yield Benchmark(f"{name}.processOctet", 'octets', len(stream), processOctet)
+
+
+def _decodeMessages(settings: DecoderSettings, stream: OctetStream) -> list:
+    decoder = OctetStreamDecoder(settings, Timebase.Nanoseconds, None, DecoderEngine.TransitionTable)
+    return decoder.processOctets(stream.octets, stream.startTimes, stream.endTimes)
+
+
+def _interpreterBenchmarks(transactions: int) -> Iterator[Benchmark]:
+    settings = createSettings(BitRate.COM2)
+    for mSeqType in M_SEQ_TYPES:
+        messages = _decodeMessages(settings, mixedOctetStream(settings, mSeqType, transactions))
+
+        def interpret(messages=messages):
+            interpreter = MessageInterpreter()
+            for message in messages:
+                interpreter.processMessage(message)
+
+        yield Benchmark(f"interpreter.{mSeqType.name}", 'messages', len(messages), interpret)
+
+
+def _isduBenchmarks(transactions: int) -> Iterator[Benchmark]:
+    for od in (1, 2, 8, 32):
+        settings = createSettings(BitRate.COM3, od=od)
+        messages = _decodeMessages(settings, isduOctetStream(settings, transactions))
+
+        def reassemble(messages=messages):
+            interpreter = MessageInterpreter()
+            count = 0
+            for message in messages:
+                if isinstance(interpreter.processMessage(message), ISDU):
+                    count += 1
+            return count
+
+        yield Benchmark(f"isdu.reassembly.od{od}", 'ISDUs', reassemble(), reassemble)
+
+
+def _processDataBenchmarks(ioddFilename: str, count: int) -> Iterator[Benchmark]:
+    processDataDefinition = Iodd(ioddFilename).processDataDefinition
+    for direction, createDecoderClass in (('pdIn', createDecoderClass_PDIn), ('pdOut', createDecoderClass_PDOut)):
+        Decoder = createDecoderClass(processDataDefinition, 0)
+        samples = processDataSamples(processDataDefinition[0][direction]['bitLength'] // 8, count)
+
+        def decode(Decoder=Decoder, samples=samples):
+            for sample in samples:
+                decoded = Decoder.from_buffer_copy(sample)
+                for fieldName in decoded.field_names:
+                    getattr(decoded, fieldName)
+
+        yield Benchmark(f"processData.{direction}", 'samples', count, decode)
+
+
+def _loadIodd(filename: str, useCache: bool) -> Iodd:
+    iodd = Iodd(filename, useCache)
+    # sections are parsed on first access
+    _ = (iodd.documentInfo, iodd.identity, iodd.features, iodd.physicalLayer, iodd.processDataDefinition,
+         iodd.variableCollection)
+    return iodd
+
+
+def _ioddBenchmarks(ioddFilenames: Dict[str, str]) -> Iterator[Benchmark]:
+    for size, filename in ioddFilenames.items():
+        yield Benchmark(f"iodd.parse.{size}", 'files', 1, lambda filename=filename: _loadIodd(filename, False))
+    for size, filename in ioddFilenames.items():
+        _loadIodd(filename, True)  # fill the cache
+        yield Benchmark(f"iodd.cached.{size}", 'files', 1, lambda filename=filename: _loadIodd(filename, True))
+
+
+def _captureBenchmarks(workDir: str, transactions: int) -> Iterator[Benchmark]:
+    settings = createSettings(BitRate.COM3)
+    generator = TrafficGenerator(settings, M_SEQ_TYPES[-1])
+    fillMixedTraffic(generator, transactions)
+    filename = os.path.join(workDir, 'capture.iolcap')
+    octetCount = writeOctetCapture(filename, generator.octetChunks(START_TIME, CYCLE_TIME, random=3))
+    maxOctetGap = getMaxOctetGap(settings)
+    segmentSize = max(octetCount // 16, 1)
+
+    def splitPoints():
+        with OctetCaptureFile(filename) as capture:
+            return findSplitPoints(capture, maxOctetGap, segmentSize)
+
+    def sequential():
+        with OctetCaptureFile(filename) as capture:
+            for _ in decodeCapture(capture.read(), OctetStreamDecoder(settings, Timebase.Nanoseconds)):
+                pass
+
+    def parallel(workers: int):
+        for _ in decodeCaptureParallel(filename, settings, workers, segmentSize):
+            pass
+
+    yield Benchmark('capture.findSplitPoints', 'octets', octetCount, splitPoints)
+    yield Benchmark('capture.decodeCapture', 'octets', octetCount, sequential)
+    # incl. start of the worker processes, speedup depends on the number of CPUs (meta.cpus of the results)
+    for workers in (1, 2, 4):
+        yield Benchmark(f"capture.decodeCaptureParallel.w{workers}", 'octets', octetCount,
+                        lambda workers=workers: parallel(workers))
+
+
+def _analyzerBenchmarks(ioddFilename: str, transactions: int) -> Iterator[Benchmark]:
+    from saleae.analyzers import AnalyzerFrame
+    from saleae.data.timing import SaleaeTime
+    from ioLinkAnalyzer import IOLinkProtocolAnalyzer
+    from analyzerMode import AnalyzerMode
+
+    settings = DecoderSettings.fromIODD(Iodd(ioddFilename))
+    # minimal gaps: timestamps of frames have microsecond resolution (datetime)
+    stream = mixedOctetStream(settings, M_SEQ_TYPES[-1], transactions, seed=None)
+    frames = [AnalyzerFrame('data', SaleaeTime(nsToDatetime(startTime)), SaleaeTime(nsToDatetime(endTime)),
+                            {'data': bytes([octet])})
+              for octet, startTime, endTime in zip(stream.octets, stream.startTimes, stream.endTimes)]
+
+    def createAnalyzer(mode: AnalyzerMode) -> IOLinkProtocolAnalyzer:
+        analyzer = IOLinkProtocolAnalyzer.__new__(IOLinkProtocolAnalyzer)
+        analyzer.iodd_xml_pathAndFilename = ioddFilename
+        analyzer.analyzer_mode_setting = mode.description
+        analyzer.frame_types_setting = ''
+        analyzer.process_data_condition = '0'
+        analyzer.statistics_interval = 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyzer.__init__()
+        return analyzer
+
+    for mode in AnalyzerMode:
+        analyzer = createAnalyzer(mode)
+
+        def decode(analyzer=analyzer):
+            analyzer.decoder.reset()
+            analyzer.interpreter.reset()
+            for frame in frames:
+                analyzer.decode(frame)
+
+        yield Benchmark(f"analyzer.decode.{mode.name}", 'octets', len(frames), decode)
+
+    # one analyzer per mode on the same input, sharing a DecodingBus (frames in the order Logic 2 could use)
+    analyzers = [createAnalyzer(mode) for mode in AnalyzerMode.frameModes()]
+
+    def decodeShared(analyzers=analyzers):
+        analyzers[0].decoder.reset()
+        analyzers[0].interpreter.reset()
+        for frame in frames:
+            for analyzer in analyzers:
+                analyzer.decode(frame)
+
+    yield Benchmark(f"analyzer.decode.sharedBus{len(analyzers)}", 'octets', len(frames), decodeShared)
+
+
+def createBenchmarks(workDir: str, quick: bool = False) -> Iterator[Benchmark]:
+    transactions = 100 if quick else 1000
+    ioddCache.directory = os.path.join(workDir, 'ioddCache')  # not the cache of the user
+    ioddFilenames = {
+        'small': writeSyntheticIodd(os.path.join(workDir, 'small-IODD1.1.xml'), variableCount=20, languageCount=1),
+        'large': writeSyntheticIodd(os.path.join(workDir, 'large-IODD1.1.xml'), variableCount=200 if quick else 1000,
+                                    languageCount=8)
+    }
+
+    yield from _decoderBenchmarks(transactions)
+    yield from _interpreterBenchmarks(transactions)
+    yield from _isduBenchmarks(transactions // 10)
+    yield from _processDataBenchmarks(ioddFilenames['small'], 10 * transactions)
+    yield from _ioddBenchmarks(ioddFilenames)
+    yield from _captureBenchmarks(workDir, 10 * transactions)
+    yield from _analyzerBenchmarks(ioddFilenames['small'], transactions)
+
+
+#
+# measurement
+#
+
+def measure(benchmark: Benchmark, repeat: int, minTime: float) -> Dict:
+    """Best and median of repeat runs, each with enough calls to last minTime seconds."""
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            benchmark.run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= minTime or calls >= 1 << 20:
+            break
+        calls *= 2 if elapsed <= 0 else max(2, min(10, int(minTime / elapsed) + 1))
+
+    times = [elapsed / calls]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            benchmark.run()
+        times.append((time.perf_counter() - start) / calls)
+
+    best = min(times)
+    return {
+        'unit': benchmark.unit,
+        'items': benchmark.items,
+        'calls': calls,
+        'best': best,
+        'median': statistics.median(times),
+        'rate': benchmark.items / best if best > 0 else 0.0
+    }
+
+
+def _gitCommit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=_REPOSITORY_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def runBenchmarks(nameFilter: Optional[str], repeat: int, minTime: float, quick: bool) -> Dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as workDir:
+        for benchmark in createBenchmarks(workDir, quick):
+            if nameFilter and nameFilter not in benchmark.name:
+                continue
+            results[benchmark.name] = result = measure(benchmark, repeat, minTime)
+            print(f"{benchmark.name:<60} {result['rate']:>14,.1f} {benchmark.unit}/s", flush=True)
+
+    return {
+        'formatVersion': FORMAT_VERSION,
+        'meta': {
+            'version': __version__,
+            'commit': _gitCommit(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'repeat': repeat,
+            'minTime': minTime,
+            'quick': quick
+        },
+        'results': results
+    }
+
+
+def compareResults(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    """Prints the change of every benchmark, returns names of regressions (rate dropped more than threshold)."""
+    regressions = []
+    baseResults, currentResults = baseline['results'], current['results']
+    print(f"{'benchmark':<60} {'baseline':>14} {'current':>14} {'change':>8}")
+    for name in sorted(set(baseResults) | set(currentResults)):
+        if name not in baseResults or name not in currentResults:
+            print(f"{name:<60} {'only in ' + ('current' if name in currentResults else 'baseline'):>38}")
+            continue
+
+        base, rate = baseResults[name]['rate'], currentResults[name]['rate']
+        change = rate / base - 1 if base else 0.0
+        marker = ''
+        if change < -threshold:
+            regressions.append(name)
+            marker = ' REGRESSION'
+        print(f"{name:<60} {base:>14,.0f} {rate:>14,.0f} {change:>+8.1%}{marker}")
+    return regressions
+
+
+def _load(filename: str) -> Dict:
+    with open(filename) as file:
+        results = json.load(file)
+    if results.get('formatVersion') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported result file: '{filename}'")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='command')
+
+    runParser = subparsers.add_parser('run', help='run benchmarks (default)')
+    compareParser = subparsers.add_parser('compare', help='compare two result files')
+    compareParser.add_argument('baseline')
+    compareParser.add_argument('current')
+    for subparser in (runParser, compareParser):
+        subparser.add_argument('--threshold', type=float, default=0.1, help='allowed slowdown (default: 0.1)')
+    runParser.add_argument('--filter', help='only benchmarks containing this text')
+    runParser.add_argument('--output', help='JSON result file')
+    runParser.add_argument('--compare', help='JSON result file to compare with')
+    runParser.add_argument('--repeat', type=int, default=5)
+    runParser.add_argument('--min-time', type=float, default=0.2, help='seconds per repetition')
+    runParser.add_argument('--quick', action='store_true', help='smaller workloads')
+
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] not in subparsers.choices and argv[0] not in ('-h', '--help'):
+        argv.insert(0, 'run')  # run is the default command, e.g. benchmark.py --filter decoder
+    args = parser.parse_args(argv)
+    if args.command == 'compare':
+        return 1 if compareResults(_load(args.baseline), _load(args.current), args.threshold) else 0
+
+    results = runBenchmarks(args.filter, args.repeat, args.min_time, args.quick)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+    if args.compare:
+        print()
+        return 1 if compareResults(_load(args.compare), results, args.threshold) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
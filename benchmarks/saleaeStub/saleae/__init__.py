@@ -0,0 +1 @@
+"""Minimal stand-in for the saleae package (Logic 2 only), enough to run the HLA in benchmarks."""
@@ -0,0 +1,28 @@
+class HighLevelAnalyzer:
+    pass
+
+
+class AnalyzerFrame:
+    def __init__(self, type: str, start_time, end_time, data=None):
+        self.type = type
+        self.start_time = start_time
+        self.end_time = end_time
+        self.data = data if data is not None else {}
+
+
+class StringSetting:
+    def __init__(self, label: str = ''):
+        self.label = label
+
+
+class NumberSetting:
+    def __init__(self, label: str = '', min_value=None, max_value=None):
+        self.label = label
+        self.min_value = min_value
+        self.max_value = max_value
+
+
+class ChoicesSetting:
+    def __init__(self, choices, label: str = ''):
+        self.choices = choices
+        self.label = label
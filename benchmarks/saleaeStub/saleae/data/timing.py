@@ -0,0 +1,9 @@
+from datetime import datetime
+
+
+class SaleaeTime:
+    def __init__(self, value: datetime):
+        self._value = value
+
+    def as_datetime(self) -> datetime:
+        return self._value
@@ -0,0 +1,108 @@
+"""
+Synthetic IODD (IODD1.1 structure) for benchmarks, no vendor files required.
+
+Contains everything Iodd parses (DocumentInfo, DeviceIdentity, Features, PhysicalLayer, variables,
+process data with RecordT and conditions) plus sections real IODDs carry but Iodd ignores
+(events, error types, user interface, translations, stamp), scaled by variableCount/languageCount.
+"""
+from xml.sax.saxutils import quoteattr
+
+_NAMESPACE = 'http://www.io-link.com/IODD/2010/10'
+_XSI = 'http://www.w3.org/2001/XMLSchema-instance'
+_LANGUAGES = ('en', 'de', 'fr', 'es', 'it', 'ja', 'zh', 'ko', 'pt', 'ru')
+
+
+def _texts(count: int, language: str) -> str:
+    return ''.join(f'<Text id="TI_{number}" value={quoteattr(f"{language} text {number}")}/>'
+                   for number in range(count))
+
+
+def createSyntheticIodd(variableCount: int = 200, languageCount: int = 4, bitrate: str = 'COM2',
+                        mSequenceCapability: int = 0x1B, pdInRecordItems: int = 4) -> str:
+    """
+    XML text of a synthetic device IODD.
+
+    :param variableCount: number of Variables (indices 64..), each with record items and texts
+    :param languageCount: PrimaryLanguage (en) + languageCount - 1 translations
+    :param mSequenceCapability: see MSequenceCapability (default: ISDU, operate code 5, preoperate code 1)
+    :param pdInRecordItems: record items of 8 bit in PDin (PDout is 1 octet)
+    """
+    textCount = 10 + 4 * variableCount
+    variables = []
+    for number in range(variableCount):
+        items = ''.join(
+            f'<RecordItem subindex="{subIndex}" bitOffset="{(3 - subIndex) * 8}">'
+            f'<SimpleDatatype xsi:type="UIntegerT" bitLength="8"/><Name textId="TI_{10 + 4 * number + subIndex}"/>'
+            f'</RecordItem>'
+            for subIndex in range(1, 4))
+        variables.append(
+            f'<Variable id="V_Synthetic_{number}" index="{64 + number}" accessRights="rw">'
+            f'<Datatype xsi:type="RecordT" bitLength="32">{items}</Datatype>'
+            f'<Name textId="TI_{10 + 4 * number}"/><Description textId="TI_{10 + 4 * number + 1}"/>'
+            f'</Variable>')
+
+    pdInItems = ''.join(
+        f'<RecordItem subindex="{subIndex + 1}" bitOffset="{(pdInRecordItems - 1 - subIndex) * 8}">'
+        f'<SimpleDatatype xsi:type="UIntegerT" bitLength="8"/><Name textId="TI_{subIndex % 10}"/></RecordItem>'
+        for subIndex in range(pdInRecordItems))
+    processData = ''.join(
+        f'<ProcessData id="PD_{condition}"><Condition variableId="V_Synthetic_0" value="{condition}"/>'
+        f'<ProcessDataIn id="PDI_{condition}" bitLength="{8 * pdInRecordItems}">'
+        f'<Datatype xsi:type="RecordT" bitLength="{8 * pdInRecordItems}">{pdInItems}</Datatype>'
+        f'<Name textId="TI_1"/></ProcessDataIn>'
+        f'<ProcessDataOut id="PDO_{condition}" bitLength="8">'
+        f'<Datatype xsi:type="RecordT" bitLength="8"><RecordItem subindex="1" bitOffset="0">'
+        f'<SimpleDatatype xsi:type="UIntegerT" bitLength="8"/><Name textId="TI_3"/></RecordItem></Datatype>'
+        f'<Name textId="TI_2"/></ProcessDataOut>'
+        f'</ProcessData>'
+        for condition in range(2))
+
+    events = ''.join(f'<Event code="{0x1800 + number}" type="Notification"><Name textId="TI_{number}"/></Event>'
+                     for number in range(min(variableCount, 100)))
+    errors = ''.join(f'<ErrorType code="128" additionalCode="{number}"><Name textId="TI_{number}"/></ErrorType>'
+                     for number in range(min(variableCount, 50)))
+    menus = ''.join(f'<Menu id="M_{number}"><VariableRef variableId="V_Synthetic_{number}"/></Menu>'
+                    for number in range(variableCount))
+    translations = ''.join(f'<Language xml:lang="{language}">{_texts(textCount, language)}</Language>'
+                           for language in _LANGUAGES[1:languageCount])
+
+    return (
+        f'<?xml version="1.0" encoding="utf-8"?>\n'
+        f'<IODevice xmlns="{_NAMESPACE}" xmlns:xsi="{_XSI}">'
+        f'<DocumentInfo version="V1.0" releaseDate="2024-01-01" copyright="benchmark"/>'
+        f'<ProfileHeader><ProfileIdentification>IO Device Profile</ProfileIdentification>'
+        f'<ProfileRevision>1.1</ProfileRevision><ProfileName>Device Profile for IO Devices</ProfileName>'
+        f'</ProfileHeader>'
+        f'<ProfileBody>'
+        f'<DeviceIdentity vendorId="65535" vendorName="Benchmark" deviceId="1193046">'
+        f'<VendorText textId="TI_0"/><VendorUrl textId="TI_1"/><VendorLogo name="logo.png"/>'
+        f'<DeviceName textId="TI_2"/><DeviceFamily textId="TI_3"/>'
+        f'<DeviceVariantCollection><DeviceVariant productId="BENCH-1" deviceSymbol="symbol.png" '
+        f'deviceIcon="icon.png"><Name textId="TI_4"/><Description textId="TI_5"/></DeviceVariant>'
+        f'</DeviceVariantCollection></DeviceIdentity>'
+        f'<DeviceFunction>'
+        f'<Features blockParameter="true" dataStorage="true" profileCharacteristic="1 32768">'
+        f'<SupportedAccessLocks parameter="false" dataStorage="true" localParameterization="false" '
+        f'localUserInterface="false"/></Features>'
+        f'<VariableCollection>{"".join(variables)}</VariableCollection>'
+        f'<ProcessDataCollection>{processData}</ProcessDataCollection>'
+        f'<ErrorTypeCollection>{errors}</ErrorTypeCollection>'
+        f'<EventCollection>{events}</EventCollection>'
+        f'<UserInterface><MenuCollection>{menus}</MenuCollection></UserInterface>'
+        f'</DeviceFunction></ProfileBody>'
+        f'<CommNetworkProfile xsi:type="IOLinkCommNetworkProfileT" iolinkRevision="V1.1">'
+        f'<TransportLayers><PhysicalLayer bitrate="{bitrate}" minCycleTime="2300" sioSupported="true" '
+        f'mSequenceCapability="{mSequenceCapability}"/></TransportLayers>'
+        f'<Test><Config1 index="64" testValue="0x00"/></Test>'
+        f'</CommNetworkProfile>'
+        f'<ExternalTextCollection><PrimaryLanguage xml:lang="en">{_texts(textCount, "en")}</PrimaryLanguage>'
+        f'{translations}</ExternalTextCollection>'
+        f'<Stamp crc="0"><Checker name="none" version="V1.1"/></Stamp>'
+        f'</IODevice>\n'
+    )
+
+
+def writeSyntheticIodd(filename: str, **kwargs) -> str:
+    with open(filename, 'w', encoding='utf-8') as file:
+        file.write(createSyntheticIodd(**kwargs))
+    return filename
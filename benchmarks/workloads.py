@@ -0,0 +1,91 @@
+"""Reproducible IO-Link traffic for the benchmarks (fixed seeds, see TrafficGenerator)."""
+from array import array
+from random import Random
+from typing import List, NamedTuple, Optional
+
+from iolink_utils.definitions.bitRate import BitRate
+from iolink_utils.definitions.mSequenceType import MSeqType
+from iolink_utils.octetStreamDecoder.octetStreamDecoderSettings import DecoderSettings, MSeqPayloadLength
+from iolink_utils.octetStreamEncoder.trafficGenerator import TrafficGenerator
+
+BIT_RATES = (BitRate.COM1, BitRate.COM2, BitRate.COM3)
+M_SEQ_TYPES = (MSeqType.Type_0_STARTUP, MSeqType.Type_1_PREOPERATE, MSeqType.Type_2_OPERATE)
+
+START_TIME = 1_700_000_000_000_000_000  # ns
+CYCLE_TIME = 2_300_000  # ns
+
+
+class OctetStream(NamedTuple):
+    octets: bytes
+    startTimes: array
+    endTimes: array
+
+    def __len__(self):
+        return len(self.octets)
+
+
+def createSettings(bitRate: BitRate, od: int = 2, pdOut: int = 2, pdIn: int = 4) -> DecoderSettings:
+    return DecoderSettings(bitRate, MSeqPayloadLength(0, 1, 0), MSeqPayloadLength(0, 8, 0),
+                           MSeqPayloadLength(pdOut, od, pdIn))
+
+
+def fillMixedTraffic(generator: TrafficGenerator, transactions: int, seed: int = 1):
+    """PD cycles mixed with page reads, ISDUs and event memory reads (no settings changes)."""
+    rnd = Random(seed)
+    for number in range(transactions):
+        pd = generator.settings.getPayloadLength(generator.mSeqType)
+        generator.setProcessData(bytes(rnd.randrange(256) for _ in range(pd.pdOut)),
+                                 bytes(rnd.randrange(256) for _ in range(pd.pdIn)))
+        choice = rnd.random()
+        if choice < 0.6:
+            generator.cycle(rnd.randint(1, 8))
+        elif choice < 0.75:
+            generator.readPage(rnd.choice((1, 2, 8, 9)), rnd.randrange(256))
+        elif choice < 0.85:
+            data = bytes(rnd.randrange(256) for _ in range(rnd.randint(1, 64)))
+            generator.readISDU(rnd.choice((0x10, 0x12, 0x40)), data, busyCycles=rnd.randint(0, 2))
+        elif choice < 0.95:
+            data = bytes(rnd.randrange(256) for _ in range(rnd.randint(1, 16)))
+            generator.writeISDU(0x40 + rnd.randrange(64), data, subIndex=rnd.choice((None, 1)))
+        else:
+            generator.readEventMemory([(0x54, 0x1800 + number % 256)] * rnd.randint(1, 3))
+
+
+def fillISDUTraffic(generator: TrafficGenerator, transactions: int, dataLength: int = 64, seed: int = 2):
+    rnd = Random(seed)
+    for _ in range(transactions):
+        data = bytes(rnd.randrange(256) for _ in range(dataLength))
+        if rnd.random() < 0.5:
+            generator.readISDU(0x40 + rnd.randrange(64), data, subIndex=1)
+        else:
+            generator.writeISDU(0x40 + rnd.randrange(64), data, subIndex=1)
+
+
+def toOctetStream(generator: TrafficGenerator, seed: Optional[int] = 3) -> OctetStream:
+    """seed: random gaps within the timing limits, None: minimal gaps"""
+    octets = bytearray()
+    startTimes = array('q')
+    endTimes = array('q')
+    for chunk in generator.octetChunks(START_TIME, CYCLE_TIME, random=seed):
+        octets.extend(chunk.octets)
+        startTimes.extend(chunk.startTimes)
+        endTimes.extend(chunk.endTimes)
+    return OctetStream(bytes(octets), startTimes, endTimes)
+
+
+def mixedOctetStream(settings: DecoderSettings, mSeqType: MSeqType, transactions: int,
+                     seed: Optional[int] = 3) -> OctetStream:
+    generator = TrafficGenerator(settings, mSeqType)
+    fillMixedTraffic(generator, transactions)
+    return toOctetStream(generator, seed)
+
+
+def isduOctetStream(settings: DecoderSettings, transactions: int, dataLength: int = 64) -> OctetStream:
+    generator = TrafficGenerator(settings, MSeqType.Type_2_OPERATE)
+    fillISDUTraffic(generator, transactions, dataLength)
+    return toOctetStream(generator)
+
+
+def processDataSamples(length: int, count: int, seed: int = 4) -> List[bytes]:
+    rnd = Random(seed)
+    return [bytes(rnd.randrange(256) for _ in range(length)) for _ in range(count)]
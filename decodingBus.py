@@ -0,0 +1,186 @@
+import threading
+import weakref
+from collections import deque
+from typing import Deque, Dict, Hashable, NamedTuple, Optional, Set, Tuple, Union
+
+from iolink_utils.exceptions import IOLinkUtilsException
+from iolink_utils.octetStreamDecoder.octetStreamDecoder import OctetStreamDecoder, DecoderEngine
+from iolink_utils.octetStreamDecoder.octetStreamDecoderSettings import DecoderSettings
+from iolink_utils.octetStreamDecoder.octetStreamDecoderMessages import MasterMessage, DeviceMessage
+from iolink_utils.octetStreamDecoder.messagePool import MessagePool
+from iolink_utils.messageInterpreter.messageInterpreter import MessageInterpreter
+from iolink_utils.messageInterpreter.automaticSettingsHandler import AutomaticSettingsHandler
+from iolink_utils.utils.timestamp import Timebase
+
+# start time (ns), end time (ns) and octet of a saleae frame (octet None: error frame)
+Fingerprint = Tuple[int, int, Optional[int]]
+
+
+class BusRecord(NamedTuple):
+    fingerprint: Fingerprint
+    message: Union[None, MasterMessage, DeviceMessage]
+    transaction: object  # None or transaction of MessageInterpreter.processMessage
+    settings: DecoderSettings  # decoder settings after the message (incl. automatic settings)
+
+
+_NO_MESSAGE = BusRecord(None, None, None, None)
+
+
+class DecodingBus:
+    """
+    Decoder, interpreter and automatic settings of one input stream, shared by analyzer instances.
+
+    Every subscriber (analyzer) passes the frames of the input analyzer by index (0, 1, ...). The first
+    subscriber requesting a frame decodes it, the others read the record of the frame from a bounded
+    fan-out buffer (last `capacity` frames). Messages are released to the pool when their record is dropped.
+    The decoding subscriber never waits (it runs on the decode thread of Logic 2): if the buffer is full,
+    subscribers still using the oldest record are stalled, they get None and have to continue with an own bus.
+
+    Analyzers can join as long as the first frame is buffered (isJoinable). A bus with a single
+    subscriber after that decodes without buffer (records are valid until the next call).
+    """
+
+    def __init__(self, settings: DecoderSettings, capacity: int = 4096):
+        if capacity < 1:
+            raise ValueError(f"Invalid capacity: {capacity}")
+
+        self.decoder: OctetStreamDecoder = OctetStreamDecoder(settings, Timebase.Nanoseconds, MessagePool(),
+                                                              DecoderEngine.TransitionTable)
+        self.interpreter: MessageInterpreter = MessageInterpreter()
+        self.automaticSettingsHandler: AutomaticSettingsHandler = AutomaticSettingsHandler(
+            getter=lambda: self.decoder.settings,
+            setter=self._setDecoderSettings
+        )
+
+        self._capacity: int = capacity
+        self._records: Deque[BusRecord] = deque()
+        self._firstIndex: int = 0  # frame index of _records[0]
+        self._lock: threading.Lock = threading.Lock()
+        self._positions: Dict[int, int] = {}  # subscriber -> index of the frame in use (until next call)
+        self._stalled: Set[int] = set()
+        self._exclusiveSubscriber: Optional[int] = None  # single subscriber, not joinable -> no buffer
+        self._lastMessage: Union[None, MasterMessage, DeviceMessage] = None  # exclusive: released with next frame
+
+    @property
+    def isJoinable(self) -> bool:
+        """True as long as the record of the first frame is buffered (analyzers can start reading)"""
+        return self._firstIndex == 0
+
+    def subscribe(self) -> Optional[int]:
+        """Adds a subscriber reading from the first frame, None if the bus is no longer joinable"""
+        with self._lock:
+            if not self.isJoinable:
+                return None
+            subscriber = len(self._positions)
+            self._positions[subscriber] = 0
+            return subscriber
+
+    def printDecoderSettings(self):
+        print(f"   Startup:    {self.decoder.settings.startup}")
+        print(f"   Preoperate: {self.decoder.settings.preoperate}")
+        print(f"   Operate:    {self.decoder.settings.operate}")
+
+    def _setDecoderSettings(self, settings: DecoderSettings):
+        self.decoder.setSettings(settings)
+        print(f"M-Sequence payload sizes (updated)")
+        self.printDecoderSettings()
+
+    def reset(self):
+        self.decoder.reset()
+        self.interpreter.reset()
+
+    def record(self, subscriber: int, index: int, fingerprint: Fingerprint) -> Optional[BusRecord]:
+        """Record of frame index (decoded if it is the next frame), None if stalled or of another frame."""
+        if self._exclusiveSubscriber is not None:
+            if subscriber != self._exclusiveSubscriber:
+                return None
+            self.decoder.releaseMessage(self._lastMessage)
+            message, transaction = self._decode(fingerprint)
+            self._lastMessage = message
+            if message is None:
+                return _NO_MESSAGE
+            return BusRecord(fingerprint, message, transaction, self.decoder.settings)
+
+        with self._lock:
+            position = index - self._firstIndex
+            recordCount = len(self._records)
+            if position < 0 or position > recordCount or subscriber in self._stalled:
+                return None
+            self._positions[subscriber] = index
+
+            if position < recordCount:
+                record = self._records[position]
+                return record if record.fingerprint == fingerprint else None
+
+            record = BusRecord(fingerprint, *self._decode(fingerprint), self.decoder.settings)
+            self._records.append(record)
+            if len(self._records) > self._capacity:
+                self._dropOldestRecord()
+                if len(self._positions) - len(self._stalled) == 1:
+                    self._exclusiveSubscriber = subscriber
+                    self._lastMessage = record.message
+                    for dropped in self._records:
+                        if dropped is not record:
+                            self.decoder.releaseMessage(dropped.message)
+                    self._records.clear()
+            return record
+
+    def _isOldestRecordInUse(self) -> bool:
+        if not self._stalled:
+            return min(self._positions.values()) <= self._firstIndex
+        return any(position <= self._firstIndex for subscriber, position in self._positions.items()
+                   if subscriber not in self._stalled)
+
+    def _dropOldestRecord(self):
+        # subscribers still using the record lag behind by more than the capacity -> stalled. Their
+        # message is not recycled, it may still be in use until their next call.
+        inUse = self._isOldestRecordInUse()
+        if inUse:
+            self._stalled.update(subscriber for subscriber, position in self._positions.items()
+                                 if position <= self._firstIndex)
+
+        record = self._records.popleft()
+        if not inUse:
+            self.decoder.releaseMessage(record.message)
+        self._firstIndex += 1
+
+    def _decode(self, fingerprint: Fingerprint) -> Tuple[Union[None, MasterMessage, DeviceMessage], object]:
+        startTime, endTime, octet = fingerprint
+        if octet is None:
+            self.reset()
+            return None, None
+
+        message = None
+        try:
+            message = self.decoder.processOctet(octet, startTime, endTime)
+            transaction = self.interpreter.processMessage(message) if message is not None else None
+            if transaction:
+                transaction.dispatch(self.automaticSettingsHandler)  # this updates decoder settings
+        except (IOLinkUtilsException, ValueError, IndexError):
+            self.decoder.releaseMessage(message)
+            self.reset()
+            return None, None
+
+        return message, transaction
+
+
+class DecodingBusRegistry:
+    """Process-wide buses, keyed by IODD, decoder settings and first frame of the input stream."""
+
+    def __init__(self):
+        self._buses: "weakref.WeakValueDictionary[Hashable, DecodingBus]" = weakref.WeakValueDictionary()
+        self._lock: threading.Lock = threading.Lock()
+
+    def join(self, key: Hashable, bus: DecodingBus) -> Tuple[DecodingBus, int]:
+        """Subscribes to the joinable bus registered for key, otherwise to bus (registered for key)."""
+        with self._lock:
+            registered = self._buses.get(key)
+            if registered is not None:
+                subscriber = registered.subscribe()
+                if subscriber is not None:
+                    return registered, subscriber
+            self._buses[key] = bus
+            return bus, bus.subscribe()
+
+
+decodingBusRegistry = DecodingBusRegistry()
@@ -1,25 +1,31 @@
+import weakref
 from pathlib import Path
 from pprint import pprint
+from typing import Dict, FrozenSet, List, Optional, Union
 
-from saleae.analyzers import HighLevelAnalyzer, AnalyzerFrame, StringSetting, ChoicesSetting
+from saleae.analyzers import HighLevelAnalyzer, AnalyzerFrame, StringSetting, ChoicesSetting, NumberSetting
 
 from iolink_utils.iodd.iodd import Iodd
 from iolink_utils.octetStreamDecoder.octetStreamDecoder import OctetStreamDecoder
 from iolink_utils.octetStreamDecoder.octetStreamDecoderSettings import DecoderSettings
 from iolink_utils.messageInterpreter.messageInterpreter import MessageInterpreter
-from iolink_utils.processDataDecoder.processDataDecoder import createDecoderClass_PDOut, createDecoderClass_PDIn
+from iolink_utils.messageInterpreter.transactionHandler import TransactionHandler
 from iolink_utils.exceptions import IOLinkUtilsException
+from iolink_utils.utils.timestamp import datetimeToNs
+from iolink_utils.utils.instrumentation import Instrumentation, instrumentationTarget
 
 from analyzerMode import AnalyzerMode
 from messageHandler import MSequenceHandler, ProcessDataHandler
 from transactionHandler import DiagnosisHandler, PageHandler, ISDUHandler
-from automaticSettingsHandler import AutomaticSettingsHandler
+from decodingBus import DecodingBus, BusRecord, Fingerprint, decodingBusRegistry
 
 
 class IOLinkProtocolAnalyzer(HighLevelAnalyzer):
     iodd_xml_pathAndFilename = StringSetting(label='IODD XML file')
     analyzer_mode_setting = ChoicesSetting(AnalyzerMode.descriptions())
+    frame_types_setting = StringSetting(label='Combined mode: frame types, e.g. "MSequence, ISDU" (default: all)')
     process_data_condition = StringSetting(label='Condition value to select ProcessData definition (default: empty)')
+    statistics_interval = NumberSetting(label='Interval of decoder statistics frames in s (0: off)', min_value=0)
 
     # only result types with a special display format are listed. Everything else just shows content of data dictionary
     result_types = {
@@ -37,11 +43,19 @@ class IOLinkProtocolAnalyzer(HighLevelAnalyzer):
         },
         'DiagReset': {
             'format': 'Diagnosis(Reset)'
+        },
+        'Statistics': {
+            'format': 'Statistics(checksum errors: {{data.masterChecksumErrors}}/{{data.deviceChecksumErrors}}, '
+                      'resyncs: {{data.timingResyncs}}, dropped: {{data.droppedMSequences}}, '
+                      'ISDU aborts/breaks: {{data.isduAborts}}/{{data.flowControlBreaks}})'
         }
     }
 
     def __init__(self, *args, **kwargs):
         self.analyzerMode: AnalyzerMode = AnalyzerMode(self.analyzer_mode_setting)
+        self.frameModes: FrozenSet[AnalyzerMode] = \
+            AnalyzerMode.parseFrameModes(str(self.frame_types_setting or '')) \
+            if self.analyzerMode == AnalyzerMode.Combined else frozenset([self.analyzerMode])
 
         iodd_filename_setting = str(self.iodd_xml_pathAndFilename).strip('"')
         if len(iodd_filename_setting) < 5:
@@ -51,7 +65,7 @@ class IOLinkProtocolAnalyzer(HighLevelAnalyzer):
         if not filename.is_file():
             raise FileNotFoundError(f"IODD file '{filename}' not found.")
 
-        self.iodd = Iodd(str(filename))
+        self.iodd = Iodd.load(str(filename))  # shared with other analyzers using the same file
 
         # process data
         pdCondition = None
@@ -61,16 +75,50 @@ class IOLinkProtocolAnalyzer(HighLevelAnalyzer):
             raise ValueError(f"Invalid ProcessDataCondition: {pdCondition}. "
                              f"Allowed values are: {', '.join(self.iodd.processDataConditionValues)}.")
 
-        self.DecoderPDOut = createDecoderClass_PDOut(self.iodd.processDataDefinition, pdCondition)
-        self.DecoderPDIn = createDecoderClass_PDIn(self.iodd.processDataDefinition, pdCondition)
-
-        settings = DecoderSettings.fromIODD(self.iodd)
-        self.decoder = OctetStreamDecoder(settings)
-        self.interpreter = MessageInterpreter()
-        self.automaticSettingsHandler = AutomaticSettingsHandler(
-            getter=lambda: self.decoder.settings,
-            setter=self._setDecoderSettings
-        )
+        self.DecoderPDOut, self.DecoderPDIn = self.iodd.processDataDecoderClasses(pdCondition)
+
+        # decoder and interpreter are shared with other analyzers of the same input stream and IODD
+        # (see DecodingBus). Which bus is used is known with the first frame, until then this bus is used.
+        self._filename: str = str(filename)
+        self._settings: DecoderSettings = DecoderSettings.fromIODD(self.iodd)
+        self._bus: DecodingBus = DecodingBus(self._settings)
+        self._busSubscriber: Optional[int] = None  # None: not joined yet
+        self._busIndex: int = 0  # index of the next frame on the bus
+        self._recordSettings: DecoderSettings = self._settings  # decoder settings of the record dispatched
+
+        # frame creation of all enabled modes, done in a single decoding pass
+        # (handlers are created for enabled modes only, e.g. the IODD variables are only parsed for ISDUs)
+        transactionHandlers = {
+            AnalyzerMode.Diagnosis: DiagnosisHandler,
+            AnalyzerMode.Page: PageHandler,
+            AnalyzerMode.ISDU: lambda: ISDUHandler(self.iodd.standardVariableCollection, self.iodd.variableCollection)
+        }
+        messageHandlers = {
+            AnalyzerMode.MSequence: MSequenceHandler,
+            AnalyzerMode.ProcessData: lambda: ProcessDataHandler(lambda: self._recordSettings,
+                                                                 self.DecoderPDOut, self.DecoderPDIn)
+        }
+        self._transactionHandlers: List[TransactionHandler] = \
+            [createHandler() for mode, createHandler in transactionHandlers.items() if mode in self.frameModes]
+        self._messageHandlers: List[Union[MSequenceHandler, ProcessDataHandler]] = \
+            [createHandler() for mode, createHandler in messageHandlers.items() if mode in self.frameModes]
+
+        # decoding errors are counted (see decoder.statistics, interpreter.statistics) and reported in
+        # 'Statistics' frames every statistics_interval seconds of capture time
+        self.errorFrames: int = 0  # saleae frames with error (e.g. framing error)
+        self.handlerErrors: int = 0  # errors while converting messages/transactions into frames
+        self.busDetaches: int = 0  # switched to an own bus (lagging behind the shared bus)
+        self._statisticsIntervalNs: int = round(float(self.statistics_interval or 0) * 1e9)
+        self._nextStatisticsTime: Optional[int] = None
+
+        # hot-path timing, only if enabled by environment variable IOLINK_INSTRUMENTATION
+        # (decoder and interpreter are timed by the analyzer that created the bus, see _instrumentBus)
+        self.instrumentation: Optional[Instrumentation] = None
+        target = instrumentationTarget()
+        if target:
+            self.instrumentation = Instrumentation()
+            self.instrumentation.instrument(self, '_dispatchMessage', 'analyzer._dispatchMessage')
+            weakref.finalize(self, self.instrumentation.dump, target)
 
         self.printAnalyzerSettings()
 
@@ -85,62 +133,104 @@ class IOLinkProtocolAnalyzer(HighLevelAnalyzer):
         pprint(self.iodd.processDataDefinition)
 
         print(f"M-Sequence payload sizes")
-        self._printDecoderSettings()
-
-    def _printDecoderSettings(self):
-        print(f"   Startup:    {self.decoder.settings.startup}")
-        print(f"   Preoperate: {self.decoder.settings.preoperate}")
-        print(f"   Operate:    {self.decoder.settings.operate}")
+        self._bus.printDecoderSettings()
+
+    @property
+    def decoder(self) -> OctetStreamDecoder:
+        return self._bus.decoder
+
+    @property
+    def interpreter(self) -> MessageInterpreter:
+        return self._bus.interpreter
+
+    def _instrumentBus(self):
+        # only the bus decoding for this analyzer is known after the first frame (own or shared bus)
+        if self.instrumentation is not None:
+            self.instrumentation.instrumentDecoder(self.decoder)
+            self.instrumentation.instrumentInterpreter(self.interpreter)
+
+    def _record(self, fingerprint: Fingerprint) -> BusRecord:
+        if self._busSubscriber is None:
+            ownBus = self._bus
+            self._bus, self._busSubscriber = \
+                decodingBusRegistry.join((self._filename, self._settings, fingerprint), ownBus)
+            if self._bus is ownBus:
+                self._instrumentBus()  # otherwise timed by the analyzer that created the shared bus
+
+        record = self._bus.record(self._busSubscriber, self._busIndex, fingerprint)
+        if record is None:
+            # stalled on the shared bus: continue with an own one (state of incomplete messages is lost)
+            self.busDetaches += 1
+            self._bus = DecodingBus(self._settings)
+            self._busSubscriber = self._bus.subscribe()  # not registered, always joinable
+            self._instrumentBus()
+            self._busIndex = 0
+            record = self._bus.record(self._busSubscriber, self._busIndex, fingerprint)
+
+        self._busIndex += 1
+        return record
+
+    def _dispatchMessage(self, record: BusRecord):
+        frames = []
+        self._recordSettings = record.settings
+
+        # convert transactions into saleae frames
+        if record.transaction:
+            for handler in self._transactionHandlers:
+                frames.extend(record.transaction.dispatch(handler))
 
-    def _setDecoderSettings(self, settings: DecoderSettings):
-        self.decoder.setSettings(settings)
-        print(f"M-Sequence payload sizes (updated)")
-        self._printDecoderSettings()
+        # convert messages into saleae frames
+        for handler in self._messageHandlers:
+            frames.extend(record.message.dispatch(handler))
+
+        return frames
+
+    def statistics(self) -> Dict[str, int]:
+        """
+        Decoder and interpreter counters of the bus in use (cumulative, restarted on a bus detach)
+        and errors seen by the analyzer.
+        """
+        decoderStatistics = self.decoder.statistics.asDict()
+        interpreterStatistics = self.interpreter.statistics.asDict()
+        # both count resets, keep them apart (the decoder is also reset alone, e.g. on decoding errors)
+        decoderStatistics['decoderResets'] = decoderStatistics.pop('resets')
+        interpreterStatistics['interpreterResets'] = interpreterStatistics.pop('resets')
+        return {**decoderStatistics,
+                **interpreterStatistics,
+                'errorFrames': self.errorFrames,
+                'handlerErrors': self.handlerErrors,
+                'busDetaches': self.busDetaches}
+
+    def _decodeOctet(self, frame: AnalyzerFrame, endTime: int) -> List[AnalyzerFrame]:
+        if 'error' in frame.data:
+            self.errorFrames += 1
+            octet = None  # resets decoder and interpreter
+        else:
+            octet = frame.data['data'][0]
 
-    def _dispatchMessage(self, message):
-        if message is None:
+        record = self._record((datetimeToNs(frame.start_time.as_datetime()), endTime, octet))
+        if record.message is None:
             return []
 
-        # interpret messages
-        transaction = self.interpreter.processMessage(message)
-        if transaction:
-            transaction.dispatch(self.automaticSettingsHandler)  # this updates decoder settings
-
-            # convert transactions into saleae frames
-            if self.analyzerMode == AnalyzerMode.Diagnosis:
-                return transaction.dispatch(DiagnosisHandler())
-            if self.analyzerMode == AnalyzerMode.Page:
-                return transaction.dispatch(PageHandler())
-            if self.analyzerMode == AnalyzerMode.ISDU:
-                return transaction.dispatch(
-                    ISDUHandler(self.iodd.standardVariableCollection, self.iodd.variableCollection))
-
-        # convert messages into saleae frames
-        if self.analyzerMode == AnalyzerMode.MSequence:
-            return message.dispatch(MSequenceHandler())
-        if self.analyzerMode == AnalyzerMode.ProcessData:
-            return message.dispatch(ProcessDataHandler(self.decoder, self.DecoderPDOut, self.DecoderPDIn))
-
-        return []
+        try:
+            return self._dispatchMessage(record)
+        except (IOLinkUtilsException, ValueError, IndexError):
+            self.handlerErrors += 1  # decoder and interpreter state is not affected
+            return []
 
     def decode(self, frame: AnalyzerFrame):
         if frame.type != 'data':
             return []
 
-        if 'error' in frame.data:
-            self.decoder.reset()
-            self.interpreter.reset()
-            return []
+        endTime = datetimeToNs(frame.end_time.as_datetime())
+        frames = self._decodeOctet(frame, endTime)
 
-        try:
-            message = self.decoder.processOctet(
-                frame.data['data'][0],
-                frame.start_time.as_datetime(),
-                frame.end_time.as_datetime()
-            )
-            return self._dispatchMessage(message)
-        except (IOLinkUtilsException, ValueError, IndexError) as e:
-            print(e)
-            self.decoder.reset()
-            self.interpreter.reset()
-            return []
+        if self._statisticsIntervalNs:
+            if self._nextStatisticsTime is None:
+                self._nextStatisticsTime = endTime + self._statisticsIntervalNs
+            elif endTime >= self._nextStatisticsTime:
+                self._nextStatisticsTime = endTime + self._statisticsIntervalNs
+                frames = list(frames or [])
+                frames.append(AnalyzerFrame('Statistics', frame.start_time, frame.end_time, self.statistics()))
+
+        return frames
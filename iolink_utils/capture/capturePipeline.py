@@ -0,0 +1,201 @@
+"""
+Lazy generator stages for offline analysis (no saleae required):
+
+    octets (OctetChunk) -> decodeMessages -> interpretMessages -> selectTransactions -> decodeTransactions
+                                                              \\-> decodeProcessData
+
+Each stage pulls from the previous one only when its consumer asks for the next item, so memory
+is bounded by the chunk size of the reader and decoding can be stopped at any point.
+"""
+import ctypes
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, Union
+
+from iolink_utils.exceptions import IOLinkUtilsException
+from iolink_utils.utils.timestamp import Timebase, Timestamp
+from iolink_utils.octetStreamDecoder.octetStreamDecoder import OctetStreamDecoder
+from iolink_utils.octetStreamDecoder.octetStreamDecoderMessages import MasterMessage, DeviceMessage
+from iolink_utils.messageInterpreter.messageInterpreter import MessageInterpreter
+from iolink_utils.messageInterpreter.automaticSettingsHandler import AutomaticSettingsHandler
+from iolink_utils.messageInterpreter.transaction import Transaction
+from iolink_utils.messageInterpreter.transactionHandler import TransactionHandler
+from iolink_utils.messageInterpreter.page.transactionPage import TransactionPage
+from iolink_utils.messageInterpreter.process.transactionProcess import TransactionProcess
+from iolink_utils.messageInterpreter.diagnosis.transactionDiagnosis import (
+    TransactionDiagEventMemory,
+    TransactionDiagEventReset
+)
+from iolink_utils.messageInterpreter.isdu.ISDU import ISDU
+from iolink_utils.iodd.iodd import Iodd
+from iolink_utils.capture.octetChunk import OctetChunk
+
+
+class DecodingReset(NamedTuple):
+    """Marker in the message stream: capture or decoding error, following stages have to reset."""
+    time: Optional[int]  # ns, start of the octet/chunk causing the reset (None: unknown)
+
+
+class DecodedMessage(NamedTuple):
+    message: Union[MasterMessage, DeviceMessage]
+    transaction: Optional[Transaction]  # transaction completed by this message
+
+
+class Record(NamedTuple):
+    """Decoded content of a transaction or process data (library equivalent of an AnalyzerFrame)."""
+    type: str  # 'PD in', 'PD out', 'Page', 'DiagRead', 'DiagReset', 'Process' or ISDU name
+    startTime: Timestamp
+    endTime: Timestamp
+    data: Dict
+
+
+def decodeMessages(chunks: Iterable[OctetChunk], decoder: OctetStreamDecoder) \
+        -> Iterator[Union[MasterMessage, DeviceMessage, DecodingReset]]:
+    """
+    Stage 1: octets -> messages. Decoding errors reset the decoder and yield a DecodingReset.
+
+    If the decoder uses a MessagePool, a message is released when the next one is requested.
+    """
+    if decoder.timebase != Timebase.Nanoseconds:
+        raise ValueError("Decoder timebase has to be Timebase.Nanoseconds (captures provide ns timestamps)")
+
+    for chunk in chunks:
+        if chunk.reset:
+            decoder.reset()
+            yield DecodingReset(chunk.startTimes[0] if len(chunk) else None)
+
+        for octet, startTime, endTime in zip(chunk.octets, chunk.startTimes, chunk.endTimes):
+            try:
+                message = decoder.processOctet(octet, startTime, endTime)
+            except (IOLinkUtilsException, ValueError, IndexError):
+                decoder.reset()
+                yield DecodingReset(startTime)
+                continue
+
+            if message is not None:
+                yield message
+                decoder.releaseMessage(message)
+
+
+def interpretMessages(messages: Iterable[Union[MasterMessage, DeviceMessage, DecodingReset]],
+                      decoder: Optional[OctetStreamDecoder] = None,
+                      interpreter: Optional[MessageInterpreter] = None,
+                      automaticSettings: bool = True) -> Iterator[DecodedMessage]:
+    """
+    Stage 2: messages -> messages with the transaction (Page, ISDU, ...) they complete.
+
+    :param messages: e.g. decodeMessages(...)
+    :param decoder: decoder of the message stage, reset on interpreter errors and updated by automatic
+                    settings before it decodes the next octet (optional)
+    :param interpreter: default: new MessageInterpreter
+    :param automaticSettings: update decoder settings from Page 1 (MSequenceCapability, PDin, PDout)
+    """
+    interpreter = interpreter if interpreter is not None else MessageInterpreter()
+    settingsHandler = AutomaticSettingsHandler(
+        getter=lambda: decoder.settings,
+        setter=decoder.setSettings
+    ) if automaticSettings and decoder is not None else None
+
+    for message in messages:
+        if isinstance(message, DecodingReset):
+            interpreter.reset()
+            continue
+
+        try:
+            transaction = interpreter.processMessage(message)
+            if transaction and settingsHandler:
+                transaction.dispatch(settingsHandler)  # affects the following octets
+        except (IOLinkUtilsException, ValueError, IndexError):
+            if decoder is not None:
+                decoder.reset()
+            interpreter.reset()
+            continue
+
+        yield DecodedMessage(message, transaction)
+
+
+def selectTransactions(decodedMessages: Iterable[DecodedMessage]) -> Iterator[Transaction]:
+    """Stage 3: completed transactions only."""
+    for decoded in decodedMessages:
+        if decoded.transaction is not None:
+            yield decoded.transaction
+
+
+class _RecordHandler(TransactionHandler):
+    def __init__(self, iodd: Optional[Iodd]):
+        self.iodd: Optional[Iodd] = iodd
+
+    def handlePage(self, transaction: TransactionPage):
+        return [Record('Page', transaction.startTime, transaction.endTime, transaction.data())]
+
+    def handleDiagEventMemory(self, transaction: TransactionDiagEventMemory):
+        return [Record('DiagRead', transaction.startTime, transaction.endTime, transaction.data())]
+
+    def handleDiagEventReset(self, transaction: TransactionDiagEventReset):
+        return [Record('DiagReset', transaction.startTime, transaction.endTime, transaction.data())]
+
+    def handleISDU(self, transaction: ISDU):
+        data = dict(transaction.data())
+        if 'index' in data and self.iodd is not None:
+            variable = (self.iodd.variableCollection.get(data['index']) or
+                        self.iodd.standardVariableCollection.get(data['index']))
+            if variable:
+                data['name'] = variable.name
+        return [Record(transaction.name(), transaction.startTime, transaction.endTime, data)]
+
+    def handleProcess(self, transaction: TransactionProcess):
+        return [Record('Process', transaction.startTime, transaction.endTime, transaction.data())]
+
+
+def decodeTransactions(transactions: Iterable[Transaction], iodd: Optional[Iodd] = None) -> Iterator[Record]:
+    """Stage 4: transactions -> records. ISDU records get the variable name (if an IODD is given)."""
+    handler = _RecordHandler(iodd)
+    for transaction in transactions:
+        yield from transaction.dispatch(handler)
+
+
+def decodeProcessData(decodedMessages: Iterable[DecodedMessage], DecoderPDOut=None, DecoderPDIn=None) \
+        -> Iterator[Record]:
+    """
+    Stage 4 (process data): messages -> 'PD out' / 'PD in' records with decoded fields.
+
+    Messages whose process data length does not match the decoder class (e.g. not in operate) are skipped.
+
+    :param DecoderPDOut: see processDataDecoder.createDecoderClass_PDOut (None: PDout is skipped)
+    :param DecoderPDIn: see processDataDecoder.createDecoderClass_PDIn (None: PDin is skipped)
+    """
+    pdOutSize = ctypes.sizeof(DecoderPDOut) if DecoderPDOut is not None else None
+    pdInSize = ctypes.sizeof(DecoderPDIn) if DecoderPDIn is not None else None
+
+    for decoded in decodedMessages:
+        message = decoded.message
+        if isinstance(message, MasterMessage):
+            if pdOutSize and len(message.pdOut) == pdOutSize:
+                yield Record('PD out', message.startTime, message.endTime,
+                             _decodeProcessData('pdOut', message.pdOut, DecoderPDOut))
+        elif pdInSize and len(message.pdIn) == pdInSize:
+            yield Record('PD in', message.startTime, message.endTime,
+                         _decodeProcessData('pdIn', message.pdIn, DecoderPDIn))
+
+
+def _decodeProcessData(name: str, processData, Decoder) -> Dict:
+    decodedPD = Decoder.from_buffer_copy(processData)
+    data = {name: bytes(processData).hex()}
+    for fieldName in decodedPD.field_names:
+        value = getattr(decodedPD, fieldName)
+        data[fieldName] = bytes(value) if isinstance(value, ctypes.Array) else value
+    return data
+
+
+def decodeCapture(chunks: Iterable[OctetChunk], decoder: OctetStreamDecoder,
+                  interpreter: Optional[MessageInterpreter] = None,
+                  automaticSettings: bool = True) -> Iterator[DecodedMessage]:
+    """
+    Decodes and interprets captured octets (offline equivalent of IOLinkProtocolAnalyzer.decode).
+
+    Same as interpretMessages(decodeMessages(chunks, decoder), decoder, interpreter, automaticSettings).
+
+    :param chunks: e.g. readSaleaeCsv(...)
+    :param decoder: decoder with Timebase.Nanoseconds
+    :param interpreter: default: new MessageInterpreter
+    :param automaticSettings: update decoder settings from Page 1 (MSequenceCapability, PDin, PDout)
+    """
+    return interpretMessages(decodeMessages(chunks, decoder), decoder, interpreter, automaticSettings)
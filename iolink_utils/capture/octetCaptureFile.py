@@ -0,0 +1,313 @@
+"""
+Binary capture format for octet streams (*.iolcap), read via mmap without copying.
+
+File layout (little-endian):
+    header      magic, version, chunk size, octet count, chunk count, index offset
+    chunks      per chunk (n octets, each part 8-byte aligned):
+                  n x uint8   octets
+                  n x int64   start time (ns)
+                  n x int64   end time (ns)
+                  bitmap      bit i set: decoding has to be reset before octet i (error in capture)
+    index       per chunk: offset, octet count, reset count, start time of first octet, end time of last octet
+"""
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+from iolink_utils.exceptions import InvalidCaptureFile
+from iolink_utils.capture.octetChunk import OctetChunk
+
+_MAGIC = b'IOLCAP\x00\x00'
+_VERSION = 1
+_HEADER = struct.Struct('<8sHHIQQQ')
+_HEADER_SIZE = 64
+_INDEX_ENTRY = struct.Struct('<QIIqq')
+_ALIGNMENT = 8
+_NATIVE_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+def _align(value: int) -> int:
+    return (value + _ALIGNMENT - 1) & ~(_ALIGNMENT - 1)
+
+
+class _ChunkLayout(NamedTuple):
+    startTimes: int  # offsets relative to chunk start
+    endTimes: int
+    resetBitmap: int
+    size: int
+
+    @staticmethod
+    def create(count: int) -> "_ChunkLayout":
+        startTimes = _align(count)
+        endTimes = startTimes + 8 * count
+        resetBitmap = endTimes + 8 * count
+        return _ChunkLayout(startTimes, endTimes, resetBitmap, _align(resetBitmap + (count + 7) // 8))
+
+
+class ChunkInfo(NamedTuple):
+    offset: int
+    octetCount: int
+    resetCount: int
+    startTime: int  # ns, first octet
+    endTime: int  # ns, last octet
+
+
+class OctetCaptureWriter:
+    """Writes octets (e.g. from readSaleaeCsv) into a capture file. Memory is bounded by chunkSize."""
+
+    def __init__(self, filename: str, chunkSize: int = 65536):
+        if chunkSize < 1:
+            raise ValueError(f"Invalid chunk size: {chunkSize}")
+
+        self._file = open(filename, 'wb')
+        self._file.write(bytes(_HEADER_SIZE))  # written on close
+
+        self._chunkSize: int = chunkSize
+        self._index: List[ChunkInfo] = []
+        self._octetCount: int = 0
+
+        self._octets: bytearray = bytearray()
+        self._startTimes: array = array('q')
+        self._endTimes: array = array('q')
+        self._resetBitmap: bytearray = bytearray((chunkSize + 7) // 8)
+        self._resetCount: int = 0
+        self._pendingReset: bool = False  # reset of an empty chunk, applied to the next octet
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    @property
+    def octetCount(self) -> int:
+        """Number of octets written so far"""
+        return self._octetCount + len(self._octets)
+
+    def append(self, octet: int, startTime: int, endTime: int, reset: bool = False):
+        if reset or self._pendingReset:
+            self._pendingReset = False
+            index = len(self._octets)
+            self._resetBitmap[index >> 3] |= 1 << (index & 7)
+            self._resetCount += 1
+
+        self._octets.append(octet)
+        self._startTimes.append(startTime)
+        self._endTimes.append(endTime)
+        if len(self._octets) == self._chunkSize:
+            self._writeChunk()
+
+    def appendChunk(self, chunk: OctetChunk):
+        if len(chunk) == 0:
+            self._pendingReset = self._pendingReset or chunk.reset
+            return
+
+        reset = chunk.reset or self._pendingReset
+        position = 0
+        while position < len(chunk):
+            count = min(len(chunk) - position, self._chunkSize - len(self._octets))
+            if reset:
+                self.append(chunk.octets[position], chunk.startTimes[position], chunk.endTimes[position], True)
+                reset = False
+                position += 1
+                continue
+
+            self._octets.extend(chunk.octets[position:position + count])
+            self._startTimes.extend(chunk.startTimes[position:position + count])
+            self._endTimes.extend(chunk.endTimes[position:position + count])
+            position += count
+            if len(self._octets) == self._chunkSize:
+                self._writeChunk()
+
+    def _writeChunk(self):
+        count = len(self._octets)
+        if count == 0:
+            return
+
+        layout = _ChunkLayout.create(count)
+        startTimes, endTimes = self._startTimes, self._endTimes
+        if not _NATIVE_LITTLE_ENDIAN:  # pragma: no cover
+            startTimes, endTimes = array('q', startTimes), array('q', endTimes)
+            startTimes.byteswap()
+            endTimes.byteswap()
+
+        offset = self._file.tell()
+        chunk = bytearray(layout.size)
+        chunk[0:count] = self._octets
+        chunk[layout.startTimes:layout.endTimes] = startTimes.tobytes()
+        chunk[layout.endTimes:layout.resetBitmap] = endTimes.tobytes()
+        chunk[layout.resetBitmap:layout.resetBitmap + (count + 7) // 8] = self._resetBitmap[:(count + 7) // 8]
+        self._file.write(chunk)
+
+        self._index.append(ChunkInfo(offset, count, self._resetCount, self._startTimes[0], self._endTimes[-1]))
+        self._octetCount += count
+
+        self._octets = bytearray()
+        self._startTimes = array('q')
+        self._endTimes = array('q')
+        self._resetBitmap = bytearray(len(self._resetBitmap))
+        self._resetCount = 0
+
+    def close(self):
+        if self._file.closed:
+            return
+
+        self._writeChunk()
+        indexOffset = self._file.tell()
+        for info in self._index:
+            self._file.write(_INDEX_ENTRY.pack(*info))
+
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, 0, self._chunkSize,
+                                      self._octetCount, len(self._index), indexOffset))
+        self._file.close()
+
+
+def writeOctetCapture(filename: str, chunks: Iterable[OctetChunk], chunkSize: int = 65536) -> int:
+    """Convert octet chunks (e.g. readSaleaeCsv(...)) into a capture file. Returns number of octets."""
+    with OctetCaptureWriter(filename, chunkSize) as writer:
+        for chunk in chunks:
+            writer.appendChunk(chunk)
+    return writer.octetCount
+
+
+class OctetCaptureFile:
+    """
+    Memory-mapped capture file. OctetChunks returned by read are memoryviews into the mapping
+    (no copies) and can be passed to OctetStreamDecoder.processOctets or decodeCapture directly.
+    If chunks are still referenced when the file is closed, the mapping is released together with them.
+    """
+
+    def __init__(self, filename: str):
+        with open(filename, 'rb') as file:
+            try:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                raise InvalidCaptureFile(f"Not a capture file: '{filename}'") from None
+
+        try:
+            self._chunks: List[ChunkInfo] = self._readIndex(filename)
+        except InvalidCaptureFile:
+            self._mmap.close()
+            raise
+
+        self._buffer: memoryview = memoryview(self._mmap)
+        self._chunkStartTimes: List[int] = [info.startTime for info in self._chunks]
+        self._chunkFirstOctets: List[int] = []  # index of first octet of each chunk
+        octetIndex = 0
+        for info in self._chunks:
+            self._chunkFirstOctets.append(octetIndex)
+            octetIndex += info.octetCount
+
+    def _readIndex(self, filename: str) -> List[ChunkInfo]:
+        if len(self._mmap) < _HEADER_SIZE:
+            raise InvalidCaptureFile(f"Not a capture file: '{filename}'")
+
+        magic, version, _, self._chunkSize, self._octetCount, chunkCount, indexOffset = \
+            _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            raise InvalidCaptureFile(f"Not a capture file: '{filename}'")
+        if version != _VERSION:
+            raise InvalidCaptureFile(f"Unsupported capture file version {version}: '{filename}'")
+        if indexOffset + chunkCount * _INDEX_ENTRY.size > len(self._mmap):
+            raise InvalidCaptureFile(f"Capture file is truncated: '{filename}'")
+
+        return [ChunkInfo(*_INDEX_ENTRY.unpack_from(self._mmap, indexOffset + index * _INDEX_ENTRY.size))
+                for index in range(chunkCount)]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._octetCount
+
+    @property
+    def chunks(self) -> List[ChunkInfo]:
+        return self._chunks
+
+    @property
+    def startTime(self) -> Optional[int]:
+        return self._chunks[0].startTime if self._chunks else None
+
+    @property
+    def endTime(self) -> Optional[int]:
+        return self._chunks[-1].endTime if self._chunks else None
+
+    def close(self):
+        self._buffer.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # views of returned chunks still exist, unmapped when they are garbage collected
+
+    def _chunkViews(self, info: ChunkInfo):
+        layout = _ChunkLayout.create(info.octetCount)
+        chunk = self._buffer[info.offset:info.offset + layout.size]
+        octets = chunk[0:info.octetCount]
+        startTimes = chunk[layout.startTimes:layout.endTimes]
+        endTimes = chunk[layout.endTimes:layout.resetBitmap]
+        if _NATIVE_LITTLE_ENDIAN:
+            startTimes, endTimes = startTimes.cast('q'), endTimes.cast('q')
+        else:  # pragma: no cover
+            startTimes, endTimes = array('q', startTimes.tobytes()), array('q', endTimes.tobytes())
+            startTimes.byteswap()
+            endTimes.byteswap()
+        return octets, startTimes, endTimes, chunk[layout.resetBitmap:layout.size]
+
+    @staticmethod
+    def _resetPositions(bitmap: memoryview, start: int, end: int) -> List[int]:
+        positions = []
+        for byteIndex in range(start >> 3, (end + 7) >> 3):
+            bits = bitmap[byteIndex]
+            while bits:
+                bit = bits & -bits
+                position = (byteIndex << 3) + bit.bit_length() - 1
+                if start <= position < end:
+                    positions.append(position)
+                bits ^= bit
+        return positions
+
+    def read(self, startTime: Optional[int] = None, endTime: Optional[int] = None) -> Iterator[OctetChunk]:
+        """
+        Yields all octets starting within [startTime, endTime] (ns, default: everything) as OctetChunks.
+
+        Chunks are split at capture errors (OctetChunk.reset). Octets are expected in time order.
+        """
+        first = 0 if startTime is None else max(bisect_right(self._chunkStartTimes, startTime) - 1, 0)
+        last = len(self._chunks) if endTime is None else bisect_right(self._chunkStartTimes, endTime)
+
+        for info in self._chunks[first:last]:
+            if startTime is not None and info.endTime < startTime:
+                continue
+
+            views = self._chunkViews(info)
+            begin = 0 if startTime is None else bisect_left(views[1], startTime)
+            end = info.octetCount if endTime is None else bisect_right(views[1], endTime)
+            yield from self._splitChunk(info, views, begin, end)
+
+    def readOctets(self, begin: int = 0, end: Optional[int] = None) -> Iterator[OctetChunk]:
+        """Yields octets with index [begin, end) as OctetChunks (see read)."""
+        end = self._octetCount if end is None else min(end, self._octetCount)
+        chunkIndex = max(bisect_right(self._chunkFirstOctets, begin) - 1, 0)
+
+        while chunkIndex < len(self._chunks) and self._chunkFirstOctets[chunkIndex] < end:
+            info = self._chunks[chunkIndex]
+            firstOctet = self._chunkFirstOctets[chunkIndex]
+            yield from self._splitChunk(info, self._chunkViews(info),
+                                        max(begin - firstOctet, 0), min(end - firstOctet, info.octetCount))
+            chunkIndex += 1
+
+    def _splitChunk(self, info: ChunkInfo, views, begin: int, end: int) -> Iterator[OctetChunk]:
+        octets, startTimes, endTimes, bitmap = views
+        resets = self._resetPositions(bitmap, begin, end) if info.resetCount else []
+        boundaries = [begin] + [position for position in resets if position != begin] + [end]
+        for lower, upper in zip(boundaries, boundaries[1:]):
+            if lower < upper:
+                yield OctetChunk(octets[lower:upper], startTimes[lower:upper], endTimes[lower:upper],
+                                 reset=lower in resets)
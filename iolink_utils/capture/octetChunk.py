@@ -0,0 +1,26 @@
+from array import array
+from dataclasses import dataclass, field
+from typing import Union
+
+
+@dataclass
+class OctetChunk:
+    """
+    Consecutive octets of a capture (input of OctetStreamDecoder.processOctet(s)).
+
+    Timestamps are integer nanoseconds (see utils.timestamp). If reset is set, the capture
+    contains an error (e.g. framing error) in front of this chunk -> decoder and interpreter
+    have to be reset before decoding it. Chunks read from a capture file hold memoryviews (read-only).
+    """
+    octets: Union[bytearray, memoryview] = field(default_factory=bytearray)
+    startTimes: Union[array, memoryview] = field(default_factory=lambda: array('q'))
+    endTimes: Union[array, memoryview] = field(default_factory=lambda: array('q'))
+    reset: bool = False
+
+    def __len__(self):
+        return len(self.octets)
+
+    def append(self, octet: int, startTime: int, endTime: int):
+        self.octets.append(octet)
+        self.startTimes.append(startTime)
+        self.endTimes.append(endTime)
@@ -0,0 +1,199 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # gaps are searched without vectorization
+
+from iolink_utils.exceptions import IOLinkUtilsException
+from iolink_utils.definitions.timing import getMaxFrameTransmissionDelay_master, getMaxResponseTime, \
+    getMaxFrameTransmissionDelay_device
+from iolink_utils.utils.timestamp import Timebase, microsecondsToNs
+from iolink_utils.octetStreamDecoder.octetStreamDecoder import OctetStreamDecoder, DecoderEngine
+from iolink_utils.octetStreamDecoder.octetStreamDecoderSettings import DecoderSettings
+from iolink_utils.octetStreamDecoder.octetStreamDecoderMessages import MasterMessage, DeviceMessage
+from iolink_utils.messageInterpreter.messageInterpreter import MessageInterpreter
+from iolink_utils.messageInterpreter.automaticSettingsHandler import AutomaticSettingsHandler
+from iolink_utils.capture.octetCaptureFile import OctetCaptureFile
+from iolink_utils.capture.capturePipeline import DecodedMessage
+
+# (octet index, message completed by this octet or None if decoder and interpreter have to be reset)
+Record = Tuple[int, Union[None, MasterMessage, DeviceMessage]]
+
+
+def getMaxOctetGap(settings: DecoderSettings) -> int:
+    """Gap (ns) after which the decoder restarts at a master message in any state."""
+    rate = settings.transmissionRate
+    return max(microsecondsToNs(getMaxFrameTransmissionDelay_master(rate)),
+               microsecondsToNs(getMaxResponseTime(rate)),
+               microsecondsToNs(getMaxFrameTransmissionDelay_device(rate)))
+
+
+def findSplitPoints(capture: OctetCaptureFile, maxOctetGap: int, segmentSize: int) -> List[int]:
+    """
+    Octet indices where decoding can be started independently of the previous octets.
+
+    The first gap >= maxOctetGap behind every segmentSize octets is used. The list starts
+    with 0 and ends with the number of octets in the capture.
+    """
+    splitPoints = [0]
+    target = segmentSize
+    while target < len(capture):
+        split = _findGap(capture, target, maxOctetGap)
+        if split is None:
+            break
+        splitPoints.append(split)
+        target = split + segmentSize
+
+    splitPoints.append(len(capture))
+    return splitPoints
+
+
+def _findGap(capture: OctetCaptureFile, first: int, maxOctetGap: int, window: int = 64) -> Optional[int]:
+    # index >= first of the first octet starting >= maxOctetGap after the end of the previous octet.
+    # Searched in growing windows (gaps are usually close, the capture is not read to the end).
+    index = first - 1
+    previousEndTime = None
+    while index < len(capture):
+        for chunk in capture.readOctets(index, index + window):
+            if previousEndTime is not None and chunk.startTimes[0] - previousEndTime >= maxOctetGap:
+                return index
+            offset = _firstGapInChunk(chunk.startTimes, chunk.endTimes, maxOctetGap)
+            if offset is not None:
+                return index + offset
+            previousEndTime = chunk.endTimes[-1]
+            index += len(chunk)
+        window *= 2
+    return None
+
+
+def _firstGapInChunk(startTimes, endTimes, maxOctetGap: int) -> Optional[int]:
+    # index i >= 1 of the first octet starting >= maxOctetGap after the end of octet i - 1
+    # (numpy for longer chunks only, its call overhead is larger than a short loop)
+    if np is not None and len(startTimes) > 256:
+        gaps = np.flatnonzero(np.frombuffer(startTimes, dtype=np.int64)[1:] -
+                              np.frombuffer(endTimes, dtype=np.int64)[:-1] >= maxOctetGap)
+        return int(gaps[0]) + 1 if len(gaps) else None
+
+    for index in range(1, len(startTimes)):
+        if startTimes[index] - endTimes[index - 1] >= maxOctetGap:
+            return index
+    return None
+
+
+def _decodeOctets(capture: OctetCaptureFile, decoder: OctetStreamDecoder, begin: int, end: int) -> Iterator[Record]:
+    # lazy: changes of the decoder (settings, reset) done by the consumer affect the following octets
+    index = begin
+    for chunk in capture.readOctets(begin, end):
+        if chunk.reset:
+            decoder.reset()
+            yield index, None
+
+        for octet, startTime, endTime in zip(chunk.octets, chunk.startTimes, chunk.endTimes):
+            try:
+                message = decoder.processOctet(octet, startTime, endTime)
+            except (IOLinkUtilsException, ValueError, IndexError):
+                decoder.reset()
+                yield index, None
+            else:
+                if message is not None:
+                    yield index, message
+            index += 1
+
+
+def decodeSegment(capture: OctetCaptureFile, settings: DecoderSettings, engine: DecoderEngine,
+                  begin: int, end: int) -> List[Record]:
+    """Decodes octets [begin, end) with a new decoder."""
+    return list(_decodeOctets(capture, OctetStreamDecoder(settings, Timebase.Nanoseconds, None, engine), begin, end))
+
+
+def _decodeSegmentInWorker(filename: str, settings: DecoderSettings, engine: DecoderEngine,
+                           begin: int, end: int) -> List[Record]:
+    # opened per task (segments are large), workers do not keep the file mapped
+    with OctetCaptureFile(filename) as capture:
+        return decodeSegment(capture, settings, engine, begin, end)
+
+
+def decodeCaptureParallel(filename: str, settings: DecoderSettings, maxWorkers: Optional[int] = None,
+                          segmentSize: int = 1 << 18, engine: DecoderEngine = DecoderEngine.TransitionTable,
+                          interpreter: Optional[MessageInterpreter] = None,
+                          automaticSettings: bool = True) -> Iterator[DecodedMessage]:
+    """
+    Decodes a capture file (see octetCaptureFile) with multiple processes. Output is identical to
+    decodeCapture(OctetCaptureFile(filename).read(), ...).
+
+    The capture is split at bus-idle gaps (see findSplitPoints) and segments are decoded into
+    messages by worker processes. Interpreting (ISDU, Page, ...) and automatic settings are done
+    in this process in time order. If the settings change or the interpreter fails (requires a
+    decoder reset), the rest of the affected segment is decoded again.
+
+    :param filename: capture file (*.iolcap)
+    :param settings: initial decoder settings
+    :param maxWorkers: number of processes (default: number of CPUs)
+    :param segmentSize: min. number of octets decoded by one task
+    """
+    interpreter = interpreter if interpreter is not None else MessageInterpreter()
+    currentSettings = [settings]
+    settingsHandler = AutomaticSettingsHandler(
+        getter=lambda: currentSettings[-1],
+        setter=currentSettings.append
+    ) if automaticSettings else None
+
+    maxWorkers = maxWorkers or os.cpu_count() or 1
+    with OctetCaptureFile(filename) as capture, ProcessPoolExecutor(maxWorkers) as executor:
+        splitPoints = findSplitPoints(capture, getMaxOctetGap(settings), segmentSize)
+        segments = deque(zip(splitPoints, splitPoints[1:]))
+        pending = deque()
+        window = 2 * maxWorkers  # segments in flight (bounds memory)
+
+        while segments or pending:
+            while segments and len(pending) < window:
+                begin, end = segments.popleft()
+                future = executor.submit(_decodeSegmentInWorker, filename, currentSettings[-1], engine, begin, end)
+                pending.append((begin, end, currentSettings[-1], future))
+
+            begin, end, segmentSettings, future = pending.popleft()
+            records = iter(future.result())
+            liveDecoder = None  # decodes the rest of the segment after settings change / reset
+            if segmentSettings != currentSettings[-1]:
+                liveDecoder = OctetStreamDecoder(currentSettings[-1], Timebase.Nanoseconds, None, engine)
+                records = _decodeOctets(capture, liveDecoder, begin, end)
+
+            while True:
+                octetIndex, message = next(records, (None, None))
+                if octetIndex is None:
+                    break
+                if message is None:
+                    interpreter.reset()
+                    continue
+
+                transaction = None
+                settingsCount = len(currentSettings)
+                try:
+                    transaction = interpreter.processMessage(message)
+                    if transaction and settingsHandler:
+                        transaction.dispatch(settingsHandler)
+                except (IOLinkUtilsException, ValueError, IndexError):
+                    interpreter.reset()
+                    settingsChanged = False
+                else:
+                    yield DecodedMessage(message, transaction)
+                    if len(currentSettings) == settingsCount:
+                        continue
+                    del currentSettings[:-1]
+                    settingsChanged = True
+
+                if liveDecoder is None:
+                    # precomputed messages behind this octet are invalid -> replay segment up to here
+                    liveDecoder = OctetStreamDecoder(segmentSettings, Timebase.Nanoseconds, None, engine)
+                    for _ in _decodeOctets(capture, liveDecoder, begin, octetIndex + 1):
+                        pass
+                    records = _decodeOctets(capture, liveDecoder, octetIndex + 1, end)
+
+                if settingsChanged:
+                    liveDecoder.setSettings(currentSettings[-1])
+                else:
+                    liveDecoder.reset()
@@ -0,0 +1,125 @@
+import csv
+from decimal import Decimal, InvalidOperation
+from typing import Iterator, Optional, List
+
+from iolink_utils.exceptions import InvalidCaptureFile
+from iolink_utils.capture.octetChunk import OctetChunk
+
+_NS_PER_S = 1000000000
+
+# column names of Logic 2 (name,type,start_time,duration,data,error) and Logic 1.x (Time [s],Value,... Error) exports
+_START_TIME_COLUMNS = ('start_time', 'time [s]')
+_END_TIME_COLUMNS = ('end_time',)
+_DURATION_COLUMNS = ('duration',)
+_DATA_COLUMNS = ('data', 'value')
+_TYPE_COLUMNS = ('type',)
+_NAME_COLUMNS = ('name',)
+
+
+def secondsToNs(text: str) -> int:
+    """Convert seconds (decimal string, e.g. '1.000000125') into integer nanoseconds without float rounding."""
+    integer, dot, fraction = text.strip().partition('.')
+    if integer.lstrip('-').isdigit() and (not dot or (fraction.isdigit() and len(fraction) <= 9)):
+        ns = abs(int(integer)) * _NS_PER_S + int(fraction.ljust(9, '0') if dot else 0)
+        return -ns if integer.startswith('-') else ns
+
+    try:  # exponent or more than 9 decimal places
+        return int((Decimal(text) * _NS_PER_S).to_integral_value())
+    except InvalidOperation:
+        raise InvalidCaptureFile(f"Invalid time value: '{text}'") from None
+
+
+def _parseOctet(text: str) -> int:
+    text = text.strip()
+    try:
+        if text[:2] in ('0x', '0X'):
+            value = int(text, 16)
+        elif text[:2] in ('0b', '0B'):
+            value = int(text, 2)
+        else:
+            value = int(text, 10)
+    except ValueError:
+        raise InvalidCaptureFile(f"Invalid data value: '{text}' (export data as hex, binary or decimal)") from None
+
+    if not 0 <= value <= 0xFF:
+        raise InvalidCaptureFile(f"Data value is not an octet: '{text}'")
+    return value
+
+
+def _findColumn(header: List[str], names, required: bool = False) -> Optional[int]:
+    for name in names:
+        if name in header:
+            return header.index(name)
+    if required:
+        raise InvalidCaptureFile(f"Column missing: one of {', '.join(names)} (header: {', '.join(header)})")
+    return None
+
+
+def readSaleaeCsv(filename: str, chunkSize: int = 65536, analyzerName: Optional[str] = None,
+                  timeOffset: int = 0, octetDuration: Optional[int] = None) -> Iterator[OctetChunk]:
+    """
+    Streams an Async Serial export of Saleae Logic (CSV) as OctetChunks of max. chunkSize octets.
+
+    Columns are identified by the header. Rows with type other than 'data' are skipped, rows with
+    a non-empty error column are dropped and mark the next chunk as reset.
+
+    :param filename: CSV file exported from the Async Serial analyzer
+    :param chunkSize: max. number of octets per chunk (memory used while reading)
+    :param analyzerName: only use rows of this analyzer (name column), default: all rows
+    :param timeOffset: ns added to all timestamps (capture times are relative to capture start)
+    :param octetDuration: ns, required if the export has no end_time/duration column (end = start + duration)
+    """
+    if chunkSize < 1:
+        raise ValueError(f"Invalid chunk size: {chunkSize}")
+
+    with open(filename, newline='') as file:
+        rows = csv.reader(file)
+        header = [column.strip().lower() for column in next(rows, [])]
+
+        startColumn = _findColumn(header, _START_TIME_COLUMNS, required=True)
+        dataColumn = _findColumn(header, _DATA_COLUMNS, required=True)
+        endColumn = _findColumn(header, _END_TIME_COLUMNS)
+        durationColumn = _findColumn(header, _DURATION_COLUMNS)
+        typeColumn = _findColumn(header, _TYPE_COLUMNS)
+        nameColumn = _findColumn(header, _NAME_COLUMNS)
+        errorColumns = [index for index, column in enumerate(header) if 'error' in column]
+
+        if endColumn is None and durationColumn is None and octetDuration is None:
+            raise InvalidCaptureFile("Column missing: end_time or duration (or specify octetDuration)")
+
+        chunk = OctetChunk()
+        for lineNumber, row in enumerate(rows, start=2):
+            if not row:
+                continue
+            if nameColumn is not None and analyzerName is not None and row[nameColumn] != analyzerName:
+                continue
+            if typeColumn is not None and row[typeColumn].strip() != 'data':
+                continue
+
+            if any(row[index].strip() for index in errorColumns if index < len(row)):
+                if len(chunk):
+                    yield chunk
+                chunk = OctetChunk(reset=True)
+                continue
+
+            try:
+                startTime = secondsToNs(row[startColumn]) + timeOffset
+                if endColumn is not None:
+                    endTime = secondsToNs(row[endColumn]) + timeOffset
+                elif durationColumn is not None:
+                    endTime = startTime + secondsToNs(row[durationColumn])
+                else:
+                    endTime = startTime + octetDuration
+                octet = _parseOctet(row[dataColumn])
+            except IndexError:
+                raise InvalidCaptureFile(f"Line {lineNumber}: missing columns") from None
+            except InvalidCaptureFile as e:
+                raise InvalidCaptureFile(f"Line {lineNumber}: {e}") from None
+
+            chunk.append(octet, startTime, endTime)
+            if len(chunk) >= chunkSize:
+                yield chunk
+                chunk = OctetChunk()
+
+        if len(chunk) or chunk.reset:
+            yield chunk
@@ -85,7 +85,7 @@ class EventMemory:
     BYTES_PER_EVENT = 3
 
     def __init__(self):
-        self._statusCode: StatusCodeType2 = StatusCodeType2()
+        self._statusCode: StatusCodeType2 = StatusCodeType2.fromOctet(0)
         self._events: Tuple[Event, ...] = (
             Event(), Event(), Event(), Event(), Event(), Event()
         )
@@ -112,7 +112,7 @@ class EventMemory:
             raise InvalidEventMemoryAddress(f"Address is invalid: {hex(address)} (max 0x12)")
 
         if address == 0:
-            self._statusCode = StatusCodeType2(value)
+            self._statusCode = StatusCodeType2.fromOctet(value)
             if self._statusCode.details == 0:
                 raise InvalidEventStatusCode(f"StatusCodeType2 required (details == 1). Got value '{hex(value)}'")
         else:
@@ -128,7 +128,7 @@ class EventMemory:
                 self._events[eventNumber].setCodeLSB(value)
 
     def clear(self):
-        self._statusCode = StatusCodeType2()
+        self._statusCode = StatusCodeType2.fromOctet(0)
         for event in self._events:
             event.clear()
 
@@ -144,7 +144,7 @@ class EventMemory:
 
     def copy(self) -> "EventMemory":
         new = EventMemory()
-        new._statusCode = self._statusCode.copy()
+        new._statusCode = self._statusCode  # immutable
         new._events = tuple(event.copy() for event in self._events)
         return new
 
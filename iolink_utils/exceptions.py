@@ -100,3 +100,7 @@ class InvalidISDUMessage(IOLinkUtilsException):
 
 class InvalidLengthInProcessDataParameter(IOLinkUtilsException):
     """Raised if value of length (ProcessDataIn / ProcessDataOut) is invalid"""
+
+
+class InvalidCaptureFile(IOLinkUtilsException):
+    """Raised if a capture file (e.g. exported analyzer data) cannot be read"""
@@ -1,4 +1,4 @@
-from typing import Tuple, Dict
+from typing import BinaryIO, Tuple, Dict, FrozenSet, Iterable, List, Optional, Union
 import xml.etree.ElementTree as elTree
 from datetime import date
 
@@ -8,16 +8,125 @@ from .iodd_features import Features
 from .iodd_physical_layer import PhysicalLayer
 from .iodd_variableCollection import Variable
 
-from iolink_utils.exceptions import UnsupportedComplexDataType, UnsupportedSimpleDataType
+from iolink_utils.exceptions import InvalidIoddFile, UnsupportedComplexDataType, UnsupportedSimpleDataType
 from iolink_utils.utils.version import Version
 from iolink_utils.definitions.bitRate import BitRate
 from iolink_utils.definitions.profiles import ProfileID
 from iolink_utils.octetDecoder.octetDecoder import MSequenceCapability
 
 
+_XML_LANG = '{http://www.w3.org/XML/1998/namespace}lang'
+
+# elements (local names) parsed by IoddXmlDoc, all others are dropped by the streaming loader
+_SECTIONS = frozenset(('DocumentInfo', 'DeviceIdentity', 'Features', 'PhysicalLayer', 'ProcessDataCollection',
+                       'VariableCollection', 'DatatypeCollection'))
+
+
+def _parseSections(ioddXml: Union[str, BinaryIO], language: str, sections: FrozenSet[str] = _SECTIONS) \
+        -> elTree.Element:
+    """
+    Root of the IODD reduced to sections and the PrimaryLanguage texts of language (iterparse).
+
+    Elements outside of these sections are removed from their parent when they are complete, so
+    menus, translations, stamp etc. are never kept in memory at once. Ancestors of the sections
+    (e.g. ProfileBody) are kept without their other content.
+    """
+    root = None
+    parents: List[elTree.Element] = []
+    sectionDepth = 0  # > 0: inside of a section (element and all children are kept)
+    for event, element in elTree.iterparse(ioddXml, events=('start', 'end')):
+        if event == 'start':
+            if sectionDepth:
+                sectionDepth += 1
+            else:
+                localName = element.tag.rpartition('}')[2]
+                if localName in sections or (localName == 'PrimaryLanguage' and element.get(_XML_LANG) == language):
+                    sectionDepth = 1
+            if root is None:
+                root = element
+            parents.append(element)
+        else:
+            parents.pop()
+            if sectionDepth:
+                sectionDepth -= 1
+            elif len(element) == 0 and parents:
+                parents[-1].remove(element)  # not needed, contains no section
+    return root
+
+
+def readDocType(ioddXml: Union[str, BinaryIO]) -> str:
+    """Local name of the root element (e.g. 'IODevice'), only the beginning of the file is read."""
+    if isinstance(ioddXml, str):
+        with open(ioddXml, 'rb') as file:
+            return readDocType(file)
+    for _, element in elTree.iterparse(ioddXml, events=('start',)):
+        return element.tag.rpartition('}')[2]
+    return ''  # pragma: no cover
+
+
+def readDeviceIdentity(ioddXmlFilePath: str) -> Identity:
+    """
+    Identity of an IODD, the file is only read up to the DeviceIdentity element.
+    Texts are not resolved (only text ids), they are at the end of the file.
+
+    Raises
+    ------
+    InvalidIoddFile
+        If the file is no device IODD (e.g. language file) or has no DeviceIdentity.
+    """
+    def textTuple(xmlElement, localName: str) -> Tuple[str, str]:
+        for child in xmlElement:
+            if child.tag.rpartition('}')[2] == localName:
+                return child.get('textId', ''), ''
+        return '', ''
+
+    identity = Identity()
+    root = None
+    with open(ioddXmlFilePath, 'rb') as file:
+        for event, element in elTree.iterparse(file, events=('start', 'end')):
+            localName = element.tag.rpartition('}')[2]
+            if event == 'start':
+                if root is None:
+                    root = element
+                    if localName != 'IODevice':
+                        raise InvalidIoddFile(f"Expected IODevice inside XML file, got {localName}.")
+                continue
+            if localName == 'DeviceVariant':
+                identity.deviceVariants.append(DeviceVariant(
+                    productId=element.get('productId'),
+                    deviceSymbol=element.get('deviceSymbol'),
+                    deviceIcon=element.get('deviceIcon'),
+                    name=textTuple(element, 'Name'),
+                    description=textTuple(element, 'Description')))
+            elif localName == 'DeviceIdentity':
+                identity.vendorId = int(element.get('vendorId'))
+                identity.deviceId = int(element.get('deviceId'))
+                identity.vendorName = element.get('vendorName')
+                identity.vendorText = textTuple(element, 'VendorText')
+                identity.vendorUrl = textTuple(element, 'VendorUrl')
+                identity.deviceName = textTuple(element, 'DeviceName')
+                identity.deviceFamily = textTuple(element, 'DeviceFamily')
+                for child in element:
+                    if child.tag.rpartition('}')[2] == 'VendorLogo':
+                        identity.vendorLogo = child.get('name')
+                return identity
+    raise InvalidIoddFile(f"No DeviceIdentity in {ioddXmlFilePath}")
+
+
 class IoddXmlDoc:
-    def __init__(self, ioddXmlFilePath: str):
-        self._tree = elTree.parse(ioddXmlFilePath)
+    def __init__(self, ioddXml: Union[str, BinaryIO], sectionsOnly: bool = True, language: str = "en",
+                 sections: Optional[Iterable[str]] = None):
+        """
+        ioddXml: filename or binary file object
+        sectionsOnly: stream the file and keep only the sections that are parsed (and the texts of language),
+        otherwise the complete document is kept in memory.
+        sections: with sectionsOnly, local names of the section elements to keep (default: all parsed ones).
+        """
+        if sectionsOnly:
+            sections = _SECTIONS if sections is None else frozenset(sections)
+            self._tree = elTree.ElementTree(_parseSections(ioddXml, language, sections))
+        else:
+            self._tree = elTree.parse(ioddXml)
         self._root = self._tree.getroot()
 
         # namespaces
@@ -30,6 +139,12 @@ class IoddXmlDoc:
         # local name of root
         self._docType = self._root.tag.split('}')[-1]
 
+        self._textsByLanguage: Dict[str, Dict[str, str]] = {}  # see _getTexts
+        self._datatypeIndex: Optional[Dict[str, elTree.Element]] = None  # see _getDatatypeIndex
+        # parsed datatype elements (shared by all references, treat as read-only)
+        self._dataFormats: Dict[elTree.Element, List[Dict]] = {}
+        self._simpleDatatypes: Dict[elTree.Element, Dict] = {}
+
     @property
     def docType(self) -> str:
         return self._docType
@@ -156,26 +271,39 @@ class IoddXmlDoc:
         return "", ""
 
     def _getTextForTextID(self, textId: str, language: str = "en") -> str:
-        for coll in self._root.findall(".//iolink:ExternalTextCollection", self._namespaces):
-            for lang in coll.findall("iolink:PrimaryLanguage", self._namespaces):
-                if lang.get(f"{{{self._namespaces['xml']}}}lang") == language:
-                    for text in lang.findall("iolink:Text", self._namespaces):
-                        if text.get("id") == textId:
-                            return text.get("value", "")
-        return ""
+        return self._getTexts(language).get(textId, "")
+
+    def _getTexts(self, language: str) -> Dict[str, str]:
+        """Text id -> text of the primary language (first text of an id), built on first use."""
+        texts = self._textsByLanguage.get(language)
+        if texts is None:
+            texts = self._textsByLanguage[language] = {}
+            for coll in self._root.findall(".//iolink:ExternalTextCollection", self._namespaces):
+                for lang in coll.findall("iolink:PrimaryLanguage", self._namespaces):
+                    if lang.get(f"{{{self._namespaces['xml']}}}lang") == language:
+                        for text in lang.findall("iolink:Text", self._namespaces):
+                            texts.setdefault(text.get("id"), text.get("value", ""))
+        return texts
 
     def _getDatatype(self, xmlElement):
         for tag in ("Datatype", "SimpleDatatype", "DatatypeRef"):
             el = xmlElement.find(f"iolink:{tag}", self._namespaces)
             if el is not None:
                 if tag == "DatatypeRef":
-                    ref_id = el.get("datatypeId")
-                    for dt in self._root.findall(".//iolink:Datatype", self._namespaces):
-                        if dt.get("id") == ref_id:
-                            return dt
+                    return self._getDatatypeIndex().get(el.get("datatypeId"), el)
                 return el
         return None
 
+    def _getDatatypeIndex(self) -> Dict[str, elTree.Element]:
+        """Datatype id -> Datatype element (first element of an id), built on first use."""
+        if self._datatypeIndex is None:
+            self._datatypeIndex = {}
+            for dt in self._root.findall(".//iolink:Datatype", self._namespaces):
+                datatypeId = dt.get("id")
+                if datatypeId is not None:
+                    self._datatypeIndex.setdefault(datatypeId, dt)
+        return self._datatypeIndex
+
     def _getProcessDataInOutAsJSON(self, xmlProcessData):
         textId = xmlProcessData.find('iolink:Name', self._namespaces).get('textId')
         dataType = self._getDatatype(xmlProcessData)
@@ -188,6 +316,13 @@ class IoddXmlDoc:
         }
 
     def _getDatatypeAsJSON(self, xmlDataType):
+        # parsed once per element (datatypes of the DatatypeCollection are referenced repeatedly)
+        dataFormat = self._dataFormats.get(xmlDataType)
+        if dataFormat is None:
+            dataFormat = self._dataFormats[xmlDataType] = self._parseDatatypeAsJSON(xmlDataType)
+        return dataFormat
+
+    def _parseDatatypeAsJSON(self, xmlDataType):
         xsiType = xmlDataType.get(f"{{{self._namespaces['xsi']}}}type")
 
         if xsiType in ('RecordT', 'ArrayT'):
@@ -240,6 +375,13 @@ class IoddXmlDoc:
         return items
 
     def _getSimpleDatatypeAsJSON(self, xmlSimpleDatatype):
+        simpleDatatype = self._simpleDatatypes.get(xmlSimpleDatatype)
+        if simpleDatatype is None:
+            simpleDatatype = self._simpleDatatypes[xmlSimpleDatatype] = \
+                self._parseSimpleDatatypeAsJSON(xmlSimpleDatatype)
+        return simpleDatatype
+
+    def _parseSimpleDatatypeAsJSON(self, xmlSimpleDatatype):
         xsiType = xmlSimpleDatatype.get(f"{{{self._namespaces['xsi']}}}type")
 
         if xsiType == 'BooleanT':
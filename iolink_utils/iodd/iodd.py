@@ -1,36 +1,112 @@
-from typing import Dict, Tuple
+import io
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from .iodd_fileInfo import IoddFileInfo
+from .iodd_cache import IoddFileKey, ioddCache
 from ._internal.iodd_documentInfo import DocumentInfo
 from ._internal.iodd_identity import Identity
 from ._internal.iodd_features import Features
 from ._internal.iodd_physical_layer import PhysicalLayer
 from ._internal.iodd_variableCollection import Variable, standardVariableCollection
-from ._internal.iodd_xmlDoc import IoddXmlDoc
+from ._internal.iodd_xmlDoc import IoddXmlDoc, readDocType
 
 from iolink_utils.definitions.onRequestDataOctetCount import ODOctetCount
 from iolink_utils.definitions.profiles import ProfileID
 from iolink_utils.exceptions import IoddFileNotFound, InvalidIoddFile, MSequenceCapabilityMissing
+from iolink_utils.processDataDecoder.processDataDecoder import createDecoderClass_PDIn, createDecoderClass_PDOut
+
+
+# section name -> IoddXmlDoc method parsing it, XML elements it is parsed from (besides texts)
+_SECTION_PARSERS: Dict[str, Tuple[Callable[[IoddXmlDoc], Any], Tuple[str, ...]]] = {
+    'documentInfo': (IoddXmlDoc.getDocumentInfo, ('DocumentInfo',)),
+    'identity': (IoddXmlDoc.getIdentity, ('DeviceIdentity',)),
+    'features': (IoddXmlDoc.getDeviceFeatures, ('Features',)),
+    'physicalLayer': (IoddXmlDoc.getPhysicalLayer, ('PhysicalLayer',)),
+    'processDataDefinition': (IoddXmlDoc.getProcessDataDefinition, ('ProcessDataCollection', 'DatatypeCollection')),
+    'variableCollection': (IoddXmlDoc.getVariableCollection, ('VariableCollection',))
+}
+
+# sections parsed together from one pass over the XML file (the variables are only needed for ISDUs)
+_SECTION_GROUPS: Tuple[Tuple[str, ...], ...] = (
+    ('documentInfo', 'identity', 'features', 'physicalLayer', 'processDataDefinition'),
+    ('variableCollection',)
+)
 
 
 class Iodd:
-    def __init__(self, iodd_xml_file_path: str):
+    def __init__(self, iodd_xml_file_path: str, useCache: bool = True):
+        """
+        Sections (identity, variableCollection, ...) are parsed on first access, the XML document is only
+        loaded if a section is not in the persistent IODD cache (useCache, see iodd_cache). The file is read
+        once, all sections are parsed from this content (later changes of the file are ignored).
+        """
         self._fileInfo: IoddFileInfo = IoddFileInfo(iodd_xml_file_path)
 
         if not self._fileInfo.fileExists:
             raise IoddFileNotFound(f"IODD file not found: {self._fileInfo.fullPathFilename}")
 
-        ioddXmlDoc = IoddXmlDoc(self._fileInfo.fullPathFilename)
-        if ioddXmlDoc.docType == 'IODevice':
-            self._documentInfo: DocumentInfo = ioddXmlDoc.getDocumentInfo()
-            self._identity: Identity = ioddXmlDoc.getIdentity()
-            self._features: Features = ioddXmlDoc.getDeviceFeatures()
-            self._physicalLayer: PhysicalLayer = ioddXmlDoc.getPhysicalLayer()
-            self._processDataDefinition: Dict = ioddXmlDoc.getProcessDataDefinition()
-            self._variableCollection: Dict[int, Variable] = ioddXmlDoc.getVariableCollection()
-        else:
+        with open(self._fileInfo.fullPathFilename, 'rb') as file:
+            content = file.read()
+            stat = os.fstat(file.fileno())
+
+        docType = readDocType(io.BytesIO(content))
+        if docType != 'IODevice':
             # e.g. language file
-            raise InvalidIoddFile(f"Expected IODevice inside XML file, got {ioddXmlDoc.docType}.")  # pragma: no cover
+            raise InvalidIoddFile(f"Expected IODevice inside XML file, got {docType}.")  # pragma: no cover
+
+        self._cacheKey: Optional[IoddFileKey] = None
+        if useCache and ioddCache.isEnabled:
+            self._cacheKey = IoddFileKey.fromContent(self._fileInfo.fullPathFilename, stat, content)
+
+        self._content: Optional[bytes] = content  # XML file, dropped when all sections are parsed or cached
+        self._sections: Dict[str, Any] = {}  # parsed sections, see _SECTION_PARSERS
+        self._sectionLock: threading.Lock = threading.Lock()  # the Iodd may be shared (see load)
+        self._processDataDecoderClasses: Dict[Optional[int], Tuple[type, type]] = {}  # condition -> (out, in)
+
+    @classmethod
+    def load(cls, iodd_xml_file_path: str) -> "Iodd":
+        """
+        Shared Iodd of the file (see ioddRegistry), parsed again only if the file changed.
+        The returned object is read-only, it is used by all callers loading the same file.
+        """
+        return ioddRegistry.get(iodd_xml_file_path)
+
+    def _getSection(self, name: str) -> Any:
+        section = self._sections.get(name)
+        if section is not None:
+            return section
+
+        with self._sectionLock:
+            if name not in self._sections and not self._loadCachedSection(name):
+                # the other sections of the group are parsed with it, the XML document is not kept
+                group = next(group for group in _SECTION_GROUPS if name in group)
+                names = [other for other in group
+                         if other == name or (other not in self._sections and not self._loadCachedSection(other))]
+                xmlDoc = self._loadXmlDoc(names)
+                for other in names:
+                    self._sections[other] = _SECTION_PARSERS[other][0](xmlDoc)
+                    if self._cacheKey is not None:
+                        ioddCache.store(self._cacheKey, other, self._sections[other])
+            if len(self._sections) == len(_SECTION_PARSERS):
+                self._content = None
+            return self._sections[name]
+
+    def _loadCachedSection(self, name: str) -> bool:
+        if self._cacheKey is None:
+            return False
+        section = ioddCache.load(self._cacheKey, name)
+        if section is None:
+            return False
+        self._sections[name] = section
+        return True
+
+    def _loadXmlDoc(self, names: List[str]) -> IoddXmlDoc:
+        # content read by __init__: same version as the cache key and the sections parsed before
+        elements = {element for name in names for element in _SECTION_PARSERS[name][1]}
+        return IoddXmlDoc(io.BytesIO(self._content), sections=elements)
 
     @property
     def fileInfo(self) -> IoddFileInfo:
@@ -38,23 +114,23 @@ class Iodd:
 
     @property
     def documentInfo(self) -> DocumentInfo:
-        return self._documentInfo
+        return self._getSection('documentInfo')
 
     @property
     def identity(self) -> Identity:
-        return self._identity
+        return self._getSection('identity')
 
     @property
     def features(self) -> Features:
-        return self._features
+        return self._getSection('features')
 
     @property
     def physicalLayer(self) -> PhysicalLayer:
-        return self._physicalLayer
+        return self._getSection('physicalLayer')
 
     @property
     def variableCollection(self) -> Dict[int, Variable]:
-        return self._variableCollection
+        return self._getSection('variableCollection')
 
     @property
     def standardVariableCollection(self) -> Dict[int, Variable]:
@@ -62,18 +138,18 @@ class Iodd:
 
     @property
     def processDataDefinition(self) -> Dict:
-        return self._processDataDefinition
+        return self._getSection('processDataDefinition')
 
     @property
     def processDataConditionValues(self) -> list:
-        return list(self._processDataDefinition.keys())
+        return list(self.processDataDefinition.keys())
 
     @property
     def size_PDin(self) -> int:
         # note: by spec all process data definitions need to have the same size
         condition = self.processDataConditionValues[0]
-        if 'pdIn' in self._processDataDefinition[condition]:
-            return int(self._processDataDefinition[condition]['pdIn']['bitLength'] / 8)
+        if 'pdIn' in self.processDataDefinition[condition]:
+            return int(self.processDataDefinition[condition]['pdIn']['bitLength'] / 8)
         else:
             return 0
 
@@ -81,8 +157,8 @@ class Iodd:
     def size_PDout(self) -> int:
         # note: by spec all process data definitions need to have the same size
         condition = self.processDataConditionValues[0]
-        if 'pdOut' in self._processDataDefinition[condition]:
-            return int(self._processDataDefinition[condition]['pdOut']['bitLength'] / 8)
+        if 'pdOut' in self.processDataDefinition[condition]:
+            return int(self.processDataDefinition[condition]['pdOut']['bitLength'] / 8)
         else:
             return 0
 
@@ -92,22 +168,69 @@ class Iodd:
         Returns number of on-request data octets in PREOPERATE and OPERATE
         :return: Tuple[preoperate, operate]
         """
-        if self._physicalLayer.mSequenceCapability is None:
+        if self.physicalLayer.mSequenceCapability is None:
             raise MSequenceCapabilityMissing("M-sequence capability required to calculate on-request data size.")
 
-        ODsize_preoperate: int = ODOctetCount.in_preoperate(self._physicalLayer.mSequenceCapability.preoperateCode)[0]
+        ODsize_preoperate: int = ODOctetCount.in_preoperate(self.physicalLayer.mSequenceCapability.preoperateCode)[0]
         ODsize_operate: int = ODOctetCount.in_operate(
-            self._physicalLayer.mSequenceCapability.operateCode, self.size_PDin, self.size_PDout)[0]
+            self.physicalLayer.mSequenceCapability.operateCode, self.size_PDin, self.size_PDout)[0]
         return ODsize_preoperate, ODsize_operate
 
+    def processDataDecoderClasses(self, condition: Optional[int] = None) -> Tuple[type, type]:
+        """PD out and PD in decoder classes (see processDataDecoder) of the condition, created once."""
+        classes = self._processDataDecoderClasses.get(condition)
+        if classes is None:
+            classes = self._processDataDecoderClasses[condition] = (
+                createDecoderClass_PDOut(self.processDataDefinition, condition),
+                createDecoderClass_PDIn(self.processDataDefinition, condition)
+            )
+        return classes
+
     def isSafetyDevice(self) -> bool:
-        return ProfileID.SafetyDevice in self._features.profileIDs
+        return ProfileID.SafetyDevice in self.features.profileIDs
 
     def __str__(self):  # pragma: no cover
         return (
             f"IODD(\n"
             f"  {self._fileInfo}\n"
-            f"  {self._features}\n"
-            f"  {self._physicalLayer}\n"
+            f"  {self.features}\n"
+            f"  {self.physicalLayer}\n"
             f")"
         )
+
+
+class IoddRegistry:
+    """Parsed IODDs by file path (LRU, max. maxSize files), reloaded if size or mtime of the file changed."""
+
+    def __init__(self, maxSize: int = 8):
+        self.maxSize: int = maxSize
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], Iodd]]" = OrderedDict()  # path -> (size, mtime), Iodd
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, iodd_xml_file_path: str) -> Iodd:
+        path = IoddFileInfo(iodd_xml_file_path).fullPathFilename
+        if not path:
+            return Iodd(iodd_xml_file_path)  # raises IoddFileNotFound
+        stat = os.stat(path)
+        fileState = (stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == fileState:
+                self._entries.move_to_end(path)
+                return entry[1]
+
+        iodd = Iodd(path)  # not locked, parsing may take a while
+        with self._lock:
+            self._entries[path] = (fileState, iodd)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.maxSize:
+                self._entries.popitem(last=False)
+        return iodd
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+ioddRegistry = IoddRegistry()
@@ -0,0 +1,120 @@
+"""
+Persistent cache of parsed IODDs (see Iodd), so repeated startups skip XML parsing.
+
+One pickle file per IODD path and section (e.g. 'identity') in the cache directory, so a section
+is only read if it is used. An entry is only used if cache version, library version, path, size,
+mtime and sha256 of the IODD file are unchanged.
+
+The cache directory is taken from the environment variable IOLINK_IODD_CACHE ('0': disabled),
+default: <user cache directory>/iolink_utils/iodd. Only use cache directories you trust (pickle).
+"""
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+from iolink_utils.__version__ import __version__
+
+# environment variable with the cache directory, '0' disables the cache
+ENVIRONMENT_VARIABLE = 'IOLINK_IODD_CACHE'
+
+# increment if the parsed sections change (classes or content), invalidates all entries
+_CACHE_VERSION = 2
+
+
+class IoddFileKey(NamedTuple):
+    path: str
+    size: int
+    mtimeNs: int
+    sha256: str
+
+    @staticmethod
+    def fromFile(path: str) -> "IoddFileKey":
+        with open(path, 'rb') as file:
+            content = file.read()
+            stat = os.fstat(file.fileno())
+        return IoddFileKey.fromContent(path, stat, content)
+
+    @staticmethod
+    def fromContent(path: str, stat: os.stat_result, content: bytes) -> "IoddFileKey":
+        """Key of the file content read (and stat of the opened file)."""
+        return IoddFileKey(path, stat.st_size, stat.st_mtime_ns, hashlib.sha256(content).hexdigest())
+
+
+def defaultCacheDirectory() -> Optional[str]:
+    """Cache directory of IOLINK_IODD_CACHE or the user cache directory, None if disabled."""
+    value = os.environ.get(ENVIRONMENT_VARIABLE, '').strip()
+    if value == '0':
+        return None
+    if value:
+        return value
+
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or str(Path.home() / 'AppData' / 'Local')
+    elif sys.platform == 'darwin':
+        base = str(Path.home() / 'Library' / 'Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or str(Path.home() / '.cache')
+    return os.path.join(base, 'iolink_utils', 'iodd')
+
+
+class IoddCache:
+    """Parsed sections of IODD files (section name -> parsed object). Errors disable the entry only."""
+
+    def __init__(self, directory: Optional[str]):
+        self.directory: Optional[str] = directory  # None: cache disabled
+
+    @property
+    def isEnabled(self) -> bool:
+        return self.directory is not None
+
+    def entryFilename(self, path: str, section: str) -> str:
+        pathHash = hashlib.sha256(path.encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.directory, f"{pathHash}-{section}.pickle")
+
+    def load(self, key: IoddFileKey, section: str) -> Optional[Any]:
+        """Cached section of the IODD file, None if not cached or outdated."""
+        if not self.isEnabled:
+            return None
+        try:
+            with open(self.entryFilename(key.path, section), 'rb') as file:
+                version, libraryVersion, entryKey, value = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError, ValueError):
+            return None
+
+        if version != _CACHE_VERSION or libraryVersion != __version__ or entryKey != key:
+            return None
+        return value
+
+    def store(self, key: IoddFileKey, section: str, value: Any):
+        """Writes the entry (atomically replaced, concurrent analyzers may store the same IODD)."""
+        if not self.isEnabled:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tempFilename = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as file:
+                    pickle.dump((_CACHE_VERSION, __version__, tuple(key), value), file, pickle.HIGHEST_PROTOCOL)
+                os.replace(tempFilename, self.entryFilename(key.path, section))
+            except BaseException:
+                os.unlink(tempFilename)
+                raise
+        except (OSError, pickle.PicklingError):
+            pass  # not cached, parsed again next time
+
+    def clear(self):
+        """Removes all entries."""
+        if not self.isEnabled or not os.path.isdir(self.directory):
+            return
+        for entry in Path(self.directory).glob('*.pickle'):
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+
+
+ioddCache = IoddCache(defaultCacheDirectory())
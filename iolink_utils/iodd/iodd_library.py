@@ -0,0 +1,161 @@
+"""
+Index of a directory with IODD files, to find the IODD of a device by vendor and device id.
+
+The index is stored as JSON file (default: .ioddLibraryIndex.json in the directory) and updated
+incrementally: only new files and files with changed size or mtime are read, and only up to
+their DeviceIdentity (see readDeviceIdentity).
+
+    library = IoddLibrary('path/to/iodds')
+    library.update()
+    iodd = library.loadIodd(vendorId, deviceId)  # e.g. from DeviceIdentificationHandler
+"""
+import json
+import os
+import tempfile
+import xml.etree.ElementTree as elTree
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .iodd import Iodd
+from .iodd_fileInfo import IoddFileInfo
+from ._internal.iodd_xmlDoc import readDeviceIdentity
+
+from iolink_utils.exceptions import IOLinkUtilsException
+from iolink_utils.utils.version import Version
+
+INDEX_FILENAME = '.ioddLibraryIndex.json'
+
+# increment if the entries change, the index is rebuilt
+_INDEX_VERSION = 1
+
+
+class IoddLibraryEntry(NamedTuple):
+    path: str  # relative to the library directory
+    size: int
+    mtimeNs: int
+    vendorId: Optional[int]  # None: no device IODD (e.g. language file) or invalid
+    deviceId: Optional[int]
+    productIds: Tuple[str, ...]  # of the device variants
+    date: Optional[str]  # ISO date of the filename (see IoddFileInfo)
+    schemaVersion: str  # of the filename, e.g. '1.1'
+
+    @property
+    def isDeviceIodd(self) -> bool:
+        return self.vendorId is not None
+
+    def sortKey(self) -> Tuple[date, Version, int]:
+        """Newer IODDs first: release date and schema version of the filename, then mtime."""
+        return (date.fromisoformat(self.date) if self.date else date.min,
+                Version(self.schemaVersion), self.mtimeNs)
+
+
+class IoddLibrary:
+    def __init__(self, directory: str, indexFilename: Optional[str] = None):
+        """Loads the index file (if any), call update to scan the directory."""
+        self.directory: str = os.path.abspath(directory)
+        self.indexFilename: str = indexFilename or os.path.join(self.directory, INDEX_FILENAME)
+        self._entries: Dict[str, IoddLibraryEntry] = self._readIndex()
+        self._byDevice: Dict[Tuple[int, int], List[IoddLibraryEntry]] = {}  # best match first
+        self._updateDevices()
+
+    @property
+    def entries(self) -> List[IoddLibraryEntry]:
+        return list(self._entries.values())
+
+    def update(self) -> int:
+        """
+        Scans the directory (recursively) and reads new or changed *.xml files, removed files are dropped.
+        The index file is written if something changed. Returns the number of files read.
+        """
+        entries: Dict[str, IoddLibraryEntry] = {}
+        readCount = 0
+        for dirPath, dirNames, filenames in os.walk(self.directory):
+            dirNames.sort()
+            for filename in sorted(filenames):
+                if not filename.lower().endswith('.xml'):
+                    continue
+                fullPath = os.path.join(dirPath, filename)
+                path = os.path.relpath(fullPath, self.directory)
+                try:
+                    stat = os.stat(fullPath)
+                except OSError:
+                    continue
+                entry = self._entries.get(path)
+                if entry is None or entry.size != stat.st_size or entry.mtimeNs != stat.st_mtime_ns:
+                    entry = self._readEntry(fullPath, path, stat.st_size, stat.st_mtime_ns)
+                    readCount += 1
+                entries[path] = entry
+
+        if readCount or entries.keys() != self._entries.keys():
+            self._entries = entries
+            self._updateDevices()
+            self._writeIndex()
+        return readCount
+
+    def find(self, vendorId: int, deviceId: int) -> List[IoddLibraryEntry]:
+        """All IODDs of the device, best match (newest) first."""
+        return list(self._byDevice.get((vendorId, deviceId), ()))
+
+    def bestMatch(self, vendorId: int, deviceId: int, productId: Optional[str] = None) -> Optional[IoddLibraryEntry]:
+        """Newest IODD of the device (with a variant of productId, if given), None if there is none."""
+        for entry in self._byDevice.get((vendorId, deviceId), ()):
+            if productId is None or productId in entry.productIds:
+                return entry
+        return None
+
+    def loadIodd(self, vendorId: int, deviceId: int, productId: Optional[str] = None) -> Optional[Iodd]:
+        """Iodd of bestMatch (shared, see Iodd.load), None if the device is not in the library."""
+        entry = self.bestMatch(vendorId, deviceId, productId)
+        return Iodd.load(self.fullPath(entry)) if entry else None
+
+    def fullPath(self, entry: IoddLibraryEntry) -> str:
+        return os.path.join(self.directory, entry.path)
+
+    @staticmethod
+    def _readEntry(fullPath: str, path: str, size: int, mtimeNs: int) -> IoddLibraryEntry:
+        # invalid files (incl. invalid dates in the filename, see IoddFileInfo) are no device IODDs
+        try:
+            fileInfo = IoddFileInfo(fullPath)
+            fileDate = fileInfo.date.isoformat() if fileInfo.date else None
+            schemaVersion = '.'.join(map(str, fileInfo.schemaVersion.parts))
+            identity = readDeviceIdentity(fullPath)
+        except (IOLinkUtilsException, elTree.ParseError, OSError, ValueError, TypeError):
+            return IoddLibraryEntry(path, size, mtimeNs, None, None, (), None, '')
+        return IoddLibraryEntry(path, size, mtimeNs, identity.vendorId, identity.deviceId,
+                                tuple(variant.productId for variant in identity.deviceVariants if variant.productId),
+                                fileDate, schemaVersion)
+
+    def _updateDevices(self):
+        byDevice: Dict[Tuple[int, int], List[IoddLibraryEntry]] = {}
+        for entry in self._entries.values():
+            if entry.isDeviceIodd:
+                byDevice.setdefault((entry.vendorId, entry.deviceId), []).append(entry)
+        for entries in byDevice.values():
+            entries.sort(key=IoddLibraryEntry.sortKey, reverse=True)
+        self._byDevice = byDevice
+
+    def _readIndex(self) -> Dict[str, IoddLibraryEntry]:
+        try:
+            with open(self.indexFilename, 'r', encoding='utf-8') as file:
+                index = json.load(file)
+            if index.get('version') != _INDEX_VERSION:
+                return {}
+            entries = (IoddLibraryEntry(path, size, mtimeNs, vendorId, deviceId, tuple(productIds), fileDate, schema)
+                       for path, size, mtimeNs, vendorId, deviceId, productIds, fileDate, schema in index['entries'])
+            return {entry.path: entry for entry in entries}
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return {}  # rebuilt by update
+
+    def _writeIndex(self):
+        index = {'version': _INDEX_VERSION, 'entries': [list(entry) for entry in self._entries.values()]}
+        try:
+            fd, tempFilename = tempfile.mkstemp(dir=os.path.dirname(self.indexFilename), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                    json.dump(index, file, separators=(',', ':'))
+                os.replace(tempFilename, self.indexFilename)
+            except BaseException:
+                os.unlink(tempFilename)
+                raise
+        except OSError:
+            pass  # e.g. read-only directory: index is rebuilt next time
@@ -1,6 +1,5 @@
 from dataclasses import replace
 from typing import Callable, Dict
-from transactionHandler import TransactionHandler
 
 from iolink_utils.definitions.transmissionDirection import TransmissionDirection
 from iolink_utils.definitions.onRequestDataOctetCount import ODOctetCount
@@ -9,6 +8,7 @@ from iolink_utils.utils.calculateProcessDataLength import calculateProcessDataLe
 from iolink_utils.octetDecoder.octetDecoder import MSequenceCapability, ProcessDataIn, ProcessDataOut
 from iolink_utils.octetStreamDecoder.octetStreamDecoderSettings import DecoderSettings
 from iolink_utils.messageInterpreter.page.transactionPage import TransactionPage
+from iolink_utils.messageInterpreter.transactionHandler import TransactionHandler
 from iolink_utils.exceptions import InvalidMSeqCode, InvalidMSeqCodePDSizeCombination
 
 GetterType = Callable[[], DecoderSettings]
@@ -0,0 +1,61 @@
+from typing import Callable, Dict, Optional
+
+from iolink_utils.definitions.transmissionDirection import TransmissionDirection
+from iolink_utils.definitions.directParameterPage import DirectParameterPage1Index
+from iolink_utils.messageInterpreter.page.transactionPage import TransactionPage
+from iolink_utils.messageInterpreter.transactionHandler import TransactionHandler
+
+IdentifiedCallback = Callable[[int, int], None]  # vendorId, deviceId
+
+_VENDOR_ID = (DirectParameterPage1Index.VendorId_MSB, DirectParameterPage1Index.VendorId_LSB)
+_DEVICE_ID = (DirectParameterPage1Index.DeviceId_MSB, DirectParameterPage1Index.DeviceId,
+              DirectParameterPage1Index.DeviceId_LSB)
+
+
+class DeviceIdentificationHandler(TransactionHandler):
+    """
+    Collects VendorID and DeviceID from Page 1 reads (e.g. during startup), to find the IODD of the
+    device (see IoddLibrary). onIdentified is called when both are complete and whenever they change.
+    """
+
+    def __init__(self, onIdentified: Optional[IdentifiedCallback] = None):
+        super().__init__()
+        self._onIdentified: Optional[IdentifiedCallback] = onIdentified
+        self._octets: Dict[int, int] = {}  # page index -> value read
+        self._identified: Optional[tuple] = None
+
+    @property
+    def vendorId(self) -> Optional[int]:
+        return self._combine(_VENDOR_ID)
+
+    @property
+    def deviceId(self) -> Optional[int]:
+        return self._combine(_DEVICE_ID)
+
+    def reset(self):
+        self._octets.clear()
+        self._identified = None
+
+    def _combine(self, indices) -> Optional[int]:
+        value = 0
+        for index in indices:
+            octet = self._octets.get(index)
+            if octet is None:
+                return None
+            value = (value << 8) | octet
+        return value
+
+    def handlePage(self, transaction: TransactionPage):
+        if transaction.direction == TransmissionDirection.Write:
+            return []
+        if transaction.index not in _VENDOR_ID and transaction.index not in _DEVICE_ID:
+            return []
+
+        self._octets[transaction.index] = transaction.value
+        vendorId, deviceId = self.vendorId, self.deviceId
+        if vendorId is not None and deviceId is not None and (vendorId, deviceId) != self._identified:
+            self._identified = (vendorId, deviceId)
+            if self._onIdentified:
+                self._onIdentified(vendorId, deviceId)
+
+        return []
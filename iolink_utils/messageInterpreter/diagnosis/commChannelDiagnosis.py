@@ -6,6 +6,7 @@ from iolink_utils.exceptions import UnexpectedMasterMessageReceived
 from iolink_utils.octetStreamDecoder.octetStreamDecoderMessages import DeviceMessage, MasterMessage
 from iolink_utils.definitions.transmissionDirection import TransmissionDirection
 from iolink_utils.definitions.eventMemory import EventMemory
+from iolink_utils.utils.timestamp import Timestamp
 
 from .transactionDiagnosis import TransactionDiagEventMemory, TransactionDiagEventReset
 
@@ -19,8 +20,8 @@ class CommChannelDiagnosis:
     def __init__(self):
         self._state: CommChannelDiagnosis.State = CommChannelDiagnosis.State.Idle
 
-        self._startTime: dt = dt(1970, 1, 1)
-        self._endTime: dt = dt(1970, 1, 1)
+        self._startTime: Timestamp = dt(1970, 1, 1)
+        self._endTime: Timestamp = dt(1970, 1, 1)
 
         self._eventMemory: EventMemory = EventMemory()
         self._eventMemoryIndex: int = 0
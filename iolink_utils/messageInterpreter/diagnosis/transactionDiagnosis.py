@@ -1,14 +1,14 @@
 import copy
 from typing import Dict
-from datetime import datetime as dt
 
 from iolink_utils.definitions.eventInfo import EventType, EventMode
 from iolink_utils.definitions.eventMemory import EventMemory
+from iolink_utils.utils.timestamp import Timestamp
 from iolink_utils.messageInterpreter.transaction import Transaction
 
 
 class TransactionDiagEventMemory(Transaction):
-    def __init__(self, startTime: dt, endTime: dt, eventMemory: EventMemory):
+    def __init__(self, startTime: Timestamp, endTime: Timestamp, eventMemory: EventMemory):
         super().__init__()
         self.setTime(startTime, endTime)
         self.eventMemory: EventMemory = copy.deepcopy(eventMemory)
@@ -45,7 +45,7 @@ class TransactionDiagEventMemory(Transaction):
 
 
 class TransactionDiagEventReset(Transaction):
-    def __init__(self, startTime: dt, endTime: dt):
+    def __init__(self, startTime: Timestamp, endTime: Timestamp):
         super().__init__()
         self.setTime(startTime, endTime)
 
@@ -0,0 +1,37 @@
+from dataclasses import dataclass, asdict, fields
+from typing import Dict
+
+from iolink_utils.exceptions import IOLinkUtilsException, InvalidISDUService, InvalidFlowControlValue
+
+
+@dataclass
+class InterpreterStatistics:
+    """
+    Health counters of a MessageInterpreter (see MessageInterpreter.statistics).
+
+    flowControlBreaks: ISDU discarded because FlowControl did not continue the segment count,
+    discardedISDUs: ISDU in progress when the interpreter was reset (e.g. after a decoding error).
+    """
+    transactions: int = 0
+    isduAborts: int = 0
+    flowControlBreaks: int = 0
+    invalidFlowControlValues: int = 0
+    invalidServices: int = 0
+    otherErrors: int = 0
+    resets: int = 0
+    discardedISDUs: int = 0
+
+    def countError(self, error: IOLinkUtilsException):
+        if isinstance(error, InvalidISDUService):
+            self.invalidServices += 1
+        elif isinstance(error, InvalidFlowControlValue):
+            self.invalidFlowControlValues += 1
+        else:
+            self.otherErrors += 1
+
+    def reset(self):
+        for field in fields(self):
+            setattr(self, field.name, field.default)
+
+    def asDict(self) -> Dict[str, int]:
+        return asdict(self)
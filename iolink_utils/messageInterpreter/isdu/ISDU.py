@@ -1,17 +1,19 @@
-from datetime import datetime as dt
 from abc import abstractmethod
 
 from iolink_utils.exceptions import InvalidISDUService
 from iolink_utils.definitions.iServiceNibble import IServiceNibble
 from iolink_utils.octetDecoder.octetDecoder import IService
+from iolink_utils.utils.timestamp import Timestamp
 from iolink_utils.messageInterpreter.transaction import Transaction
 
+_ISERVICE = IService.lookupTable()
+
 
 class ISDU(Transaction):
     def __init__(self):
         super().__init__()
 
-        self._service: IService = IService()
+        self._service: IService = IService.fromOctet(0)
         self._rawData: bytearray = bytearray()
         self._chkpdu: int = 0
         self._isValid: bool = False
@@ -25,7 +27,7 @@ class ISDU(Transaction):
     def isComplete(self) -> bool:
         return self._isComplete
 
-    def setEndTime(self, endTime: dt):
+    def setEndTime(self, endTime: Timestamp):
         self.endTime = endTime
 
     def _hasExtendedLength(self):
@@ -45,7 +47,7 @@ class ISDU(Transaction):
 
     def _updateInternalData(self):
         if len(self._rawData) > 0:
-            self._service = IService(int(self._rawData[0]))
+            self._service = _ISERVICE[self._rawData[0]]
             if self._SERVICE_NIBBLE != self._service.service:
                 raise InvalidISDUService(f"Service value {hex(self._service.service)} not expected ({self._SERVICE_NIBBLE})")
 
@@ -1,6 +1,5 @@
 from enum import IntEnum
 from typing import Optional, Callable
-from datetime import datetime as dt
 
 from iolink_utils.octetStreamDecoder.octetStreamDecoderMessages import (
     DeviceMessage,
@@ -10,10 +9,14 @@ from iolink_utils.exceptions import InvalidISDUMessage
 from iolink_utils.octetDecoder.octetDecoder import IService
 from iolink_utils.definitions.transmissionDirection import TransmissionDirection
 from iolink_utils.definitions.iServiceNibble import IServiceNibble
+from iolink_utils.utils.timestamp import Timestamp
 from iolink_utils.messageInterpreter.isdu.ISDUflowControl import FlowControl
 from iolink_utils.messageInterpreter.isdu.ISDU import ISDU
 from iolink_utils.messageInterpreter.isdu.ISDUrequests import createISDURequest
 from iolink_utils.messageInterpreter.isdu.ISDUresponses import createISDUResponse
+from iolink_utils.messageInterpreter.interpreterStatistics import InterpreterStatistics
+
+_ISERVICE = IService.lookupTable()
 
 
 class CommChannelISDU:
@@ -24,7 +27,8 @@ class CommChannelISDU:
         WaitForResponse = 3
         Response = 4
 
-    def __init__(self) -> None:
+    def __init__(self, statistics: Optional[InterpreterStatistics] = None) -> None:
+        self._statistics: InterpreterStatistics = statistics if statistics is not None else InterpreterStatistics()
         self._state: CommChannelISDU.State = CommChannelISDU.State.Idle
         self._direction: TransmissionDirection = TransmissionDirection.Read
         self._flowControl: FlowControl = FlowControl()
@@ -32,7 +36,12 @@ class CommChannelISDU:
 
         self._isduRequest: Optional[ISDU] = None
         self._isduResponse: Optional[ISDU] = None
-        self._responseStartTime: Optional[dt] = None
+        self._responseStartTime: Optional[Timestamp] = None
+
+    @property
+    def isActive(self) -> bool:
+        """ISDU request or response in progress"""
+        return self._state != CommChannelISDU.State.Idle
 
     def reset(self) -> None:
         self._state = CommChannelISDU.State.Idle
@@ -44,6 +53,7 @@ class CommChannelISDU:
         flowControl = FlowControl(message.mc.address)
 
         if flowControl.state == FlowControl.State.Abort:
+            self._statistics.isduAborts += 1
             self.reset()
             return
 
@@ -104,6 +114,7 @@ class CommChannelISDU:
             self.raiseIfOnRequestDataIsMissing(message)
 
         if not self.appendOnRequestData(self._isduRequest, flow, self._flowControl, message.od):
+            self._statistics.flowControlBreaks += 1
             self.reset()
             return
 
@@ -158,6 +169,7 @@ class CommChannelISDU:
         self.raiseIfOnRequestDataIsMissing(message)
 
         if not self.appendOnRequestData(self._isduResponse, self._flowControl, self._previousFlowControl, message.od):
+            self._statistics.flowControlBreaks += 1
             self.reset()
             return None
 
@@ -178,7 +190,7 @@ class CommChannelISDU:
 
     @staticmethod
     def getService(message) -> IService:
-        return IService(message.od[0])
+        return _ISERVICE[message.od[0]]
 
     @staticmethod
     def appendOnRequestData(isdu: ISDU, current: FlowControl, previous: FlowControl, od: bytearray) -> bool:
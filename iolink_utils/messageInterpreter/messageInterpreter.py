@@ -1,7 +1,9 @@
 from typing import Union
 
+from iolink_utils.exceptions import IOLinkUtilsException
 from iolink_utils.octetStreamDecoder.octetStreamDecoderMessages import DeviceMessage, MasterMessage
 from iolink_utils.definitions.communicationChannel import CommChannel
+from iolink_utils.messageInterpreter.interpreterStatistics import InterpreterStatistics
 
 from iolink_utils.messageInterpreter.diagnosis.commChannelDiagnosis import CommChannelDiagnosis, \
     TransactionDiagEventMemory, TransactionDiagEventReset
@@ -13,14 +15,20 @@ from iolink_utils.messageInterpreter.process.commChannelProcess import CommChann
 
 class MessageInterpreter:
     def __init__(self):
+        self._statistics: InterpreterStatistics = InterpreterStatistics()
         self._channelHandler = {
             CommChannel.Process: CommChannelProcess(),  # this is not ProcessData! (dummy handler)
             CommChannel.Page: CommChannelPage(),
             CommChannel.Diagnosis: CommChannelDiagnosis(),
-            CommChannel.ISDU: CommChannelISDU()
+            CommChannel.ISDU: CommChannelISDU(self._statistics)
         }
         self._activeChannel: CommChannel = CommChannel.Process
 
+    @property
+    def statistics(self) -> InterpreterStatistics:
+        """Counters since creation or statistics.reset() (not cleared by reset)."""
+        return self._statistics
+
     def _updateActiveChannel(self, channel: Union[None, CommChannel]):
         if channel is not None:
             self._activeChannel = channel
@@ -28,9 +36,20 @@ class MessageInterpreter:
     def processMessage(self, message: Union[MasterMessage, DeviceMessage]) \
             -> Union[None, TransactionPage, TransactionDiagEventMemory, TransactionDiagEventReset, ISDU]:
         self._updateActiveChannel(message.channel())
-        return message.dispatch(self._channelHandler[self._activeChannel])
+        try:
+            transaction = message.dispatch(self._channelHandler[self._activeChannel])
+        except IOLinkUtilsException as e:
+            self._statistics.countError(e)
+            raise
+
+        if transaction is not None:
+            self._statistics.transactions += 1
+        return transaction
 
     def reset(self):
+        self._statistics.resets += 1
+        if self._channelHandler[CommChannel.ISDU].isActive:
+            self._statistics.discardedISDUs += 1
         self._activeChannel = CommChannel.Process
 
         for handler in self._channelHandler.values():
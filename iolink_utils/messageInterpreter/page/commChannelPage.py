@@ -2,14 +2,15 @@ from datetime import datetime as dt
 
 from iolink_utils.octetStreamDecoder.octetStreamDecoderMessages import DeviceMessage, MasterMessage
 from iolink_utils.definitions.transmissionDirection import TransmissionDirection
+from iolink_utils.utils.timestamp import Timestamp
 
 from .transactionPage import TransactionPage
 
 
 class CommChannelPage:
     def __init__(self):
-        self._startTime: dt = dt(1970, 1, 1)
-        self._endTime: dt = dt(1970, 1, 1)
+        self._startTime: Timestamp = dt(1970, 1, 1)
+        self._endTime: Timestamp = dt(1970, 1, 1)
 
         self._direction: TransmissionDirection = TransmissionDirection.Read
         self._pageIndex: int = 0
@@ -1,8 +1,8 @@
 from typing import Dict
-from datetime import datetime as dt
 
 from iolink_utils.messageInterpreter.transaction import Transaction
 from iolink_utils.definitions.transmissionDirection import TransmissionDirection
+from iolink_utils.utils.timestamp import Timestamp
 from iolink_utils.utils.directParameterTranslator import translateDirectParameter, Translation
 
 
@@ -14,7 +14,7 @@ class TransactionPage(Transaction):
         self.index: int = pageIndex
         self.value: int = value
 
-    def setTime(self, start: dt, end: dt):
+    def setTime(self, start: Timestamp, end: Timestamp):
         self.startTime = start
         self.endTime = end
 
@@ -2,13 +2,15 @@ from typing import Dict
 from abc import ABC, abstractmethod
 from datetime import datetime as dt
 
+from iolink_utils.utils.timestamp import Timestamp
+
 
 class Transaction(ABC):
     def __init__(self):
-        self.startTime: dt = dt(1970, 1, 1)
-        self.endTime: dt = dt(1970, 1, 1)
+        self.startTime: Timestamp = dt(1970, 1, 1)
+        self.endTime: Timestamp = dt(1970, 1, 1)
 
-    def setTime(self, start: dt, end: dt):
+    def setTime(self, start: Timestamp, end: Timestamp):
         self.startTime = start
         self.endTime = end
 
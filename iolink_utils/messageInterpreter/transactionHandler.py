@@ -0,0 +1,24 @@
+from iolink_utils.messageInterpreter.page.transactionPage import TransactionPage
+from iolink_utils.messageInterpreter.process.transactionProcess import TransactionProcess
+from iolink_utils.messageInterpreter.diagnosis.transactionDiagnosis import (
+    TransactionDiagEventMemory,
+    TransactionDiagEventReset
+)
+from iolink_utils.messageInterpreter.isdu.ISDU import ISDU
+
+
+class TransactionHandler:
+    def handlePage(self, transaction: TransactionPage):
+        return []
+
+    def handleDiagEventMemory(self, transaction: TransactionDiagEventMemory):
+        return []
+
+    def handleDiagEventReset(self, transaction: TransactionDiagEventReset):
+        return []
+
+    def handleISDU(self, transaction: ISDU):
+        return []
+
+    def handleProcess(self, transaction: TransactionProcess):
+        return []
@@ -1,7 +1,11 @@
 import ctypes
-from typing import Optional
+import inspect
+from typing import Optional, Tuple
 from iolink_utils.exceptions import InvalidOctetValue
 
+_OCTET_VALUE_COUNT = 256
+_lookupTables = {}  # decoder class -> tuple of 256 FrozenOctetDecoder
+
 
 class OctetDecoderBase(ctypes.BigEndianStructure):
     """Base class for octet decoder (decoding a single byte)"""
@@ -52,9 +56,95 @@ class OctetDecoderBase(ctypes.BigEndianStructure):
     def copy(self):
         return self.__class__(int(self))
 
+    @classmethod
+    def lookupTable(cls) -> Tuple["FrozenOctetDecoder", ...]:
+        """Get all 256 decoded octets of this class (index = octet value), created on first use"""
+        table = _lookupTables.get(cls)
+        if table is None:
+            table = _lookupTables[cls] = _createLookupTable(cls)
+        return table
+
+    @classmethod
+    def fromOctet(cls, value: int) -> "FrozenOctetDecoder":
+        """
+        Get the shared, immutable decoded instance for an octet (no allocation).
+
+        Use this instead of the constructor/from_buffer_copy if the decoded octet is only read.
+        Call copy() on the result to get a modifiable instance.
+
+        Raises
+        ------
+        InvalidOctetValue
+            If `value` is outside the valid byte range (0–255).
+        """
+        table = _lookupTables.get(cls) or cls.lookupTable()
+        if 0 <= value < _OCTET_VALUE_COUNT:
+            return table[value]
+        raise InvalidOctetValue()
+
     def valuesAsString(self) -> str:
         return ", ".join(f"{name}={getattr(self, name)}" for name, *_ in self._fields_ if name != 'unused')
 
     def __repr__(self):  # pragma: no cover
         """String representation of decoded content."""
         return f"{self.__class__.__name__}({self.valuesAsString()})"
+
+
+class FrozenOctetDecoder:
+    """Immutable, pre-decoded octet with plain int fields (see OctetDecoderBase.fromOctet)"""
+    __slots__ = ('_octet',)
+    _decoderClass = OctetDecoderBase  # class this octet was decoded with
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable (use copy() to get a modifiable instance)")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __int__(self):
+        return self._octet
+
+    def __eq__(self, other):
+        return self._octet == int(other)
+
+    def __hash__(self):
+        return hash(self._octet)
+
+    def __reduce__(self):
+        # copy/deepcopy/pickle return the shared instance
+        return self._decoderClass.fromOctet, (self._octet,)
+
+    def get(self) -> int:
+        """Get octet as integer value"""
+        return self._octet
+
+    def copy(self) -> OctetDecoderBase:
+        """Get a modifiable (ctypes based) instance of the decoder class"""
+        return self._decoderClass(self._octet)
+
+    def valuesAsString(self) -> str:
+        return ", ".join(f"{name}={getattr(self, name)}" for name, *_ in self._decoderClass._fields_ if name != 'unused')
+
+    def __repr__(self):  # pragma: no cover
+        """String representation of decoded content."""
+        return f"{self.__class__.__name__}({self.valuesAsString()})"
+
+
+def _createLookupTable(decoderClass) -> Tuple[FrozenOctetDecoder, ...]:
+    fieldNames = list(dict.fromkeys(name for name, *_ in decoderClass._fields_))
+
+    # reuse methods of the decoder class (e.g. getWithoutChecksum, __repr__) - they only access fields and int(self)
+    attrs = {'__slots__': tuple(fieldNames), '_decoderClass': decoderClass}
+    for klass in reversed(decoderClass.__mro__[:decoderClass.__mro__.index(OctetDecoderBase)]):
+        attrs.update({name: value for name, value in vars(klass).items() if inspect.isfunction(value)})
+    frozenClass = type(decoderClass.__name__, (FrozenOctetDecoder,), attrs)
+
+    table = []
+    for value in range(_OCTET_VALUE_COUNT):
+        decoded = decoderClass(value)
+        frozen = object.__new__(frozenClass)
+        object.__setattr__(frozen, '_octet', value)
+        for name in fieldNames:
+            object.__setattr__(frozen, name, getattr(decoded, name))
+        table.append(frozen)
+    return tuple(table)
@@ -1,11 +1,21 @@
 from enum import IntEnum
-from datetime import datetime as dt
+from typing import Optional, Tuple, Union
 
+from iolink_utils.exceptions import InvalidMSeqCode
 from iolink_utils.octetDecoder.octetDecoder import MC, CKT, CKS
-from .octetStreamDecoderSettings import DecoderSettings
-from .octetStreamDecoderMessages import MasterMessage, DeviceMessage
+from iolink_utils.utils.timestamp import Timestamp
+from .octetStreamDecoderSettings import MSeqLayout, MAX_FRAME_LENGTH, getLayoutIndex
+from .octetStreamDecoderMessages import Message, MasterMessage, DeviceMessage
+from .messagePool import MessagePool
 from ._compressChecksum import lookup_8to6_compression
 
+# shared, pre-decoded octets (see OctetDecoderBase.lookupTable)
+_MC = MC.lookupTable()
+_CKT = CKT.lookupTable()
+_CKS = CKS.lookupTable()
+
+_CHECKSUM_MASK = 0x3F  # checksum bits of CKT/CKS
+
 
 class MessageState(IntEnum):
     Incomplete = 0,
@@ -19,12 +29,28 @@ class DecodingState(IntEnum):
     DeviceMessage = 3
 
 
+def _getViews(msg: Message, layoutIndex: int, layout: MSeqLayout, first: slice, second: slice) -> tuple:
+    # memoryview slices of a pooled message, created once per message and layout
+    views = msg._views[layoutIndex]
+    if views is None or views[0] is not layout:
+        views = (layout, msg._buffer[first], msg._buffer[second])
+        msg._views[layoutIndex] = views
+    return views
+
+
 class MasterMessageDecoder:
-    def __init__(self, settings: DecoderSettings):
-        self._settings: DecoderSettings = settings
+    """Collects the octets of a master message. Reused for every M-sequence (see start)."""
+
+    def __init__(self, pool: Optional[MessagePool] = None):
+        self._pool: Optional[MessagePool] = pool
+        self._layouts: Tuple[Optional[MSeqLayout], ...] = ()
+        self._layoutIndex: int = 0
+        self._layout: Optional[MSeqLayout] = None
+        self._pending: Optional[MasterMessage] = None  # pooled mode: message receiving the octets
+        self._frame: Union[bytearray, memoryview] = bytearray(MAX_FRAME_LENGTH)
         self._octetCount: int = 0
-        self._pdOutLen: int = 0
-        self._odLen: int = 0
+        self._length: int = 2  # MC + CKT, actual length is known after CKT
+        self._startTime: Timestamp = 0
 
         self._msg: MasterMessage = MasterMessage()
 
@@ -32,93 +58,133 @@ class MasterMessageDecoder:
     def msg(self):
         return self._msg
 
-    def processOctet(self, octet, startTime: dt, endTime: dt) -> MessageState:
-        if not self._isComplete():
-            if self._octetCount == 0:
-                self._msg.startTime = startTime
-                self._msg.mc = MC.from_buffer_copy(bytes([octet]), 0)
-            elif self._octetCount == 1:
-                self._msg.ckt = CKT.from_buffer_copy(bytes([octet]), 0)
-
-                payloadLength = self._settings.getPayloadLength(self._msg.ckt.mSeqType)
-                self._pdOutLen = payloadLength.pdOut
-                self._odLen = payloadLength.od if self._msg.mc.read == 0 else 0
-            elif len(self._msg.pdOut) < self._pdOutLen:
-                self._msg.pdOut.append(octet)
-            elif len(self._msg.od) < self._odLen:
-                self._msg.od.append(octet)
-
-            self._octetCount += 1
-            self._msg.endTime = endTime
-
-        if self._isComplete():
-            self._msg.isValid = (self._msg.ckt.checksum == self._calculateChecksum())
-            return MessageState.Finished
-        else:
+    @property
+    def layout(self) -> Optional[MSeqLayout]:
+        return self._layout
+
+    @property
+    def layoutIndex(self) -> int:
+        return self._layoutIndex
+
+    @property
+    def octetCount(self) -> int:
+        return self._octetCount
+
+    def start(self, layouts: Tuple[Optional[MSeqLayout], ...]):
+        self._layouts = layouts
+        self._layout = None
+        self._octetCount = 0
+        self._length = 2
+
+        if self._pool is not None and self._pending is None:
+            # an unfinished message (e.g. timing violation) is reused
+            self._pending = self._pool.acquireMasterMessage()
+            self._frame = self._pending._buffer
+
+    def processOctet(self, octet, startTime: Timestamp, endTime: Timestamp) -> MessageState:
+        if self._octetCount == 0:
+            self._startTime = startTime
+        self._frame[self._octetCount] = octet
+        self._octetCount += 1
+
+        if self._octetCount == 2:
+            self._layoutIndex = getLayoutIndex(_CKT[octet].mSeqType, _MC[self._frame[0]].read)
+            self._layout = self._layouts[self._layoutIndex]
+            if self._layout is None:
+                raise InvalidMSeqCode(f"Invalid M-Sequence type: '{_CKT[octet].mSeqType}'")
+            self._length = self._layout.masterLength
+
+        if self._octetCount < self._length:
             return MessageState.Incomplete
 
+        frame = self._frame
+        layout = self._layout
+        if self._pending is None:
+            msg = MasterMessage()
+            msg.pdOut = frame[layout.pdOut]
+            msg.od = frame[layout.masterOD]
+        else:
+            msg = self._pending
+            _, msg.pdOut, msg.od = _getViews(msg, self._layoutIndex, layout, layout.pdOut, layout.masterOD)
+            self._pending = None
+
+        msg.startTime = self._startTime
+        msg.endTime = endTime
+        msg.mc = _MC[frame[0]]
+        msg.ckt = _CKT[frame[1]]
+        msg.isValid = (msg.ckt.checksum == self._calculateChecksum())
+
+        self._msg = msg
+        return MessageState.Finished
+
     def _calculateChecksum(self):
-        checksum = 0x52
-        checksum ^= self._msg.mc.get()
-        checksum ^= self._msg.ckt.getWithoutChecksum()
-        for b in self._msg.pdOut:
-            checksum ^= b
-        for b in self._msg.od:
-            checksum ^= b
+        checksum = 0x52 ^ (self._frame[1] & _CHECKSUM_MASK)  # ignore checksum bits of CKT
+        for index in range(self._length):
+            checksum ^= self._frame[index]
         return lookup_8to6_compression[checksum]
 
-    def _isComplete(self):
-        return ((self._octetCount >= 2) and
-                len(self._msg.pdOut) == self._pdOutLen and
-                len(self._msg.od) == self._odLen)
-
 
 class DeviceMessageDecoder:
-    def __init__(self, settings: DecoderSettings, read: int, mSeqType: int):
-        self._settings: DecoderSettings = settings
+    """Collects the octets of a device message. Reused for every M-sequence (see start)."""
+
+    def __init__(self, pool: Optional[MessagePool] = None):
+        self._pool: Optional[MessagePool] = pool
+        self._layoutIndex: int = 0
+        self._layout: Optional[MSeqLayout] = None
+        self._pending: Optional[DeviceMessage] = None  # pooled mode: message receiving the octets
+        self._frame: Union[bytearray, memoryview] = bytearray(MAX_FRAME_LENGTH)
         self._octetCount: int = 0
+        self._startTime: Timestamp = 0
 
         self._msg: DeviceMessage = DeviceMessage()
 
-        payloadLength = self._settings.getPayloadLength(mSeqType)
-        self._odLen: int = payloadLength.od if read == 1 else 0
-        self._pdInLen: int = payloadLength.pdIn
-
     @property
     def msg(self):
         return self._msg
 
-    def processOctet(self, octet, start_time: dt, end_time: dt) -> MessageState:
-        if not self._isComplete():
-            if self._octetCount == 0:
-                self._msg.startTime = start_time
+    @property
+    def octetCount(self) -> int:
+        return self._octetCount
 
-            if len(self._msg.od) < self._odLen:
-                self._msg.od.append(octet)
-            elif len(self._msg.pdIn) < self._pdInLen:
-                self._msg.pdIn.append(octet)
-            else:
-                self._msg.cks = CKS.from_buffer_copy(bytes([octet]), 0)
+    def start(self, layoutIndex: int, layout: MSeqLayout):
+        self._layoutIndex = layoutIndex
+        self._layout = layout
+        self._octetCount = 0
 
-            self._octetCount += 1
-            self._msg.endTime = end_time
+        if self._pool is not None and self._pending is None:
+            self._pending = self._pool.acquireDeviceMessage()
+            self._frame = self._pending._buffer
 
-        if self._isComplete():
-            self._msg.isValid = (self._msg.cks.checksum == self._calculateChecksum())
-            return MessageState.Finished
-        else:
+    def processOctet(self, octet, start_time: Timestamp, end_time: Timestamp) -> MessageState:
+        if self._octetCount == 0:
+            self._startTime = start_time
+        self._frame[self._octetCount] = octet
+        self._octetCount += 1
+
+        if self._octetCount < self._layout.deviceLength:
             return MessageState.Incomplete
 
+        frame = self._frame
+        layout = self._layout
+        if self._pending is None:
+            msg = DeviceMessage()
+            msg.od = frame[layout.deviceOD]
+            msg.pdIn = frame[layout.pdIn]
+        else:
+            msg = self._pending
+            _, msg.od, msg.pdIn = _getViews(msg, self._layoutIndex, layout, layout.deviceOD, layout.pdIn)
+            self._pending = None
+
+        msg.startTime = self._startTime
+        msg.endTime = end_time
+        msg.cks = _CKS[octet]
+        msg.isValid = (msg.cks.checksum == self._calculateChecksum())
+
+        self._msg = msg
+        return MessageState.Finished
+
     def _calculateChecksum(self):
-        checksum = 0x52
-        for b in self._msg.od:
-            checksum ^= b
-        for b in self._msg.pdIn:
-            checksum ^= b
-        checksum ^= self._msg.cks.getWithoutChecksum()
+        checksum = 0x52 ^ (self._frame[self._octetCount - 1] & _CHECKSUM_MASK)  # ignore checksum bits of CKS
+        for index in range(self._octetCount):
+            checksum ^= self._frame[index]
         return lookup_8to6_compression[checksum]
-
-    def _isComplete(self):
-        return (self._octetCount == (self._pdInLen + self._odLen + 1) and
-                len(self._msg.pdIn) == self._pdInLen and
-                len(self._msg.od) == self._odLen)
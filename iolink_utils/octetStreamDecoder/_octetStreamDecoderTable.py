@@ -0,0 +1,279 @@
+from typing import Optional, Sequence, List, Union
+
+from iolink_utils.exceptions import IOLinkUtilsException, InvalidMSeqCode
+from iolink_utils.definitions.timing import getMaxFrameTransmissionDelay_master, getMaxResponseTime, \
+    getMaxFrameTransmissionDelay_device
+from iolink_utils.utils.timestamp import Timestamp, microsecondsToNs
+from ._octetStreamDecoderInternal import _MC, _CKT, _CKS, _CHECKSUM_MASK, _getViews
+from ._compressChecksum import lookup_8to6_compression
+from .octetStreamDecoderSettings import DecoderSettings, MAX_FRAME_LENGTH, getLayoutIndex
+from .octetStreamDecoderMessages import MasterMessage, DeviceMessage
+from .messagePool import MessagePool
+from .decoderStatistics import DecoderStatistics
+
+# transition table entry: (nextState << _ACTION_BITS) | action
+_ACTION_BITS = 2
+_ACTION_MASK = 0x03
+_ACTION_STORE = 0
+_ACTION_MASTER_FINISHED = 1
+_ACTION_DEVICE_FINISHED = 2
+_ACTION_INVALID_MSEQ = 3
+
+_STATE_IDLE = 0
+_STATE_MC = 1
+_STATE_CKT = 2  # + read bit of MC
+_FIRST_FRAME_STATE = 4
+
+_DEVICE_FRAME_OFFSET = MAX_FRAME_LENGTH  # device octets are stored behind the master octets
+_ALWAYS_RESTART = -(1 << 64)  # timing limit of idle state: every octet starts a new master message
+
+
+class TransitionTable:
+    """
+    Precomputed decoding states of one settings snapshot.
+
+    Every octet of an M-sequence has its own state (MC, CKT, PDout/OD octets of each layout, ...).
+    transitions[(state << 8) | octet] gives next state and action. The per-state lists give the
+    position in the frame buffer, the allowed gap (in ns) before the octet and the layout index.
+    """
+
+    def __init__(self, settings: DecoderSettings):
+        self.settings: DecoderSettings = settings
+
+        rate = settings.transmissionRate
+        maxDelayMaster = microsecondsToNs(getMaxFrameTransmissionDelay_master(rate))
+        maxResponseTime = microsecondsToNs(getMaxResponseTime(rate))
+        maxDelayDevice = microsecondsToNs(getMaxFrameTransmissionDelay_device(rate))
+
+        # number the states (master octets behind CKT, then device octets of each layout)
+        masterStates = {}
+        deviceStates = {}
+        stateCount = _FIRST_FRAME_STATE
+        for layoutIndex, layout in enumerate(settings.layouts):
+            if layout is not None:
+                masterStates[layoutIndex] = stateCount
+                stateCount += layout.masterLength - 2
+                deviceStates[layoutIndex] = stateCount
+                stateCount += layout.deviceLength
+
+        def entry(nextState: int, action: int) -> int:
+            return (nextState << _ACTION_BITS) | action
+
+        def masterFinishedOrNext(layoutIndex: int, position: int, nextState: int) -> int:
+            if position == settings.layouts[layoutIndex].masterLength - 1:
+                return entry(deviceStates[layoutIndex], _ACTION_MASTER_FINISHED)
+            return entry(nextState, _ACTION_STORE)
+
+        transitions: List[int] = []
+        positions: List[int] = []
+        limits: List[int] = []
+        layoutIndices: List[int] = []
+
+        def addState(row: List[int], position: int, limit: int, layoutIndex: int = 0):
+            transitions.extend(row)
+            positions.append(position)
+            limits.append(limit)
+            layoutIndices.append(layoutIndex)
+
+        mcRow = [entry(_STATE_CKT + _MC[octet].read, _ACTION_STORE) for octet in range(256)]
+        addState(mcRow, 0, _ALWAYS_RESTART)  # idle (never decoded, restarts at MC)
+        addState(mcRow, 0, maxDelayMaster)  # MC
+        for read in (0, 1):
+            cktRow = []
+            for octet in range(256):
+                layoutIndex = getLayoutIndex(_CKT[octet].mSeqType, read)
+                if settings.layouts[layoutIndex] is None:
+                    cktRow.append(entry(_STATE_IDLE, _ACTION_INVALID_MSEQ))
+                else:
+                    cktRow.append(masterFinishedOrNext(layoutIndex, 1, masterStates[layoutIndex]))
+            addState(cktRow, 1, maxDelayMaster)
+
+        for layoutIndex, layout in enumerate(settings.layouts):
+            if layout is None:
+                continue
+            for position in range(2, layout.masterLength):
+                state = len(positions)
+                addState([masterFinishedOrNext(layoutIndex, position, state + 1)] * 256,
+                         position, maxDelayMaster, layoutIndex)
+            for position in range(layout.deviceLength):
+                state = len(positions)
+                if position == layout.deviceLength - 1:
+                    row = [entry(_STATE_IDLE, _ACTION_DEVICE_FINISHED)] * 256
+                else:
+                    row = [entry(state + 1, _ACTION_STORE)] * 256
+                addState(row, _DEVICE_FRAME_OFFSET + position,
+                         maxResponseTime if position == 0 else maxDelayDevice, layoutIndex)
+
+        assert len(positions) == stateCount
+
+        self.transitions: List[int] = transitions
+        self.positions: List[int] = positions
+        self.limits: List[int] = limits
+        self.layoutIndices: List[int] = layoutIndices
+
+
+class TransitionTableDecoder:
+    """Table driven alternative to the state machine in OctetStreamDecoder (identical output)."""
+
+    def __init__(self, settings: DecoderSettings, pool: Optional[MessagePool] = None,
+                 statistics: Optional[DecoderStatistics] = None):
+        self._table: TransitionTable = TransitionTable(settings)
+        self._pendingTable: Optional[TransitionTable] = None  # activated when the next M-sequence starts
+        self._pool: Optional[MessagePool] = pool
+        self._statistics: DecoderStatistics = statistics if statistics is not None else DecoderStatistics()
+
+        self._state: int = _STATE_IDLE
+        self._lastProcessedOctetEndTime: int = 0  # in ns
+        self._frame: bytearray = bytearray(2 * MAX_FRAME_LENGTH)
+        self._frameView: memoryview = memoryview(self._frame)
+        self._startTimes: List[Timestamp] = [0] * (2 * MAX_FRAME_LENGTH)
+
+    def setSettings(self, settings: DecoderSettings):
+        self._pendingTable = TransitionTable(settings)
+
+    def reset(self):
+        self._statistics.resets += 1
+        if self._state != _STATE_IDLE:
+            self._drop(self._table, self._state)
+        self._state = _STATE_IDLE
+
+    def _drop(self, table: TransitionTable, state: int):
+        # count the octets received of the incomplete M-sequence (state: position of the next octet)
+        position = table.positions[state]
+        if position >= _DEVICE_FRAME_OFFSET:
+            position += table.settings.layouts[table.layoutIndices[state]].masterLength - _DEVICE_FRAME_OFFSET
+        self._statistics.countDrop(position)
+
+    def _restart(self) -> TransitionTable:
+        if self._pendingTable is not None:
+            self._table = self._pendingTable
+            self._pendingTable = None
+        return self._table
+
+    def processOctet(self, octet: int, startNs: int, endNs: int, startTime: Timestamp, endTime: Timestamp) \
+            -> Union[None, MasterMessage, DeviceMessage]:
+        table = self._table
+        state = self._state
+        if startNs - self._lastProcessedOctetEndTime >= table.limits[state]:
+            if state != _STATE_IDLE:
+                self._statistics.timingResyncs += 1
+                self._drop(table, state)
+            table = self._restart()
+            state = _STATE_MC
+        self._lastProcessedOctetEndTime = endNs
+
+        position = table.positions[state]
+        self._frame[position] = octet
+        self._startTimes[position] = startTime
+
+        transition = table.transitions[(state << 8) | octet]
+        self._state = transition >> _ACTION_BITS
+        if transition & _ACTION_MASK:
+            return self._finish(table, transition, state, endTime)
+        return None
+
+    def processOctets(self, octets: Union[bytes, bytearray, memoryview],
+                      startTimes: Sequence[int], endTimes: Sequence[int]) -> List[Union[MasterMessage, DeviceMessage]]:
+        """Same as OctetStreamDecoder.processOctets (timestamps in ns), with the loop kept in local variables."""
+        table = self._table
+        transitions, positions, limits = table.transitions, table.positions, table.limits
+        frame = self._frame
+        octetStartTimes = self._startTimes
+        state = self._state
+        lastEndTime = self._lastProcessedOctetEndTime
+
+        messages = []
+        for octet, startTime, endTime in zip(octets, startTimes, endTimes):
+            if startTime - lastEndTime >= limits[state]:
+                if state != _STATE_IDLE:
+                    self._statistics.timingResyncs += 1
+                    self._drop(table, state)
+                if self._pendingTable is not None:
+                    table = self._restart()
+                    transitions, positions, limits = table.transitions, table.positions, table.limits
+                state = _STATE_MC
+            lastEndTime = endTime
+
+            position = positions[state]
+            frame[position] = octet
+            octetStartTimes[position] = startTime
+
+            transition = transitions[(state << 8) | octet]
+            nextState = transition >> _ACTION_BITS
+            if transition & _ACTION_MASK:
+                try:
+                    messages.append(self._finish(table, transition, state, endTime))
+                except IOLinkUtilsException:
+                    nextState = _STATE_IDLE
+            state = nextState
+
+        self._state = state
+        self._lastProcessedOctetEndTime = lastEndTime
+        return messages
+
+    def _finish(self, table: TransitionTable, transition: int, state: int, endTime: Timestamp) \
+            -> Union[MasterMessage, DeviceMessage]:
+        action = transition & _ACTION_MASK
+        if action == _ACTION_MASTER_FINISHED:
+            layoutIndex = table.layoutIndices[transition >> _ACTION_BITS]  # first device state
+            return self._createMasterMessage(table, layoutIndex, endTime)
+        if action == _ACTION_DEVICE_FINISHED:
+            return self._createDeviceMessage(table, table.layoutIndices[state], endTime)
+
+        self._statistics.invalidMSequenceTypes += 1
+        self._statistics.countDrop(2)  # MC, CKT
+        raise InvalidMSeqCode(f"Invalid M-Sequence type: '{_CKT[self._frame[1]].mSeqType}'")
+
+    def _checksum(self, start: int, end: int, checksumPosition: int) -> int:
+        frame = self._frame
+        checksum = 0x52 ^ (frame[checksumPosition] & _CHECKSUM_MASK)  # ignore checksum bits of CKT/CKS
+        for index in range(start, end):
+            checksum ^= frame[index]
+        return lookup_8to6_compression[checksum]
+
+    def _createMasterMessage(self, table: TransitionTable, layoutIndex: int, endTime: Timestamp) -> MasterMessage:
+        layout = table.settings.layouts[layoutIndex]
+        frame = self._frame
+        if self._pool is None:
+            msg = MasterMessage()
+            msg.pdOut = frame[layout.pdOut]
+            msg.od = frame[layout.masterOD]
+        else:
+            msg = self._pool.acquireMasterMessage()
+            msg._buffer[:layout.masterLength] = self._frameView[:layout.masterLength]
+            _, msg.pdOut, msg.od = _getViews(msg, layoutIndex, layout, layout.pdOut, layout.masterOD)
+
+        msg.startTime = self._startTimes[0]
+        msg.endTime = endTime
+        msg.mc = _MC[frame[0]]
+        msg.ckt = _CKT[frame[1]]
+        msg.isValid = (msg.ckt.checksum == self._checksum(0, layout.masterLength, 1))
+        statistics = self._statistics
+        statistics.masterMessages += 1
+        if not msg.isValid:
+            statistics.masterChecksumErrors += 1
+        return msg
+
+    def _createDeviceMessage(self, table: TransitionTable, layoutIndex: int, endTime: Timestamp) -> DeviceMessage:
+        layout = table.settings.layouts[layoutIndex]
+        start = _DEVICE_FRAME_OFFSET
+        end = _DEVICE_FRAME_OFFSET + layout.deviceLength
+        device = self._frameView[start:end]
+        if self._pool is None:
+            msg = DeviceMessage()
+            msg.od = bytearray(device[layout.deviceOD])
+            msg.pdIn = bytearray(device[layout.pdIn])
+        else:
+            msg = self._pool.acquireDeviceMessage()
+            msg._buffer[:layout.deviceLength] = device
+            _, msg.od, msg.pdIn = _getViews(msg, layoutIndex, layout, layout.deviceOD, layout.pdIn)
+
+        msg.startTime = self._startTimes[start]
+        msg.endTime = endTime
+        msg.cks = _CKS[self._frame[end - 1]]
+        msg.isValid = (msg.cks.checksum == self._checksum(start, end, end - 1))
+        statistics = self._statistics
+        statistics.deviceMessages += 1
+        if not msg.isValid:
+            statistics.deviceChecksumErrors += 1
+        return msg
@@ -0,0 +1,73 @@
+"""
+Batch (vectorized) checksum validation of M-sequences for offline analysis of large captures.
+
+The frames are laid out as 2-D octet array (one M-sequence per row, padded to the longest
+frame) with a separate length column. Requires numpy, which is an optional dependency of
+iolink_utils (it is not available inside the Saleae HLA environment).
+"""
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from ._compressChecksum import lookup_8to6_compression
+
+_CHECKSUM_SEED = 0x52
+_CHECKSUM_MASK = 0x3F  # checksum bits of CKT/CKS octet
+
+_lookupTable = None
+
+
+def _requireNumpy():
+    if np is None:
+        raise ImportError("numpy is required for batch checksum validation (pip install numpy)")
+
+
+def _getLookupTable():
+    global _lookupTable
+    if _lookupTable is None:
+        _lookupTable = np.array(lookup_8to6_compression, dtype=np.uint8)
+    return _lookupTable
+
+
+def _validate(frames, lengths, checksumColumn):
+    frames = np.asarray(frames, dtype=np.uint8)
+    lengths = np.asarray(lengths, dtype=np.intp)
+    if frames.ndim != 2 or lengths.shape != (frames.shape[0],):
+        raise ValueError(f"Expected frames of shape (n, maxLength) and n lengths. "
+                         f"Got {frames.shape} and {lengths.shape}")
+
+    rows = np.arange(frames.shape[0])
+    inFrame = np.arange(frames.shape[1]) < lengths[:, np.newaxis]
+    checksumOctet = frames[rows, checksumColumn]
+
+    # XOR of all octets, checksum bits are removed afterward (see _calculateChecksum)
+    checksum = np.bitwise_xor.reduce(frames, axis=1, where=inFrame, initial=0)
+    checksum ^= (checksumOctet & _CHECKSUM_MASK) ^ _CHECKSUM_SEED
+
+    return _getLookupTable()[checksum] == (checksumOctet & _CHECKSUM_MASK)
+
+
+def validateMasterChecksums(frames, lengths):
+    """
+    Validate checksums of master messages (MC, CKT, PDout, OD).
+
+    :param frames: 2-D octet array, one master message per row (padding is ignored)
+    :param lengths: octet count of each master message (>= 2)
+    :return: boolean numpy array, True if the checksum in CKT is valid
+    """
+    _requireNumpy()
+    return _validate(frames, lengths, 1)
+
+
+def validateDeviceChecksums(frames, lengths):
+    """
+    Validate checksums of device messages (OD, PDin, CKS).
+
+    :param frames: 2-D octet array, one device message per row (padding is ignored)
+    :param lengths: octet count of each device message (>= 1)
+    :return: boolean numpy array, True if the checksum in CKS is valid
+    """
+    _requireNumpy()
+    return _validate(frames, lengths, np.asarray(lengths, dtype=np.intp) - 1)
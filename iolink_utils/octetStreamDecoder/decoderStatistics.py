@@ -0,0 +1,46 @@
+from dataclasses import dataclass, asdict, fields
+from typing import Dict
+
+
+@dataclass
+class DecoderStatistics:
+    """
+    Health counters of an OctetStreamDecoder (see OctetStreamDecoder.statistics).
+
+    An M-sequence is dropped if it is incomplete when a timing gap restarts decoding (resync),
+    its M-sequence type has no layout (invalid CKT) or the decoder is reset.
+    """
+    masterMessages: int = 0
+    deviceMessages: int = 0
+    masterChecksumErrors: int = 0
+    deviceChecksumErrors: int = 0
+    timingResyncs: int = 0
+    invalidMSequenceTypes: int = 0
+    resets: int = 0
+    droppedMSequences: int = 0
+    droppedOctets: int = 0  # octets of dropped M-sequences (incl. an already decoded master message)
+
+    @property
+    def checksumErrors(self) -> int:
+        return self.masterChecksumErrors + self.deviceChecksumErrors
+
+    def countMessage(self, isMaster: bool, isValid: bool):
+        if isMaster:
+            self.masterMessages += 1
+            if not isValid:
+                self.masterChecksumErrors += 1
+        else:
+            self.deviceMessages += 1
+            if not isValid:
+                self.deviceChecksumErrors += 1
+
+    def countDrop(self, octetCount: int):
+        self.droppedMSequences += 1
+        self.droppedOctets += octetCount
+
+    def reset(self):
+        for field in fields(self):
+            setattr(self, field.name, field.default)
+
+    def asDict(self) -> Dict[str, int]:
+        return asdict(self)
@@ -0,0 +1,65 @@
+from typing import List
+
+from .octetStreamDecoderSettings import MAX_FRAME_LENGTH
+from .octetStreamDecoderMessages import Message, MasterMessage, DeviceMessage
+
+
+class MessagePool:
+    """
+    Preallocated master/device messages for OctetStreamDecoder (pooled mode).
+
+    Every message owns a fixed slot of an octet arena, its od/pdIn/pdOut are memoryview
+    slices of that slot. A message is valid until it is released (OctetStreamDecoder.releaseMessage),
+    afterward it is recycled -> consumers have to copy data they want to keep.
+    If the pool is exhausted, another arena with the same capacity is added.
+    """
+
+    def __init__(self, capacity: int = 16):
+        if capacity < 1:
+            raise ValueError(f"Invalid capacity: {capacity}")
+
+        self._capacity: int = capacity
+        self._arenas: List[bytearray] = []
+        self._freeMasterMessages: List[MasterMessage] = []
+        self._freeDeviceMessages: List[DeviceMessage] = []
+
+        self._grow()
+
+    @property
+    def size(self) -> int:
+        """Number of allocated messages (per message type)"""
+        return len(self._arenas) * self._capacity
+
+    @property
+    def available(self) -> int:
+        """Number of free messages (master + device)"""
+        return len(self._freeMasterMessages) + len(self._freeDeviceMessages)
+
+    def _grow(self):
+        arena = bytearray(2 * self._capacity * MAX_FRAME_LENGTH)
+        self._arenas.append(arena)
+
+        view = memoryview(arena)
+        for index in range(self._capacity):
+            offset = 2 * index * MAX_FRAME_LENGTH
+            self._freeMasterMessages.append(
+                MasterMessage(view[offset:offset + MAX_FRAME_LENGTH]))
+            self._freeDeviceMessages.append(
+                DeviceMessage(view[offset + MAX_FRAME_LENGTH:offset + 2 * MAX_FRAME_LENGTH]))
+
+    def acquireMasterMessage(self) -> MasterMessage:
+        if not self._freeMasterMessages:
+            self._grow()
+        return self._freeMasterMessages.pop()
+
+    def acquireDeviceMessage(self) -> DeviceMessage:
+        if not self._freeDeviceMessages:
+            self._grow()
+        return self._freeDeviceMessages.pop()
+
+    def release(self, message: Message):
+        """Return message to the pool (must have been acquired from this pool and must not be released twice)."""
+        if isinstance(message, MasterMessage):
+            self._freeMasterMessages.append(message)
+        else:
+            self._freeDeviceMessages.append(message)
@@ -1,78 +1,221 @@
-from typing import Union, Optional
-import copy
-from datetime import datetime as dt, timedelta
+from enum import IntEnum
+from typing import Union, Optional, Sequence, List, Dict
 
+from iolink_utils.exceptions import IOLinkUtilsException, InvalidOctetCount, InvalidMSeqCode
 from iolink_utils.definitions.timing import getMaxFrameTransmissionDelay_master, getMaxResponseTime, \
     getMaxFrameTransmissionDelay_device
+from iolink_utils.utils.timestamp import Timebase, Timestamp, datetimeToNs, nsToDatetime, microsecondsToNs
 from ._octetStreamDecoderInternal import DecodingState, MessageState, DeviceMessageDecoder, MasterMessageDecoder
+from ._octetStreamDecoderTable import TransitionTableDecoder
 from .octetStreamDecoderSettings import DecoderSettings
 from .octetStreamDecoderMessages import DeviceMessage, MasterMessage
+from .messagePool import MessagePool
+from .decoderStatistics import DecoderStatistics
+
+
+class DecoderEngine(IntEnum):
+    StateMachine = 0  # per-state message decoders
+    TransitionTable = 1  # precomputed transition table per settings (same output, less work per octet)
 
 
 class OctetStreamDecoder:
-    def __init__(self, settings: DecoderSettings):
-        self._settings: DecoderSettings = copy.deepcopy(settings)
+    def __init__(self, settings: DecoderSettings, timebase: Timebase = Timebase.DateTime,
+                 messagePool: Optional[MessagePool] = None, engine: DecoderEngine = DecoderEngine.StateMachine):
+        """
+        :param settings: M-sequence payload sizes and bitrate
+        :param timebase: type of timestamps passed to processOctet and set in messages
+        :param messagePool: pooled mode (optional), returned messages have to be released (see releaseMessage)
+        :param engine: decoding engine
+        """
+        self._settings: DecoderSettings = settings  # frozen -> no copy required
+        self._timebase: Timebase = timebase
+        self._messagePool: Optional[MessagePool] = messagePool
+        self._engine: DecoderEngine = engine
+        self._statistics: DecoderStatistics = DecoderStatistics()
+        self._tableDecoder: Optional[TransitionTableDecoder] = \
+            TransitionTableDecoder(settings, messagePool, self._statistics) \
+            if engine == DecoderEngine.TransitionTable else None
 
         self._state: DecodingState = DecodingState.Idle
-        self._messageDecoder: Union[None, MasterMessageDecoder, DeviceMessageDecoder] = None
+        self._masterMessageDecoder: MasterMessageDecoder = MasterMessageDecoder(messagePool)
+        self._deviceMessageDecoder: DeviceMessageDecoder = DeviceMessageDecoder(messagePool)
+        self._messageDecoder: Union[MasterMessageDecoder, DeviceMessageDecoder] = self._masterMessageDecoder
         self._lastMasterMessage: Optional[MasterMessage] = None
         self._lastDeviceMessage: Optional[DeviceMessage] = None
 
-        self._lastProcessedOctetEndTime: dt = dt(1970, 1, 1)
+        self._lastProcessedOctetEndTime: int = 0  # in ns
+
+        self._timingConstraints: Dict[DecodingState, int] = self._createTimingConstraints(settings)
+        self._maxFrameTransmissionDelay: int = self._timingConstraints[DecodingState.Idle]
 
-        self._timingConstraints = {
+    @staticmethod
+    def _createTimingConstraints(settings: DecoderSettings) -> Dict[DecodingState, int]:
+        # max. allowed gap (in ns) between end of last octet and start of next octet
+        return {
             DecodingState.Idle: 0,
-            DecodingState.MasterMessage: getMaxFrameTransmissionDelay_master(self._settings.transmissionRate),
-            DecodingState.DeviceResponseDelay: getMaxResponseTime(self._settings.transmissionRate),
-            DecodingState.DeviceMessage: getMaxFrameTransmissionDelay_device(self._settings.transmissionRate),
+            DecodingState.MasterMessage: microsecondsToNs(
+                getMaxFrameTransmissionDelay_master(settings.transmissionRate)),
+            DecodingState.DeviceResponseDelay: microsecondsToNs(
+                getMaxResponseTime(settings.transmissionRate)),
+            DecodingState.DeviceMessage: microsecondsToNs(
+                getMaxFrameTransmissionDelay_device(settings.transmissionRate)),
         }
-        self._maxFrameTransmissionDelay: float = self._timingConstraints[DecodingState.Idle]
+
+    @property
+    def timebase(self) -> Timebase:
+        return self._timebase
+
+    @property
+    def engine(self) -> DecoderEngine:
+        return self._engine
 
     @property
     def settings(self) -> DecoderSettings:
         return self._settings
 
+    @property
+    def statistics(self) -> DecoderStatistics:
+        """Counters since creation or statistics.reset() (not cleared by reset)."""
+        return self._statistics
+
     def setSettings(self, settings: DecoderSettings):
-        self._settings = copy.deepcopy(settings)
+        """Used for all M-sequences starting after this call (the layout table comes with the settings)."""
+        if settings.transmissionRate != self._settings.transmissionRate:
+            self._timingConstraints = self._createTimingConstraints(settings)
+            self._updateTimingConstraint(self._state)
+        self._settings = settings
+        if self._tableDecoder is not None:
+            self._tableDecoder.setSettings(settings)
+
+    def releaseMessage(self, message: Union[None, MasterMessage, DeviceMessage]):
+        """Pooled mode: recycle a message returned by processOctet(s) once it is no longer used (no-op otherwise)."""
+        if self._messagePool is not None and message is not None:
+            self._messagePool.release(message)
 
     def _updateTimingConstraint(self, state: DecodingState):
         self._maxFrameTransmissionDelay = self._timingConstraints[state]
 
-    def _isWithinTimingConstraints(self, octetStartTime: dt) -> bool:
-        return (octetStartTime - self._lastProcessedOctetEndTime) < timedelta(
-            microseconds=self._maxFrameTransmissionDelay)
+    def _isWithinTimingConstraints(self, octetStartTime: int) -> bool:
+        return (octetStartTime - self._lastProcessedOctetEndTime) < self._maxFrameTransmissionDelay
 
     def _gotoState(self, state: DecodingState):
         self._state = state
         self._updateTimingConstraint(self._state)
 
     def reset(self):
-        self._state: DecodingState = DecodingState.Idle
-
-    def processOctet(self, octet, startTime: dt, endTime: dt) -> Union[None, MasterMessage, DeviceMessage]:
+        if self._tableDecoder is not None:
+            self._tableDecoder.reset()
+            return
+
+        self._statistics.resets += 1
+        if self._state != DecodingState.Idle:
+            self._drop()
+        self._state = DecodingState.Idle
+
+    def _drop(self):
+        # count the octets received of the incomplete M-sequence
+        octetCount = self._masterMessageDecoder.octetCount
+        if self._state == DecodingState.DeviceMessage:
+            octetCount += self._deviceMessageDecoder.octetCount
+        self._statistics.countDrop(octetCount)
+
+    def processOctet(self, octet, startTime: Timestamp, endTime: Timestamp) \
+            -> Union[None, MasterMessage, DeviceMessage]:
+        """Decodes a single octet. Timestamps are datetime or integer ns, depending on timebase."""
+        if self._timebase == Timebase.Nanoseconds:
+            startNs, endNs = startTime, endTime
+        else:
+            startNs, endNs = datetimeToNs(startTime), datetimeToNs(endTime)
+
+        if self._tableDecoder is not None:
+            return self._tableDecoder.processOctet(octet, startNs, endNs, startTime, endTime)
+
+        self._checkTiming(startNs, endNs)
+        try:
+            return self._decodeOctet(octet, startTime, endTime)
+        except InvalidMSeqCode:
+            self._invalidMSequenceType()
+            raise
+
+    def processOctets(self, octets: Union[bytes, bytearray, memoryview],
+                      startTimes: Sequence[int], endTimes: Sequence[int]) -> List[Union[MasterMessage, DeviceMessage]]:
+        """
+        Decodes a batch of octets and returns all messages completed by them (in stream order).
+
+        The result is the same as calling processOctet for every octet. If decoding fails
+        (IOLinkUtilsException), the decoder is reset and decoding continues with the next
+        octet (like IOLinkProtocolAnalyzer.decode does).
+
+        :param octets: received octets (bytes-like)
+        :param startTimes: start time of each octet in ns since epoch (see utils.timestamp)
+        :param endTimes: end time of each octet in ns since epoch
+        :return: list of completed MasterMessage/DeviceMessage (start/end time according to timebase)
+        """
+        if not len(octets) == len(startTimes) == len(endTimes):
+            raise InvalidOctetCount(f"Number of octets ({len(octets)}) and timestamps "
+                                    f"({len(startTimes)}/{len(endTimes)}) differ")
+
+        if self._tableDecoder is not None:
+            messages = self._tableDecoder.processOctets(octets, startTimes, endTimes)
+        else:
+            messages = []
+            for octet, startTime, endTime in zip(octets, startTimes, endTimes):
+                self._checkTiming(startTime, endTime)
+                try:
+                    message = self._decodeOctet(octet, startTime, endTime)
+                except InvalidMSeqCode:
+                    self._invalidMSequenceType()
+                    continue
+                except IOLinkUtilsException:
+                    self.reset()
+                    continue
+
+                if message is not None:
+                    messages.append(message)
+
+        if self._timebase == Timebase.DateTime:
+            for message in messages:
+                message.startTime = nsToDatetime(message.startTime)
+                message.endTime = nsToDatetime(message.endTime)
+        return messages
+
+    def _invalidMSequenceType(self):
+        # same as TransitionTableDecoder: M-sequence is dropped, next octet starts a new one
+        self._statistics.invalidMSequenceTypes += 1
+        self._statistics.countDrop(self._masterMessageDecoder.octetCount)
+        self._state = DecodingState.Idle
+
+    def _checkTiming(self, startTime: int, endTime: int):
         if self._state == DecodingState.Idle or not self._isWithinTimingConstraints(startTime):
-            self._messageDecoder = MasterMessageDecoder(self._settings)
+            if self._state != DecodingState.Idle:
+                self._statistics.timingResyncs += 1
+                self._drop()
+            self._masterMessageDecoder.start(self._settings.layouts)
+            self._messageDecoder = self._masterMessageDecoder
             self._gotoState(DecodingState.MasterMessage)
             self._lastMasterMessage = None
             self._lastDeviceMessage = None
         self._lastProcessedOctetEndTime = endTime
 
+    def _decodeOctet(self, octet, startTime, endTime) -> Union[None, MasterMessage, DeviceMessage]:
         if self._state == DecodingState.MasterMessage:
             if self._messageDecoder.processOctet(octet, startTime, endTime) == MessageState.Finished:
                 self._gotoState(DecodingState.DeviceResponseDelay)
                 self._lastMasterMessage = self._messageDecoder.msg
+                self._statistics.countMessage(True, self._lastMasterMessage.isValid)
                 return self._lastMasterMessage
 
         if self._state == DecodingState.DeviceResponseDelay:
-            self._lastMasterMessage: MasterMessage  # type hint
-            self._messageDecoder = DeviceMessageDecoder(self._settings, self._lastMasterMessage.mc.read,
-                                                        self._lastMasterMessage.ckt.mSeqType)
+            # layout was looked up when the master message started (CKT)
+            self._deviceMessageDecoder.start(self._masterMessageDecoder.layoutIndex, self._masterMessageDecoder.layout)
+            self._messageDecoder = self._deviceMessageDecoder
             self._gotoState(DecodingState.DeviceMessage)
 
         if self._state == DecodingState.DeviceMessage:
             if self._messageDecoder.processOctet(octet, startTime, endTime) == MessageState.Finished:
                 self._gotoState(DecodingState.Idle)
                 self._lastDeviceMessage = self._messageDecoder.msg
+                self._statistics.countMessage(False, self._lastDeviceMessage.isValid)
                 return self._lastDeviceMessage
 
         return None
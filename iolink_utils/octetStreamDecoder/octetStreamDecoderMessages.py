@@ -1,17 +1,24 @@
 from datetime import datetime as dt
-from typing import Union
+from typing import Union, Optional, List
 from abc import ABC, abstractmethod
 
 from iolink_utils.definitions.communicationChannel import CommChannel
 from iolink_utils.octetDecoder.octetDecoder import MC, CKT, CKS
+from iolink_utils.utils.timestamp import Timestamp
 
 
 class Message(ABC):
-    def __init__(self):
-        self.startTime: dt = dt(1970, 1, 1)
-        self.endTime: dt = dt(1970, 1, 1)
+    __slots__ = ('startTime', 'endTime', 'isValid', '_buffer', '_views')
+
+    def __init__(self, buffer: Optional[memoryview] = None):
+        self.startTime: Timestamp = dt(1970, 1, 1)
+        self.endTime: Timestamp = dt(1970, 1, 1)
         self.isValid: bool = False
 
+        # pooled messages only (see MessagePool): raw octets and memoryview slices per layout index
+        self._buffer: Optional[memoryview] = buffer
+        self._views: Optional[List[Optional[tuple]]] = None if buffer is None else [None] * 8
+
     @abstractmethod
     def dispatch(self, handler):  # pragma: no cover
         pass
@@ -22,13 +29,15 @@ class Message(ABC):
 
 
 class MasterMessage(Message):
-    def __init__(self):
-        super().__init__()
+    __slots__ = ('mc', 'ckt', 'pdOut', 'od')
 
-        self.mc: MC = MC()
-        self.ckt: CKT = CKT()
-        self.pdOut: bytearray = bytearray()
-        self.od: bytearray = bytearray()
+    def __init__(self, buffer: Optional[memoryview] = None):
+        super().__init__(buffer)
+
+        self.mc: MC = MC.fromOctet(0)
+        self.ckt: CKT = CKT.fromOctet(0)
+        self.pdOut: Union[bytearray, memoryview] = bytearray()
+        self.od: Union[bytearray, memoryview] = bytearray()
 
     def __repr__(self):  # pragma: no cover
         elements = []
@@ -49,12 +58,14 @@ class MasterMessage(Message):
 
 
 class DeviceMessage(Message):
-    def __init__(self):
-        super().__init__()
+    __slots__ = ('od', 'pdIn', 'cks')
+
+    def __init__(self, buffer: Optional[memoryview] = None):
+        super().__init__(buffer)
 
-        self.od: bytearray = bytearray()
-        self.pdIn: bytearray = bytearray()
-        self.cks: CKS = CKS()
+        self.od: Union[bytearray, memoryview] = bytearray()
+        self.pdIn: Union[bytearray, memoryview] = bytearray()
+        self.cks: CKS = CKS.fromOctet(0)
 
     def __repr__(self):  # pragma: no cover
         elements = []
@@ -1,11 +1,14 @@
-from typing import Union
+from typing import Union, Optional, Tuple
 from dataclasses import dataclass, field
 
-from iolink_utils.exceptions import InvalidMSeqCode
+from iolink_utils.exceptions import InvalidMSeqCode, InvalidOctetCount
 from iolink_utils.definitions.bitRate import BitRate
 from iolink_utils.definitions.mSequenceType import MSeqType
 from iolink_utils.iodd.iodd import Iodd
 
+# MC + CKT + PDout (max. 32) + OD (max. 32)
+MAX_FRAME_LENGTH = 66
+
 
 @dataclass(frozen=True)
 class MSeqPayloadLength:
@@ -14,24 +17,70 @@ class MSeqPayloadLength:
     pdIn: int = 0
 
 
-@dataclass
+@dataclass(frozen=True)
+class MSeqLayout:
+    """Octet layout of master and device message of an M-sequence (slices refer to the message octets)"""
+    masterLength: int  # MC, CKT, PDout, OD
+    deviceLength: int  # OD, PDin, CKS
+    pdOut: slice
+    masterOD: slice
+    deviceOD: slice
+    pdIn: slice
+
+    @staticmethod
+    def create(payloadLength: MSeqPayloadLength, read: int) -> "MSeqLayout":
+        masterODLength = 0 if read else payloadLength.od
+        deviceODLength = payloadLength.od if read else 0
+        pdOutEnd = 2 + payloadLength.pdOut
+
+        return MSeqLayout(
+            masterLength=pdOutEnd + masterODLength,
+            deviceLength=deviceODLength + payloadLength.pdIn + 1,
+            pdOut=slice(2, pdOutEnd),
+            masterOD=slice(pdOutEnd, pdOutEnd + masterODLength),
+            deviceOD=slice(0, deviceODLength),
+            pdIn=slice(deviceODLength, deviceODLength + payloadLength.pdIn)
+        )
+
+
+def getLayoutIndex(mSeqType: int, read: int) -> int:
+    """Index of DecoderSettings.layouts (mSeqType from CKT, read from MC)"""
+    return (mSeqType << 1) | read
+
+
+@dataclass(frozen=True)
 class DecoderSettings:
     transmissionRate: BitRate = field(default_factory=lambda: BitRate('Undefined'))
     startup: MSeqPayloadLength = field(default_factory=MSeqPayloadLength)
     preoperate: MSeqPayloadLength = field(default_factory=MSeqPayloadLength)
     operate: MSeqPayloadLength = field(default_factory=MSeqPayloadLength)
 
+    # precomputed message layouts, see getLayoutIndex (None: invalid M-sequence type)
+    layouts: Tuple[Optional[MSeqLayout], ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        payloadLengths = (self.startup, self.preoperate, self.operate, None)
+        layouts = tuple(MSeqLayout.create(payloadLength, read) if payloadLength else None
+                        for payloadLength in payloadLengths for read in (0, 1))
+        object.__setattr__(self, 'layouts', layouts)  # frozen -> bypass __setattr__
+
+        for layout in filter(None, layouts):
+            if max(layout.masterLength, layout.deviceLength) > MAX_FRAME_LENGTH:
+                raise InvalidOctetCount(f"M-sequence exceeds {MAX_FRAME_LENGTH} octets: {self}")
+
+    def getLayout(self, mSeqType: int, read: int) -> MSeqLayout:
+        layout = self.layouts[getLayoutIndex(mSeqType, read)]
+        if layout is None:
+            raise InvalidMSeqCode(f"Invalid M-Sequence type: '{mSeqType}'")
+        return layout
+
     def getPayloadLength(self, mSeqType: Union[int, MSeqType]) -> MSeqPayloadLength:
         try:
             mst = MSeqType(mSeqType)
         except ValueError:
             raise InvalidMSeqCode(f"Invalid M-Sequence type: '{mSeqType}'") from None
 
-        return {
-            MSeqType.Type_0_STARTUP: self.startup,
-            MSeqType.Type_1_PREOPERATE: self.preoperate,
-            MSeqType.Type_2_OPERATE: self.operate,
-        }[mst]
+        return (self.startup, self.preoperate, self.operate)[mst]
 
     @staticmethod
     def fromIODD(iodd: Iodd) -> "DecoderSettings":
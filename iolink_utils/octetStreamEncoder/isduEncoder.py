@@ -0,0 +1,90 @@
+from typing import List, Optional, Tuple
+
+from iolink_utils.exceptions import InvalidOctetCount
+from iolink_utils.definitions.iServiceNibble import IServiceNibble
+from iolink_utils.messageInterpreter.isdu.ISDUflowControl import FlowControl
+from iolink_utils.octetStreamEncoder.mSequenceEncoder import OctetData
+
+# See Table 52 – FlowCTRL definitions
+FLOW_CONTROL_START = 0x10
+FLOW_CONTROL_IDLE = 0x11
+FLOW_CONTROL_ABORT = 0x1F
+
+_MAX_ISDU_LENGTH = 238
+_MAX_SHORT_LENGTH = 15  # larger ISDUs use the extended length octet
+
+BUSY = bytes([0x01])  # See A.5.2 I-Service: no service, length 1 (device has no response yet)
+
+
+def encodeISDU(service: IServiceNibble, body: OctetData = b'') -> bytearray:
+    """I-Service (+ extended length), body, CHKPDU. See A.5.1 ISDU structure."""
+    length = len(body) + 2  # I-Service + CHKPDU
+    if length > _MAX_SHORT_LENGTH:
+        length += 1
+    if length > _MAX_ISDU_LENGTH:
+        raise InvalidOctetCount(f"ISDU too long: {length} octets (max. {_MAX_ISDU_LENGTH})")
+
+    if length > _MAX_SHORT_LENGTH:
+        isdu = bytearray([(service << 4) | 1, length])
+    else:
+        isdu = bytearray([(service << 4) | length])
+    isdu.extend(body)
+
+    chkpdu = 0
+    for octet in isdu:
+        chkpdu ^= octet
+    isdu.append(chkpdu)
+    return isdu
+
+
+def _indexBody(index: int, subIndex: Optional[int]) -> Tuple[int, bytes]:
+    # returns service offset (8bitIdx: 0, 8bitIdxSub: 1, 16bitIdxSub: 2) and index octets
+    if not 0 <= index <= 0xFFFF or (subIndex is not None and not 0 <= subIndex <= 0xFF):
+        raise ValueError(f"Invalid index/subindex: {index}/{subIndex}")
+    if index > 0xFF:
+        return 2, index.to_bytes(2, 'big') + bytes([subIndex or 0])
+    if subIndex is not None:
+        return 1, bytes([index, subIndex])
+    return 0, bytes([index])
+
+
+def encodeReadRequest(index: int, subIndex: Optional[int] = None) -> bytearray:
+    offset, body = _indexBody(index, subIndex)
+    return encodeISDU(IServiceNibble(IServiceNibble.M_ReadReq_8bitIdx + offset), body)
+
+
+def encodeWriteRequest(index: int, data: OctetData, subIndex: Optional[int] = None) -> bytearray:
+    offset, body = _indexBody(index, subIndex)
+    return encodeISDU(IServiceNibble(IServiceNibble.M_WriteReq_8bitIdx + offset), body + bytes(data))
+
+
+def encodeReadResponse(data: OctetData) -> bytearray:
+    return encodeISDU(IServiceNibble.D_ReadResp_P, data)
+
+
+def encodeWriteResponse() -> bytearray:
+    return encodeISDU(IServiceNibble.D_WriteResp_P)
+
+
+def encodeErrorResponse(read: int, errorCode: int, additionalCode: int) -> bytearray:
+    """Negative response, see IsduError for the codes"""
+    service = IServiceNibble.D_ReadResp_M if read else IServiceNibble.D_WriteResp_M
+    return encodeISDU(service, bytes([errorCode, additionalCode]))
+
+
+def segmentISDU(isdu: OctetData, odLength: int) -> List[Tuple[int, bytes]]:
+    """
+    Splits an ISDU into the OD of consecutive M-sequences.
+
+    :return: (FlowControl value for the MC address, OD octets padded to odLength) per M-sequence
+    """
+    if odLength < 1:
+        raise InvalidOctetCount("ISDU requires on-request data")
+
+    segments = []
+    flowControl = FlowControl(FLOW_CONTROL_START)
+    for position in range(0, len(isdu), odLength):
+        segment = bytes(isdu[position:position + odLength])
+        segments.append((flowControl.value, segment + bytes(odLength - len(segment))))
+        flowControl = FlowControl(flowControl.nextCountValue())
+    return segments
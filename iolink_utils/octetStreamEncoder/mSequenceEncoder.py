@@ -0,0 +1,75 @@
+from typing import Union
+
+from iolink_utils.exceptions import InvalidOctetCount
+from iolink_utils.definitions.communicationChannel import CommChannel
+from iolink_utils.octetStreamDecoder.octetStreamDecoderSettings import DecoderSettings
+from iolink_utils.octetStreamDecoder._compressChecksum import lookup_8to6_compression
+
+OctetData = Union[bytes, bytearray, memoryview]
+
+
+def _fit(data: OctetData, length: int, name: str) -> bytes:
+    # OD and PD are padded with 0x00 up to the length given by the M-sequence type
+    if len(data) > length:
+        raise InvalidOctetCount(f"{name} has {len(data)} octets (max. {length} in this M-sequence type)")
+    return bytes(data) + bytes(length - len(data))
+
+
+def _checksum(seed: int, octets: OctetData) -> int:
+    # See A.1.6 Calculation of the checksum (checksum bits of CKT/CKS are 0 in seed)
+    checksum = 0x52 ^ seed
+    for octet in octets:
+        checksum ^= octet
+    return lookup_8to6_compression[checksum]
+
+
+class MSequenceEncoder:
+    """
+    Builds the octets of master and device messages (counterpart of MasterMessageDecoder/DeviceMessageDecoder).
+
+    Lengths of OD and PD are taken from the settings (see DecoderSettings.getLayout), shorter data is padded.
+    """
+
+    def __init__(self, settings: DecoderSettings):
+        self.settings: DecoderSettings = settings
+
+    def encodeMasterMessage(self, mSeqType: int, read: int, channel: Union[int, CommChannel], address: int,
+                            pdOut: OctetData = b'', od: OctetData = b'') -> bytearray:
+        """
+        MC, CKT, PDout, OD (OD only if writing).
+
+        :param mSeqType: M-sequence type (CKT)
+        :param read: TransmissionDirection (MC)
+        :param channel: communication channel (MC)
+        :param address: page/event memory address or ISDU FlowControl (MC)
+        """
+        layout = self.settings.getLayout(mSeqType, read)
+        if not 0 <= address <= 0x1F:
+            raise ValueError(f"Invalid address: {address} (5 bit)")
+
+        msg = bytearray(layout.masterLength)
+        msg[0] = (read << 7) | (int(channel) << 5) | address
+        msg[layout.pdOut] = _fit(pdOut, layout.pdOut.stop - layout.pdOut.start, 'PDout')
+        msg[layout.masterOD] = _fit(od, layout.masterOD.stop - layout.masterOD.start, 'OD')
+        ckt = mSeqType << 6
+        msg[1] = ckt | _checksum(ckt, msg)  # msg[1] is 0 here
+        return msg
+
+    def encodeDeviceMessage(self, mSeqType: int, read: int, od: OctetData = b'', pdIn: OctetData = b'',
+                            eventFlag: int = 0, pdValid: int = 0) -> bytearray:
+        """
+        OD (only if reading), PDin, CKS.
+
+        :param mSeqType: M-sequence type of the master message
+        :param read: TransmissionDirection of the master message
+        :param eventFlag: CKS event flag
+        :param pdValid: CKS PD status bit
+        """
+        layout = self.settings.getLayout(mSeqType, read)
+
+        msg = bytearray(layout.deviceLength)
+        msg[layout.deviceOD] = _fit(od, layout.deviceOD.stop - layout.deviceOD.start, 'OD')
+        msg[layout.pdIn] = _fit(pdIn, layout.pdIn.stop - layout.pdIn.start, 'PDin')
+        cks = (eventFlag << 7) | (pdValid << 6)
+        msg[-1] = cks | _checksum(cks, msg[:-1])
+        return msg
@@ -0,0 +1,191 @@
+from random import Random
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from iolink_utils.exceptions import InvalidOctetCount
+from iolink_utils.definitions.communicationChannel import CommChannel
+from iolink_utils.definitions.mSequenceType import MSeqType
+from iolink_utils.definitions.transmissionDirection import TransmissionDirection
+from iolink_utils.definitions.timing import getBitTimeInUs, getMaxFrameTransmissionDelay_master, \
+    getMaxResponseTime, getMaxFrameTransmissionDelay_device
+from iolink_utils.utils.timestamp import microsecondsToNs
+from iolink_utils.iodd.iodd import Iodd
+from iolink_utils.octetStreamDecoder.octetStreamDecoderSettings import DecoderSettings
+from iolink_utils.octetStreamEncoder.mSequenceEncoder import MSequenceEncoder, OctetData
+from iolink_utils.octetStreamEncoder.isduEncoder import segmentISDU, encodeReadRequest, encodeWriteRequest, \
+    encodeReadResponse, encodeWriteResponse, encodeErrorResponse, BUSY, FLOW_CONTROL_START, FLOW_CONTROL_IDLE
+from iolink_utils.capture.octetChunk import OctetChunk
+
+_READ = TransmissionDirection.Read
+_WRITE = TransmissionDirection.Write
+_MAX_EVENTS = 6
+
+
+class MSequence(NamedTuple):
+    master: bytearray
+    device: bytearray
+
+
+class TrafficGenerator:
+    """
+    Creates valid IO-Link traffic (M-sequences) and converts it into timed octet streams.
+
+    The methods append the M-sequences of one transaction (page access, ISDU, event memory read, ...)
+    using the M-sequence type set by setMSeqType, PD of setProcessData is sent in every M-sequence
+    of a type with process data (e.g. not in STARTUP, so the type can be switched without clearing PD).
+    octetChunks converts the M-sequences into OctetChunks (ns timestamps) for OctetStreamDecoder,
+    decodeCapture or writeOctetCapture.
+    """
+
+    def __init__(self, settings: DecoderSettings, mSeqType: MSeqType = MSeqType.Type_2_OPERATE):
+        self.settings: DecoderSettings = settings
+        self.mSequences: List[MSequence] = []
+
+        self._encoder: MSequenceEncoder = MSequenceEncoder(settings)
+        self._mSeqType: MSeqType = mSeqType
+        self._pdOut: bytes = b''
+        self._pdIn: bytes = b''
+        self._eventFlag: int = 0
+
+    @classmethod
+    def fromIODD(cls, iodd: Iodd, mSeqType: MSeqType = MSeqType.Type_2_OPERATE) -> "TrafficGenerator":
+        return cls(DecoderSettings.fromIODD(iodd), mSeqType)
+
+    @property
+    def mSeqType(self) -> MSeqType:
+        return self._mSeqType
+
+    @property
+    def odLength(self) -> int:
+        return self.settings.getPayloadLength(self._mSeqType).od
+
+    def setMSeqType(self, mSeqType: MSeqType):
+        self._mSeqType = mSeqType
+
+    def setProcessData(self, pdOut: OctetData = b'', pdIn: OctetData = b''):
+        self._pdOut = bytes(pdOut)
+        self._pdIn = bytes(pdIn)
+
+    def clear(self):
+        self.mSequences.clear()
+
+    def addMSequence(self, read: int, channel: CommChannel, address: int,
+                     masterOD: OctetData = b'', deviceOD: OctetData = b''):
+        """Appends a single M-sequence (OD of the direction not transmitted is ignored)."""
+        payload = self.settings.getPayloadLength(self._mSeqType)
+        self.mSequences.append(MSequence(
+            self._encoder.encodeMasterMessage(self._mSeqType, read, channel, address,
+                                              self._pdOut if payload.pdOut else b'', b'' if read else masterOD),
+            self._encoder.encodeDeviceMessage(self._mSeqType, read, deviceOD if read else b'',
+                                              self._pdIn if payload.pdIn else b'', self._eventFlag)
+        ))
+
+    def cycle(self, count: int = 1):
+        """Cyclic process data exchange without on-request data (ISDU channel idle)."""
+        for _ in range(count):
+            self.addMSequence(_READ, CommChannel.ISDU, FLOW_CONTROL_IDLE)
+
+    def readPage(self, index: int, value: int):
+        self.addMSequence(_READ, CommChannel.Page, index, deviceOD=bytes([value]))
+
+    def writePage(self, index: int, value: int):
+        self.addMSequence(_WRITE, CommChannel.Page, index, masterOD=bytes([value]))
+
+    def _isdu(self, request: OctetData, response: OctetData, busyCycles: int):
+        for flowControl, od in segmentISDU(request, self.odLength):
+            self.addMSequence(_WRITE, CommChannel.ISDU, flowControl, masterOD=od)
+        for _ in range(busyCycles):
+            self.addMSequence(_READ, CommChannel.ISDU, FLOW_CONTROL_START, deviceOD=BUSY)
+        for flowControl, od in segmentISDU(response, self.odLength):
+            self.addMSequence(_READ, CommChannel.ISDU, flowControl, deviceOD=od)
+        self.addMSequence(_READ, CommChannel.ISDU, FLOW_CONTROL_IDLE)
+
+    def readISDU(self, index: int, data: OctetData, subIndex: Optional[int] = None, busyCycles: int = 0,
+                 error: Optional[Tuple[int, int]] = None):
+        """
+        ISDU read request and response (segmented with FlowControl).
+
+        :param data: content of the positive response
+        :param busyCycles: number of M-sequences the device responds 'busy' before sending the response
+        :param error: (errorCode, additionalCode) to send a negative response instead
+        """
+        response = encodeErrorResponse(_READ, *error) if error else encodeReadResponse(data)
+        self._isdu(encodeReadRequest(index, subIndex), response, busyCycles)
+
+    def writeISDU(self, index: int, data: OctetData, subIndex: Optional[int] = None, busyCycles: int = 0,
+                  error: Optional[Tuple[int, int]] = None):
+        """ISDU write request and response, see readISDU."""
+        response = encodeErrorResponse(_WRITE, *error) if error else encodeWriteResponse()
+        self._isdu(encodeWriteRequest(index, data, subIndex), response, busyCycles)
+
+    def readEventMemory(self, events: Sequence[Tuple[int, int]], resetEventFlag: bool = True):
+        """
+        Device signals events (CKS event flag), master reads the event memory and resets the flag.
+
+        :param events: (EventQualifier octet, event code) of max. 6 events
+        """
+        if len(events) > _MAX_EVENTS:
+            raise InvalidOctetCount(f"Event memory holds max. {_MAX_EVENTS} events (got {len(events)})")
+
+        # See Table 58 – Event memory, StatusCode type 2 (details = 1)
+        statusCode = 0x80 | ((1 << len(events)) - 1)
+        memory = [statusCode]
+        for qualifier, code in events:
+            memory.extend((int(qualifier), code >> 8, code & 0xFF))
+
+        self._eventFlag = 1
+        for address, value in enumerate(memory):
+            self.addMSequence(_READ, CommChannel.Diagnosis, address, deviceOD=bytes([value]))
+        if resetEventFlag:
+            self.addMSequence(_WRITE, CommChannel.Diagnosis, 0, masterOD=bytes([statusCode]))
+            self._eventFlag = 0
+
+    def octetChunks(self, startTime: int = 0, cycleTime: Optional[int] = None, chunkSize: int = 65536,
+                    random: Union[None, int, Random] = None) -> Iterator[OctetChunk]:
+        """
+        Timed octets of all M-sequences (ns timestamps, see A.3 Timing constraints).
+
+        Each octet lasts 11 bit times. Gaps between octets (t1, t2) and the response time (tA)
+        are the minimum values, or random values within the limits accepted by the decoder.
+
+        :param startTime: ns, start of the first M-sequence
+        :param cycleTime: ns between start of consecutive M-sequences (default: back to back).
+                          An M-sequence never starts before the previous one has finished.
+        :param random: seed or Random for random gaps (default: minimum gaps)
+        """
+        if chunkSize < 1:
+            raise ValueError(f"Invalid chunk size: {chunkSize}")
+        rnd = Random(random) if isinstance(random, int) else random
+
+        rate = self.settings.transmissionRate
+        bitTime = round(getBitTimeInUs(rate) * 1000)
+        octetTime = 11 * bitTime
+        # limits as used by OctetStreamDecoder (exclusive)
+        maxT1 = microsecondsToNs(getMaxFrameTransmissionDelay_master(rate))
+        maxTA = microsecondsToNs(getMaxResponseTime(rate))
+        maxT2 = microsecondsToNs(getMaxFrameTransmissionDelay_device(rate))
+        minTA = min(bitTime, maxTA - 1)
+
+        def gap(minimum: int, limit: int) -> int:
+            return rnd.randrange(minimum, limit) if rnd else minimum
+
+        chunk = OctetChunk()
+        sequenceStart = startTime
+        for master, device in self.mSequences:
+            time = sequenceStart
+            for position, octets in ((0, master), (1, device)):
+                for index, octet in enumerate(octets):
+                    if index > 0:
+                        time += gap(0, maxT1 if position == 0 else maxT2)
+                    elif position == 1:
+                        time += gap(minTA, maxTA)
+                    chunk.append(octet, time, time + octetTime)
+                    time += octetTime
+
+                    if len(chunk) >= chunkSize:
+                        yield chunk
+                        chunk = OctetChunk()
+
+            sequenceStart = max(time + bitTime, sequenceStart + cycleTime) if cycleTime else time + bitTime
+
+        if len(chunk):
+            yield chunk
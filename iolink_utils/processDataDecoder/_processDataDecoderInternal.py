@@ -87,8 +87,9 @@ def __create_field_from_data_format(json_dataFormat, safetyCodeFields):
 
 
 def _createPDDecoderClass(json_dataFormat, safetyCodeFields):
-    json_dataFormat.sort(reverse=False, key=__sortByBitOffset)
-    fields, field_names = __create_field_from_data_format(json_dataFormat, safetyCodeFields)
+    # sorted copy, the data format belongs to the (shared) IODD
+    fields, field_names = __create_field_from_data_format(sorted(json_dataFormat, key=__sortByBitOffset),
+                                                          safetyCodeFields)
 
     base = ctypes.BigEndianStructure
     attrs = {"_pack_": 1, "_fields_": fields, "field_names": field_names}
@@ -1,6 +1,6 @@
 from typing import NamedTuple, Type, Callable, Dict
 from enum import IntEnum
-from functools import partial
+from functools import partial, lru_cache
 
 from iolink_utils.exceptions import InvalidOctetValue
 
@@ -25,6 +25,7 @@ class Translation(NamedTuple):
     error: str = ''
 
 
+@lru_cache(maxsize=1024)  # pure function of its parameters, pages repeat the same values
 def translateDirectParameter(index: int, value: int, direction: TransmissionDirection) -> Translation:
     try:
         dppIndex = DirectParameterPage1Index(index)
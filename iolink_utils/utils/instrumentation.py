@@ -0,0 +1,152 @@
+"""
+Optional timing of hot paths (decoder, interpreter, channel handlers, analyzer dispatch).
+
+Nothing is measured unless methods are instrumented explicitly: Instrumentation.instrument replaces
+the method on one instance by a timing wrapper and remove restores it, so disabled instrumentation
+costs nothing. Times of a stage include the stages called by it (e.g. interpreter includes handlers).
+"""
+import json
+import os
+import sys
+import time
+import weakref
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Tuple
+
+# environment variable enabling instrumentation of IOLinkProtocolAnalyzer:
+# '1' prints a report when the analyzer is finalized, any other value is a JSON file to write
+ENVIRONMENT_VARIABLE = 'IOLINK_INSTRUMENTATION'
+
+_BUCKET_COUNT = 64  # bucket i: durations with bit length i, i.e. [2^(i-1), 2^i) ns
+
+
+def instrumentationTarget() -> Optional[str]:
+    """Value of IOLINK_INSTRUMENTATION ('1' or JSON filename), None if disabled."""
+    value = os.environ.get(ENVIRONMENT_VARIABLE, '').strip()
+    return value if value and value != '0' else None
+
+
+class StageStatistics:
+    """Call count, cumulative and max. duration (ns) and log2 histogram of a stage."""
+
+    def __init__(self, name: str):
+        self.name: str = name
+        self.count: int = 0
+        self.totalNs: int = 0
+        self.maxNs: int = 0
+        self.histogram: List[int] = [0] * _BUCKET_COUNT
+
+    def record(self, durationNs: int):
+        self.count += 1
+        self.totalNs += durationNs
+        if durationNs > self.maxNs:
+            self.maxNs = durationNs
+        self.histogram[durationNs.bit_length()] += 1
+
+    def reset(self):
+        self.count = 0
+        self.totalNs = 0
+        self.maxNs = 0
+        self.histogram = [0] * _BUCKET_COUNT
+
+    @property
+    def meanNs(self) -> float:
+        return self.totalNs / self.count if self.count else 0.0
+
+    def percentileNs(self, percentile: float) -> int:
+        """Upper bound (power of 2, max. maxNs) of the duration below which percentile % of the calls are."""
+        if not self.count:
+            return 0
+        target = self.count * percentile / 100
+        accumulated = 0
+        for bucket, count in enumerate(self.histogram):
+            accumulated += count
+            if accumulated >= target:
+                return min((1 << bucket) - 1, self.maxNs)
+        return self.maxNs  # pragma: no cover
+
+    def asDict(self) -> Dict:
+        return {
+            'count': self.count,
+            'totalNs': self.totalNs,
+            'meanNs': self.meanNs,
+            'maxNs': self.maxNs,
+            'p50Ns': self.percentileNs(50),
+            'p99Ns': self.percentileNs(99),
+            'p999Ns': self.percentileNs(99.9),
+            'histogram': {str(1 << bucket): count for bucket, count in enumerate(self.histogram) if count}
+        }
+
+
+class Instrumentation:
+    def __init__(self):
+        self.stages: Dict[str, StageStatistics] = {}
+        # weak reference to instance, method name, previous instance attribute (None: class method)
+        self._instrumented: List[Tuple[Callable, str, Optional[Callable]]] = []
+
+    def getStage(self, name: str) -> StageStatistics:
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = StageStatistics(name)
+        return stage
+
+    def instrument(self, instance: object, methodName: str, stageName: Optional[str] = None):
+        """Time every call of instance.methodName (only this instance) as stage stageName."""
+        method = getattr(instance, methodName)
+        record = self.getStage(stageName or f"{type(instance).__name__}.{methodName}").record
+        counter = time.perf_counter_ns
+
+        @wraps(method)
+        def timed(*args, **kwargs):
+            start = counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                record(counter() - start)
+
+        self._instrumented.append((weakref.ref(instance), methodName, vars(instance).get(methodName)))
+        setattr(instance, methodName, timed)
+
+    def instrumentDecoder(self, decoder, stageName: str = 'decoder.processOctet'):
+        self.instrument(decoder, 'processOctet', stageName)
+
+    def instrumentInterpreter(self, interpreter, stageName: str = 'interpreter.processMessage'):
+        """MessageInterpreter.processMessage and the message handlers of all channels."""
+        self.instrument(interpreter, 'processMessage', stageName)
+        for channel, handler in interpreter._channelHandler.items():
+            for methodName in ('handleMasterMessage', 'handleDeviceMessage'):
+                self.instrument(handler, methodName, f"channel.{channel.name}.{methodName}")
+
+    def remove(self):
+        """Restore all instrumented methods (statistics are kept)."""
+        for instanceRef, methodName, previous in reversed(self._instrumented):
+            instance = instanceRef()
+            if instance is None:
+                continue
+            if previous is None:
+                delattr(instance, methodName)
+            else:
+                setattr(instance, methodName, previous)
+        self._instrumented.clear()
+
+    def reset(self):
+        for stage in self.stages.values():
+            stage.reset()
+
+    def asDict(self) -> Dict[str, Dict]:
+        return {name: stage.asDict() for name, stage in self.stages.items()}
+
+    def report(self) -> str:
+        lines = [f"{'stage':<45} {'calls':>10} {'total ms':>10} {'mean us':>9} {'p99 us':>9} {'max us':>9}"]
+        for name, stage in self.stages.items():
+            lines.append(f"{name:<45} {stage.count:>10} {stage.totalNs / 1e6:>10.1f} {stage.meanNs / 1e3:>9.2f} "
+                         f"{stage.percentileNs(99) / 1e3:>9.2f} {stage.maxNs / 1e3:>9.2f}")
+        return '\n'.join(lines)
+
+    def dump(self, target: str = '1'):
+        """Print the report (target '1') or write the statistics as JSON (target: filename)."""
+        if target == '1':
+            print(self.report(), file=sys.stdout)
+        else:
+            with open(target, 'w') as file:
+                json.dump(self.asDict(), file, indent=2)
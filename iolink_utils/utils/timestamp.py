@@ -0,0 +1,47 @@
+from enum import IntEnum
+from typing import Union
+from datetime import datetime, timedelta, timezone
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+_NS_PER_US = 1000
+_US_PER_S = 1000000
+
+# point in time: datetime or integer nanoseconds since the Unix epoch (see Timebase)
+Timestamp = Union[datetime, int]
+
+
+class Timebase(IntEnum):
+    DateTime = 0  # timestamps are datetime objects
+    Nanoseconds = 1  # timestamps are integer nanoseconds since the Unix epoch
+
+
+def datetimeToNs(value: datetime) -> int:
+    """Convert datetime into integer nanoseconds since the Unix epoch.
+
+    Naive datetimes are taken as UTC, timezone-aware datetimes are converted to UTC.
+    """
+    delta = value - (_EPOCH if value.tzinfo is None else _EPOCH_UTC)
+    return ((delta.days * 86400 + delta.seconds) * _US_PER_S + delta.microseconds) * _NS_PER_US
+
+
+def nsToDatetime(value: int) -> datetime:
+    """Convert integer nanoseconds since the Unix epoch into a (naive, UTC) datetime.
+
+    Note: datetime has microsecond resolution -> sub-microsecond part is truncated.
+    """
+    return _EPOCH + timedelta(microseconds=value // _NS_PER_US)
+
+
+def microsecondsToNs(value: float) -> int:
+    """Convert a duration in microseconds (e.g. from definitions.timing) into integer nanoseconds.
+
+    The value is rounded to whole microseconds first, which is the resolution of timedelta.
+    """
+    return round(value) * _NS_PER_US
+
+
+def asDatetime(value: Timestamp) -> datetime:
+    """Get timestamp as datetime (integer nanoseconds are converted, datetime is returned as is)."""
+    return nsToDatetime(value) if isinstance(value, int) else value
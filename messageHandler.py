@@ -1,80 +1,75 @@
+from typing import Callable
+
 from saleae.analyzers import AnalyzerFrame
 from saleae.data.timing import SaleaeTime
 
 from iolink_utils.octetStreamDecoder.octetStreamDecoderMessages import MasterMessage, DeviceMessage
+from iolink_utils.octetStreamDecoder.octetStreamDecoderSettings import DecoderSettings
+from iolink_utils.utils.timestamp import asDatetime
+from payloadFormatter import octetString, hexString, ProcessDataFormatter
 
 
 class MSequenceHandler:
     def handleMasterMessage(self, msg: MasterMessage):
         data = {
-            'mc': str(msg.mc),
-            'ckt': str(msg.ckt)
+            'mc': octetString(msg.mc),
+            'ckt': octetString(msg.ckt)
         }
         if msg.pdOut:
-            data['pdOut'] = bytes(msg.pdOut).hex()
+            data['pdOut'] = hexString(bytes(msg.pdOut))
         if msg.od:
-            data['od'] = bytes(msg.od).hex()
+            data['od'] = hexString(bytes(msg.od))
 
         return [AnalyzerFrame(
             'MasterMsg',
-            SaleaeTime(msg.startTime),
-            SaleaeTime(msg.endTime),
+            SaleaeTime(asDatetime(msg.startTime)),
+            SaleaeTime(asDatetime(msg.endTime)),
             data
         )]
 
     def handleDeviceMessage(self, msg: DeviceMessage):
         data = {
-            'cks': str(msg.cks)
+            'cks': octetString(msg.cks)
         }
         if msg.od:
-            data['od'] = bytes(msg.od).hex()
+            data['od'] = hexString(bytes(msg.od))
         if msg.pdIn:
-            data['pdIn'] = bytes(msg.pdIn).hex()
+            data['pdIn'] = hexString(bytes(msg.pdIn))
 
         return [AnalyzerFrame(
             'DeviceMsg',
-            SaleaeTime(msg.startTime),
-            SaleaeTime(msg.endTime),
+            SaleaeTime(asDatetime(msg.startTime)),
+            SaleaeTime(asDatetime(msg.endTime)),
             data
         )]
 
 
 class ProcessDataHandler:
-    def __init__(self, decoder, DecoderPDOut, DecoderPDIn):
-        self.decoder = decoder
-        self.DecoderPDOut = DecoderPDOut
-        self.DecoderPDIn = DecoderPDIn
+    def __init__(self, getSettings: Callable[[], DecoderSettings], DecoderPDOut, DecoderPDIn):
+        self.getSettings = getSettings  # decoder settings valid for the message
+        self.pdOutFormatter: ProcessDataFormatter = ProcessDataFormatter(DecoderPDOut, 'pdOut')
+        self.pdInFormatter: ProcessDataFormatter = ProcessDataFormatter(DecoderPDIn, 'pdIn')
 
     def handleMasterMessage(self, msg: MasterMessage):
-        if self.decoder.settings.operate.pdOut > 0 and self.decoder.settings.operate.pdOut == len(msg.pdOut):
-            decodedPD = self.DecoderPDOut.from_buffer_copy(msg.pdOut)
-            data = {
-                'pdOut': msg.pdOut.hex()
-            }
-            for field_name in decodedPD.field_names:
-                data[field_name] = str(getattr(decodedPD, field_name))  # str otherwise value will be shown as hex
-
+        operate = self.getSettings().operate
+        if operate.pdOut > 0 and operate.pdOut == len(msg.pdOut):
+            data = self.pdOutFormatter.format(bytes(msg.pdOut))
             return [AnalyzerFrame(
                 'PD out',
-                SaleaeTime(msg.startTime),
-                SaleaeTime(msg.endTime),
+                SaleaeTime(asDatetime(msg.startTime)),
+                SaleaeTime(asDatetime(msg.endTime)),
                 data
             )]
         return []
 
     def handleDeviceMessage(self, msg: DeviceMessage):
-        if self.decoder.settings.operate.pdOut > 0 and self.decoder.settings.operate.pdIn == len(msg.pdIn):
-            decodedPD = self.DecoderPDIn.from_buffer_copy(msg.pdIn)
-            data = {
-                'pdIn': msg.pdIn.hex()
-            }
-            for field_name in decodedPD.field_names:
-                data[field_name] = str(getattr(decodedPD, field_name))  # str otherwise value will be shown as hex
-
+        operate = self.getSettings().operate
+        if operate.pdOut > 0 and operate.pdIn == len(msg.pdIn):
+            data = self.pdInFormatter.format(bytes(msg.pdIn))
             return [AnalyzerFrame(
                 'PD in',
-                SaleaeTime(msg.startTime),
-                SaleaeTime(msg.endTime),
+                SaleaeTime(asDatetime(msg.startTime)),
+                SaleaeTime(asDatetime(msg.endTime)),
                 data
             )]
         return []
@@ -0,0 +1,48 @@
+"""
+Cached formatting of frame payloads.
+
+Most messages of a capture repeat the same octets (e.g. cyclic process data, idle M-sequences), so
+formatted strings are cached per distinct payload (LRU keyed on the raw octets).
+"""
+from functools import lru_cache
+from typing import Dict, Tuple
+
+PAYLOAD_CACHE_SIZE = 1024  # distinct payloads per cache
+
+_octetStrings: Dict[Tuple[type, int], str] = {}  # max. 256 entries per decoder class
+
+
+def octetString(octet) -> str:
+    """str() of a decoded octet (e.g. MC, CKT, CKS), cached per decoder class and octet value."""
+    key = (type(octet), int(octet))
+    text = _octetStrings.get(key)
+    if text is None:
+        text = _octetStrings[key] = str(octet)
+    return text
+
+
+@lru_cache(maxsize=PAYLOAD_CACHE_SIZE)
+def hexString(payload: bytes) -> str:
+    return payload.hex()
+
+
+class ProcessDataFormatter:
+    """Process data as hex string (key hexKey) and decoded fields as str, cached per payload."""
+
+    def __init__(self, DecoderPD, hexKey: str, cacheSize: int = PAYLOAD_CACHE_SIZE):
+        self.DecoderPD = DecoderPD
+        self.hexKey: str = hexKey
+        self._format = lru_cache(maxsize=cacheSize)(self._formatPayload)
+
+    def format(self, payload: bytes) -> Dict[str, str]:
+        """Frame data of payload (a new dict, frames keep their data)."""
+        return self._format(payload).copy()
+
+    def _formatPayload(self, payload: bytes) -> Dict[str, str]:
+        decodedPD = self.DecoderPD.from_buffer_copy(payload)
+        data = {
+            self.hexKey: payload.hex()
+        }
+        for field_name in decodedPD.field_names:
+            data[field_name] = str(getattr(decodedPD, field_name))  # str otherwise value will be shown as hex
+        return data
@@ -1,5 +1,3 @@
-import copy
-
 from saleae.analyzers import AnalyzerFrame
 from saleae.data.timing import SaleaeTime
 
@@ -12,40 +10,25 @@ from iolink_utils.messageInterpreter.diagnosis.transactionDiagnosis import (
     TransactionDiagEventReset
 )
 from iolink_utils.messageInterpreter.isdu.ISDU import ISDU
+from iolink_utils.messageInterpreter.transactionHandler import TransactionHandler
 from iolink_utils.iodd.iodd import Variable
-
-
-class TransactionHandler:
-    def handlePage(self, transaction: TransactionPage):
-        return []
-
-    def handleDiagEventMemory(self, transaction: TransactionDiagEventMemory):
-        return []
-
-    def handleDiagEventReset(self, transaction: TransactionDiagEventReset):
-        return []
-
-    def handleISDU(self, transaction: ISDU):
-        return []
-
-    def handleProcess(self, transaction: TransactionProcess):
-        return []
+from iolink_utils.utils.timestamp import asDatetime
 
 
 class DiagnosisHandler(TransactionHandler):
     def handleDiagEventMemory(self, transaction: TransactionDiagEventMemory):
         return [AnalyzerFrame(
             'DiagRead',
-            SaleaeTime(transaction.startTime),
-            SaleaeTime(transaction.endTime),
+            SaleaeTime(asDatetime(transaction.startTime)),
+            SaleaeTime(asDatetime(transaction.endTime)),
             transaction.data()
         )]
 
     def handleDiagEventReset(self, transaction: TransactionDiagEventReset):
         return [AnalyzerFrame(
             'DiagReset',
-            SaleaeTime(transaction.startTime),
-            SaleaeTime(transaction.endTime),
+            SaleaeTime(asDatetime(transaction.startTime)),
+            SaleaeTime(asDatetime(transaction.endTime)),
             transaction.data()
         )]
 
@@ -54,8 +37,8 @@ class PageHandler(TransactionHandler):
     def handlePage(self, transaction: TransactionPage):
         return [AnalyzerFrame(
             'Page',
-            SaleaeTime(transaction.startTime),
-            SaleaeTime(transaction.endTime),
+            SaleaeTime(asDatetime(transaction.startTime)),
+            SaleaeTime(asDatetime(transaction.endTime)),
             transaction.data()
         )]
 
@@ -71,7 +54,7 @@ class ISDUHandler(TransactionHandler):
         return f"{indexInfo}: {variable.name}" if variable else indexInfo
 
     def handleISDU(self, transaction: ISDU):
-        data = copy.deepcopy(transaction.data())
+        data = transaction.data()  # new dict per call, modified in place
         if 'index' in data:
             idx = data['index']
             data['index'] = f"0x{idx:04X}"
@@ -81,8 +64,8 @@ class ISDUHandler(TransactionHandler):
 
         return [AnalyzerFrame(
             transaction.name(),
-            SaleaeTime(transaction.startTime),
-            SaleaeTime(transaction.endTime),
+            SaleaeTime(asDatetime(transaction.startTime)),
+            SaleaeTime(asDatetime(transaction.endTime)),
             data
         )]
 
@@ -91,7 +74,7 @@ class ProcessHandler(TransactionHandler):
     def handleProcess(self, transaction: TransactionProcess):
         return [AnalyzerFrame(
             'Process',
-            SaleaeTime(transaction.startTime),
-            SaleaeTime(transaction.endTime),
+            SaleaeTime(asDatetime(transaction.startTime)),
+            SaleaeTime(asDatetime(transaction.endTime)),
             transaction.data()
         )]